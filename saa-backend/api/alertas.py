@@ -0,0 +1,129 @@
+"""Alertas de um estudante: listagem paginada, contagem e leitura em lote.
+
+A listagem vai do mais recente para o mais antigo (``created_at``, com
+desempate por ``id``) pelo índice ``idx_alertas_estudante_criacao``; o cursor
+``proximo_cursor`` guarda a posição da última linha devolvida, como em
+:mod:`api.listagem`.
+
+Contagem de não lidos, filtro ``nao_lidos`` e a marcação como lido usam o
+índice parcial ``idx_alertas_nao_lidos`` (migração 0006), que só contém os
+alertas abertos: o custo acompanha os alertas pendentes do estudante, não o
+histórico.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+from .listagem import LIMITE_MAXIMO, ParametroInvalido, codificar_cursor, decodificar_cursor
+
+LIMITE_PADRAO = 20
+MODO_CURSOR = "alerta"
+
+SQL_CONTAR_NAO_LIDOS = """
+    SELECT tipo, COUNT(*) FROM alertas
+    WHERE estudante_id = ? AND lido = 0
+    GROUP BY tipo
+"""
+
+
+def _cursor_alerta(linha: sqlite3.Row) -> str:
+    return codificar_cursor(MODO_CURSOR, f"{linha['id']}:{linha['created_at']}")
+
+
+def _posicao_cursor(cursor: str) -> tuple[str, int]:
+    valor = decodificar_cursor(cursor, MODO_CURSOR)
+    try:
+        alerta_id, criado_em = valor.split(":", 1)
+        return criado_em, int(alerta_id)
+    except ValueError:
+        raise ParametroInvalido("cursor inválido") from None
+
+
+def listar_alertas(
+    conn: sqlite3.Connection,
+    estudante_id: int,
+    limite: int = LIMITE_PADRAO,
+    cursor: str | None = None,
+    nao_lidos: bool = False,
+) -> tuple[list[dict], str | None]:
+    """Retorna uma página de alertas e o cursor da próxima (ou ``None``)."""
+
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ParametroInvalido(f"limite deve estar entre 1 e {LIMITE_MAXIMO}")
+
+    condicoes = ["estudante_id = ?"]
+    parametros: list = [estudante_id]
+    if nao_lidos:
+        condicoes.append("lido = 0")
+    if cursor:
+        condicoes.append("(created_at, id) < (?, ?)")
+        parametros.extend(_posicao_cursor(cursor))
+
+    linhas = conn.execute(
+        f"""
+        SELECT id, tipo, mensagem, lido, created_at FROM alertas
+        WHERE {' AND '.join(condicoes)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+        """,
+        (*parametros, limite + 1),
+    ).fetchall()
+
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = _cursor_alerta(linhas[-1])
+
+    alertas = [
+        {
+            "id": linha["id"],
+            "tipo": linha["tipo"],
+            "mensagem": linha["mensagem"],
+            "lido": bool(linha["lido"]),
+            "criado_em": linha["created_at"],
+        }
+        for linha in linhas
+    ]
+    return alertas, proximo
+
+
+def contar_nao_lidos(conn: sqlite3.Connection, estudante_id: int) -> dict:
+    """Total de alertas não lidos do estudante e a divisão por tipo."""
+
+    por_tipo = dict(conn.execute(SQL_CONTAR_NAO_LIDOS, (estudante_id,)).fetchall())
+    return {"nao_lidos": sum(por_tipo.values()), "por_tipo": por_tipo}
+
+
+def marcar_lidos(
+    conn: sqlite3.Connection, estudante_id: int, ids: list[int] | None = None
+) -> int:
+    """Marca como lidos os alertas ``ids`` do estudante (ou todos os abertos).
+
+    Um único UPDATE, com os ids passados como um array JSON. Ids de outros
+    estudantes ou já lidos são ignorados. Não faz commit; retorna quantos
+    alertas foram marcados.
+    """
+
+    if ids is None:
+        cursor = conn.execute(
+            "UPDATE alertas SET lido = 1 WHERE estudante_id = ? AND lido = 0", (estudante_id,)
+        )
+        return cursor.rowcount
+
+    if not isinstance(ids, list) or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in ids
+    ):
+        raise ParametroInvalido("'ids' deve ser uma lista de inteiros")
+    if len(ids) > LIMITE_MAXIMO:
+        raise ParametroInvalido(f"máximo de {LIMITE_MAXIMO} ids por requisição")
+    cursor = conn.execute(
+        """
+        UPDATE alertas SET lido = 1
+        WHERE estudante_id = ? AND lido = 0
+          AND id IN (SELECT value FROM json_each(?))
+        """,
+        (estudante_id, json.dumps(ids)),
+    )
+    return cursor.rowcount
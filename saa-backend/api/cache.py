@@ -0,0 +1,286 @@
+"""Cache de resultados de relatórios, com TTL, LRU limitado e invalidação.
+
+Cada resultado é guardado sob ``(relatório, versão global dos dados)``, com a
+versão do contador mantido por triggers (migração 0005). Escritas de qualquer
+processo — a API, importações, scripts — mudam a versão, então uma entrada
+antiga nunca é servida, mesmo com vários workers. Além disso, o caminho de
+escrita chama :meth:`CacheRelatorios.invalidar`, que descarta na hora as
+entradas que não serão mais usadas.
+
+O armazenamento é plugável:
+
+- ``memoria`` (padrão): ``OrderedDict`` por processo, LRU com no máximo
+  ``SAA_CACHE_MAX_ITENS`` entradas;
+- ``sqlite``: arquivo local (``SAA_CACHE_PATH``, padrão ``data/cache.db``)
+  compartilhado pelos workers da mesma máquina;
+- ``nenhum``: desliga o cache.
+
+Parâmetros ajustáveis por variável de ambiente:
+
+- ``SAA_CACHE_RELATORIOS``: ``memoria``, ``sqlite`` ou ``nenhum``
+- ``SAA_CACHE_TTL``: segundos de validade de uma entrada (padrão 30)
+- ``SAA_CACHE_MAX_ITENS``: entradas mantidas antes de descartar as menos usadas (padrão 256)
+- ``SAA_CACHE_PATH``: arquivo do armazenamento ``sqlite``
+
+Os contadores (acertos, faltas, descartes por LRU, expirações e
+invalidações) são do processo e ficam em ``GET /api/relatorios/cache``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from database.db import BASE_DIR
+
+BACKEND = os.environ.get("SAA_CACHE_RELATORIOS", "memoria")
+TTL_SEGUNDOS = float(os.environ.get("SAA_CACHE_TTL", "30"))
+MAX_ITENS = int(os.environ.get("SAA_CACHE_MAX_ITENS", "256"))
+CACHE_PATH = Path(os.environ.get("SAA_CACHE_PATH", BASE_DIR / "data" / "cache.db"))
+
+# Resultados de Armazenamento.obter.
+ACERTO = "acerto"
+FALTA = "falta"
+EXPIRADO = "expirado"
+
+
+class ArmazenamentoMemoria:
+    """LRU em memória com validade por entrada. Seguro entre threads."""
+
+    nome = "memoria"
+
+    def __init__(self, max_itens: int = MAX_ITENS, relogio: Callable[[], float] = time.monotonic):
+        self.max_itens = max_itens
+        self._relogio = relogio
+        self._itens: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str) -> tuple[str, Any]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return FALTA, None
+            expira_em, valor = item
+            if expira_em <= self._relogio():
+                del self._itens[chave]
+                return EXPIRADO, None
+            self._itens.move_to_end(chave)
+            return ACERTO, valor
+
+    def gravar(self, chave: str, valor: Any, ttl: float) -> int:
+        """Grava a entrada; retorna quantas entradas foram descartadas por LRU."""
+
+        with self._lock:
+            self._itens[chave] = (self._relogio() + ttl, valor)
+            self._itens.move_to_end(chave)
+            descartadas = 0
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                descartadas += 1
+            return descartadas
+
+    def remover_prefixo(self, prefixo: str) -> int:
+        with self._lock:
+            chaves = [chave for chave in self._itens if chave.startswith(prefixo)]
+            for chave in chaves:
+                del self._itens[chave]
+            return len(chaves)
+
+    def tamanho(self) -> int:
+        return len(self._itens)
+
+
+class ArmazenamentoSQLite:
+    """Armazenamento em um arquivo SQLite local, compartilhado entre processos.
+
+    Os valores são gravados como JSON. O LRU usa o instante do último acesso
+    de cada entrada; o arquivo é descartável (sem fsync).
+    """
+
+    nome = "sqlite"
+
+    DDL = """
+        CREATE TABLE IF NOT EXISTS cache (
+            chave TEXT PRIMARY KEY,
+            valor TEXT NOT NULL,
+            expira_em REAL NOT NULL,
+            acesso REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_acesso ON cache (acesso);
+    """
+
+    def __init__(self, caminho: Path = CACHE_PATH, max_itens: int = MAX_ITENS):
+        self.caminho = Path(caminho)
+        self.max_itens = max_itens
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conexao().executescript(self.DDL)
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            self._local.conn = conn
+        return conn
+
+    def obter(self, chave: str) -> tuple[str, Any]:
+        conn = self._conexao()
+        linha = conn.execute(
+            "SELECT valor, expira_em FROM cache WHERE chave = ?", (chave,)
+        ).fetchone()
+        if linha is None:
+            return FALTA, None
+        agora = time.time()
+        if linha[1] <= agora:
+            conn.execute("DELETE FROM cache WHERE chave = ? AND expira_em <= ?", (chave, agora))
+            return EXPIRADO, None
+        conn.execute("UPDATE cache SET acesso = ? WHERE chave = ?", (agora, chave))
+        return ACERTO, json.loads(linha[0])
+
+    def gravar(self, chave: str, valor: Any, ttl: float) -> int:
+        conn = self._conexao()
+        agora = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (chave, valor, expira_em, acesso) VALUES (?, ?, ?, ?)",
+                (chave, json.dumps(valor), agora + ttl, agora),
+            )
+            excesso = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_itens
+            if excesso <= 0:
+                return 0
+            conn.execute(
+                "DELETE FROM cache WHERE chave IN (SELECT chave FROM cache ORDER BY acesso LIMIT ?)",
+                (excesso,),
+            )
+            return excesso
+
+    def remover_prefixo(self, prefixo: str) -> int:
+        conn = self._conexao()
+        if not prefixo:
+            return conn.execute("DELETE FROM cache").rowcount
+        # Intervalo em vez de LIKE, para não depender de escapar "%" e "_".
+        fim = prefixo[:-1] + chr(ord(prefixo[-1]) + 1)
+        return conn.execute(
+            "DELETE FROM cache WHERE chave >= ? AND chave < ?", (prefixo, fim)
+        ).rowcount
+
+    def tamanho(self) -> int:
+        return self._conexao().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class CacheRelatorios:
+    """Cache de resultados por ``(relatório, versão)``, com contadores de uso."""
+
+    def __init__(self, armazenamento, ttl: float = TTL_SEGUNDOS) -> None:
+        self.armazenamento = armazenamento
+        self.ttl = ttl
+        self._contadores = {
+            "acertos": 0,
+            "faltas": 0,
+            "expiracoes": 0,
+            "descartes": 0,
+            "invalidacoes": 0,
+        }
+        self._lock = threading.Lock()
+
+    def _contar(self, nome: str, quantidade: int = 1) -> None:
+        with self._lock:
+            self._contadores[nome] += quantidade
+
+    def obter_ou_calcular(self, relatorio: str, versao: Any, calcular: Callable[[], Any]) -> Any:
+        """Resultado em cache do relatório na versão dada, ou calculado e guardado."""
+
+        if self.armazenamento is None:
+            return calcular()
+
+        chave = f"{relatorio}:{versao}"
+        estado, valor = self.armazenamento.obter(chave)
+        if estado == ACERTO:
+            self._contar("acertos")
+            return valor
+
+        self._contar("faltas")
+        if estado == EXPIRADO:
+            self._contar("expiracoes")
+        valor = calcular()
+        descartadas = self.armazenamento.gravar(chave, valor, self.ttl)
+        if descartadas:
+            self._contar("descartes", descartadas)
+        return valor
+
+    def invalidar(self, relatorio: str | None = None) -> int:
+        """Remove as entradas de um relatório (ou de todos). Retorna quantas."""
+
+        if self.armazenamento is None:
+            return 0
+        removidas = self.armazenamento.remover_prefixo(f"{relatorio}:" if relatorio else "")
+        self._contar("invalidacoes")
+        return removidas
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            contadores = dict(self._contadores)
+        consultas = contadores["acertos"] + contadores["faltas"]
+        return {
+            "armazenamento": getattr(self.armazenamento, "nome", "nenhum"),
+            "ttl_segundos": self.ttl,
+            "itens": self.armazenamento.tamanho() if self.armazenamento is not None else 0,
+            **contadores,
+            "taxa_acertos": contadores["acertos"] / consultas if consultas else None,
+        }
+
+
+def criar_armazenamento(backend: str = BACKEND):
+    if backend == "memoria":
+        return ArmazenamentoMemoria()
+    if backend == "sqlite":
+        return ArmazenamentoSQLite()
+    if backend == "nenhum":
+        return None
+    raise ValueError(f"SAA_CACHE_RELATORIOS inválido: {backend!r} (use memoria, sqlite ou nenhum)")
+
+
+_cache: CacheRelatorios | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheRelatorios:
+    """Cache compartilhado do processo, criado na primeira utilização."""
+
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheRelatorios(criar_armazenamento())
+        return _cache
+
+
+def configurar_cache(armazenamento, ttl: float = TTL_SEGUNDOS) -> CacheRelatorios:
+    """Troca o armazenamento do cache do processo (ex.: um store próprio)."""
+
+    global _cache
+    with _cache_lock:
+        _cache = CacheRelatorios(armazenamento, ttl)
+        return _cache
+
+
+def invalidar_cache_compartilhado() -> int | None:
+    """Para scripts: descarta os relatórios do armazenamento ``sqlite``.
+
+    ``memoria`` e ``nenhum`` pertencem a cada processo, então um script não
+    alcança o cache do servidor; nesses casos nada é feito e o retorno é
+    ``None``. Mesmo sem isso, as entradas antigas deixam de ser servidas,
+    porque a escrita muda a versão dos dados.
+    """
+
+    if getattr(get_cache().armazenamento, "nome", None) != "sqlite":
+        return None
+    return get_cache().invalidar()
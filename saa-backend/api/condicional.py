@@ -0,0 +1,71 @@
+"""Respostas condicionais (ETag / If-None-Match) para rotas consultadas em polling.
+
+O validador vem de contadores de versão mantidos por triggers (migração
+0005): ``estudantes.versao`` para os dados de um estudante e o contador
+``global`` de ``contadores_versao`` para a turma. Ler os contadores custa uma
+busca por chave; se o cliente já tem a versão atual, a rota responde 304 sem
+executar as consultas nem serializar o corpo.
+
+A versão é lida *antes* dos dados: se uma escrita acontecer entre as duas
+leituras, o cliente recebe dados novos com o validador antigo e apenas
+baixa o corpo de novo no próximo pedido, nunca o contrário.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+from flask import Response, request
+
+from models.clustering import centroides_atuais
+from models.regression import coeficientes_atuais
+
+# Respostas podem ser guardadas, mas sempre revalidadas antes do uso.
+CACHE_PRIVADO = "private, no-cache"
+CACHE_PUBLICO = "public, no-cache"
+
+SQL_VERSAO_GLOBAL = "SELECT versao FROM contadores_versao WHERE escopo = 'global'"
+
+SQL_VERSOES_ESTUDANTE = f"""
+    SELECT e.versao, ({SQL_VERSAO_GLOBAL})
+    FROM estudantes e
+    WHERE e.matricula = ?
+"""
+
+
+def versao_modelos() -> str:
+    """Versões dos coeficientes e dos centroides em uso pelo processo."""
+
+    return f"{coeficientes_atuais().versao}.{centroides_atuais()[1]}"
+
+
+def versao_global(conn: sqlite3.Connection) -> int:
+    linha = conn.execute(SQL_VERSAO_GLOBAL).fetchone()
+    return linha[0] if linha else 0
+
+
+def versoes_estudante(conn: sqlite3.Connection, matricula: str) -> tuple[int, int] | None:
+    """``(versao_do_estudante, versao_global)`` ou ``None`` se a matrícula não existe."""
+
+    linha = conn.execute(SQL_VERSOES_ESTUDANTE, (matricula,)).fetchone()
+    return (linha[0], linha[1] or 0) if linha else None
+
+
+def gerar_etag(*partes) -> str:
+    return "-".join(str(parte) for parte in partes)
+
+
+def nao_modificado(etag: str, cache_control: str) -> Response | None:
+    """Resposta 304 se o ``If-None-Match`` da requisição contém ``etag``."""
+
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    resposta = Response(status=304)
+    return com_validador(resposta, etag, cache_control)
+
+
+def com_validador(resposta: Response, etag: str, cache_control: str) -> Response:
+    # Fraco: o validador identifica a versão dos dados, não os bytes do corpo.
+    resposta.set_etag(etag, weak=True)
+    resposta.headers["Cache-Control"] = cache_control
+    return resposta
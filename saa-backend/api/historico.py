@@ -0,0 +1,119 @@
+"""Série histórica de um estudante (GET /api/estudantes/<matricula>/historico).
+
+Sem ``agrupar``, devolve os registros de ``dados_academicos`` em ordem
+cronológica. Com ``agrupar=semana`` ou ``agrupar=mes``, o SQLite agrupa os
+registros por período (semanas começam na segunda-feira) e devolve, para
+cada métrica, mínimo, média e máximo: anos de registros viram algumas dezenas
+de pontos sem que as linhas brutas saiam do banco.
+
+As duas formas leem o índice ``idx_dados_academicos_estudante_data`` do
+estudante, só no intervalo ``inicio``..``fim`` quando informado, e devolvem
+os ``limite`` pontos mais recentes.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+
+from .listagem import LIMITE_MAXIMO, ParametroInvalido
+
+LIMITE_PADRAO = 200
+
+METRICAS = ("horas_estudo", "participacao_projetos", "disciplinas_praticas", "impacto_percebido")
+
+# Início do período de cada registro, como data ISO. Para o mês basta cortar
+# o texto da data, bem mais barato que strftime.
+PERIODOS = {
+    "semana": "date(data_registro, 'weekday 0', '-6 days')",
+    "mes": "substr(data_registro, 1, 7) || '-01'",
+}
+
+_AGREGADOS = ",\n".join(f"MIN({m}), ROUND(AVG({m}), 2), MAX({m})" for m in METRICAS)
+
+
+def _data(valor: str | None, nome: str) -> str | None:
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(valor).isoformat()
+    except ValueError:
+        raise ParametroInvalido(f"{nome} deve ser uma data AAAA-MM-DD") from None
+
+
+def validar_parametros(
+    agrupar: str | None = None,
+    inicio: str | None = None,
+    fim: str | None = None,
+    limite: int = LIMITE_PADRAO,
+) -> tuple[str | None, str | None, str | None, int]:
+    """Confere os parâmetros da série e devolve-os normalizados.
+
+    Levanta :class:`ParametroInvalido` para valores fora do esperado.
+    """
+
+    if agrupar and agrupar not in PERIODOS:
+        raise ParametroInvalido(f"agrupar deve ser um de: {', '.join(PERIODOS)}")
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ParametroInvalido(f"limite deve estar entre 1 e {LIMITE_MAXIMO}")
+    return agrupar or None, _data(inicio, "inicio"), _data(fim, "fim"), limite
+
+
+def historico_estudante(
+    conn: sqlite3.Connection,
+    estudante_id: int,
+    agrupar: str | None = None,
+    inicio: str | None = None,
+    fim: str | None = None,
+    limite: int = LIMITE_PADRAO,
+) -> list[dict]:
+    """Pontos da série do estudante, do mais antigo para o mais recente."""
+
+    agrupar, inicio, fim, limite = validar_parametros(agrupar, inicio, fim, limite)
+
+    condicoes = ["estudante_id = ?"]
+    parametros: list = [estudante_id]
+    for data, operador in ((inicio, ">="), (fim, "<=")):
+        if data:
+            condicoes.append(f"data_registro {operador} ?")
+            parametros.append(data)
+    onde = " AND ".join(condicoes)
+
+    if not agrupar:
+        linhas = conn.execute(
+            f"""
+            SELECT data_registro, {', '.join(METRICAS)}
+            FROM dados_academicos
+            WHERE {onde}
+            ORDER BY data_registro DESC, id DESC
+            LIMIT ?
+            """,
+            (*parametros, limite),
+        ).fetchall()
+        return [
+            {"data": linha[0], **dict(zip(METRICAS, tuple(linha)[1:]))}
+            for linha in reversed(linhas)
+        ]
+
+    linhas = conn.execute(
+        f"""
+        SELECT {PERIODOS[agrupar]} AS periodo, COUNT(*),
+               {_AGREGADOS}
+        FROM dados_academicos
+        WHERE {onde}
+        GROUP BY periodo
+        ORDER BY periodo DESC
+        LIMIT ?
+        """,
+        (*parametros, limite),
+    ).fetchall()
+
+    pontos = []
+    for linha in reversed(linhas):
+        valores = tuple(linha)
+        ponto = {"periodo": valores[0], "registros": valores[1]}
+        for i, metrica in enumerate(METRICAS):
+            minimo, media, maximo = valores[2 + 3 * i : 5 + 3 * i]
+            ponto[metrica] = {"min": minimo, "media": media, "max": maximo}
+        pontos.append(ponto)
+    return pontos
@@ -0,0 +1,165 @@
+"""Listagem paginada de estudantes (GET /api/estudantes).
+
+A paginação é por chave (keyset), nunca por OFFSET: cada página começa
+logo depois da última linha da anterior, identificada pelo cursor opaco
+``proximo_cursor``, e o custo de uma página não depende de quantas vieram
+antes.
+
+- Sem ``busca``, as linhas seguem a ordem de ``matricula`` e o cursor é a
+  última matrícula; ``prefixo`` vira um intervalo no índice único de
+  matrícula.
+- Com ``busca``, os candidatos vêm do índice FTS5 ``estudantes_fts`` na
+  ordem do rowid (id do estudante) e o cursor é o último id. Ordenar por
+  matrícula exigiria ler e ordenar todas as correspondências de um termo
+  comum a cada página.
+
+Os filtros de ``risco`` e ``perfil`` são aplicados sobre essa ordem, sem
+desviar o plano para os índices das colunas filtradas.
+"""
+
+from __future__ import annotations
+
+import base64
+import re
+import sqlite3
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 500
+
+COLUNAS = """
+    e.id, e.matricula, e.nome, e.email,
+    COALESCE(e.perfil, s.perfil) AS perfil,
+    s.risco, s.impacto_previsto, s.horas_estudo, s.data_registro
+"""
+
+_TERMO = re.compile(r"\w+")
+
+
+class ParametroInvalido(ValueError):
+    """Parâmetro de listagem inválido (a rota responde 400)."""
+
+
+def codificar_cursor(modo: str, valor: str | int) -> str:
+    return base64.urlsafe_b64encode(f"{modo}:{valor}".encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, modo: str) -> str | int:
+    try:
+        texto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        modo_cursor, valor = texto.split(":", 1)
+    except (ValueError, UnicodeDecodeError):
+        raise ParametroInvalido("cursor inválido") from None
+    if modo_cursor != modo:
+        raise ParametroInvalido("cursor de outra consulta (busca e listagem não se misturam)")
+    if modo == "id":
+        try:
+            return int(valor)
+        except ValueError:
+            raise ParametroInvalido("cursor inválido") from None
+    return valor
+
+
+def expressao_busca(texto: str) -> str:
+    """Converte o texto livre em uma consulta FTS5: todos os termos, como prefixo.
+
+    Prefixos de até 6 letras usam os índices de prefixo da tabela FTS; os mais
+    longos custam proporcionalmente ao número de correspondências.
+
+    Cada termo vai entre aspas, então operadores da sintaxe FTS5 digitados
+    pelo usuário são tratados como texto.
+    """
+
+    termos = _TERMO.findall(texto)
+    if not termos:
+        raise ParametroInvalido("busca sem termos")
+    return " ".join(f'"{termo}"*' for termo in termos)
+
+
+def _fim_prefixo(prefixo: str) -> str:
+    """Menor texto maior que todos os que começam com ``prefixo``."""
+
+    return prefixo[:-1] + chr(ord(prefixo[-1]) + 1)
+
+
+def listar_estudantes(
+    conn: sqlite3.Connection,
+    limite: int = LIMITE_PADRAO,
+    cursor: str | None = None,
+    perfil: str | None = None,
+    risco: str | None = None,
+    prefixo: str | None = None,
+    busca: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Retorna uma página de estudantes e o cursor da próxima (ou ``None``)."""
+
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ParametroInvalido(f"limite deve estar entre 1 e {LIMITE_MAXIMO}")
+
+    condicoes: list[str] = []
+    parametros: list = []
+
+    if busca:
+        modo = "id"
+        origem = """
+            FROM estudantes_fts f
+            JOIN estudantes e ON e.id = f.rowid
+            LEFT JOIN estado_atual_estudantes s ON s.estudante_id = e.id
+        """
+        condicoes.append("estudantes_fts MATCH ?")
+        parametros.append(expressao_busca(busca))
+        if cursor:
+            condicoes.append("f.rowid > ?")
+            parametros.append(decodificar_cursor(cursor, modo))
+        ordem = "f.rowid"
+    else:
+        modo = "matricula"
+        origem = """
+            FROM estudantes e
+            LEFT JOIN estado_atual_estudantes s ON s.estudante_id = e.id
+        """
+        if cursor:
+            condicoes.append("e.matricula > ?")
+            parametros.append(decodificar_cursor(cursor, modo))
+        ordem = "e.matricula"
+
+    if prefixo:
+        condicoes.append("e.matricula >= ? AND e.matricula < ?")
+        parametros.extend((prefixo, _fim_prefixo(prefixo)))
+    # O "+" impede o uso do índice de risco, que obrigaria a ordenar todas as
+    # linhas do nível antes de devolver a primeira página.
+    if risco:
+        condicoes.append("+s.risco = ?")
+        parametros.append(risco)
+    if perfil:
+        condicoes.append("COALESCE(e.perfil, s.perfil) = ?")
+        parametros.append(perfil)
+
+    onde = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    sql = f"SELECT {COLUNAS} {origem} {onde} ORDER BY {ordem} LIMIT ?"
+    try:
+        linhas = conn.execute(sql, (*parametros, limite + 1)).fetchall()
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e):
+            raise ParametroInvalido(f"busca inválida: {e}") from None
+        raise
+
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        ultima = linhas[-1]
+        proximo = codificar_cursor(modo, ultima["id"] if modo == "id" else ultima["matricula"])
+
+    estudantes = [
+        {
+            "matricula": linha["matricula"],
+            "nome": linha["nome"],
+            "email": linha["email"],
+            "perfil": linha["perfil"],
+            "risco": linha["risco"],
+            "impacto_previsto": linha["impacto_previsto"],
+            "horas_estudo": linha["horas_estudo"],
+            "data_registro": linha["data_registro"],
+        }
+        for linha in linhas
+    ]
+    return estudantes, proximo
@@ -0,0 +1,264 @@
+"""Métricas no formato de exposição de texto do Prometheus (GET /metrics).
+
+Por rota (a regra da URL, ex. ``/api/estudantes/<matricula>/dashboard``) e
+método:
+
+- ``saa_http_duracao_segundos``: histograma da latência;
+- ``saa_http_requisicoes_total``: requisições por status;
+- ``saa_http_erros_total``: respostas 5xx;
+- ``saa_sql_consultas_por_requisicao`` e ``saa_sql_duracao_por_requisicao_segundos``:
+  histogramas de quantas consultas SQLite cada requisição fez e quanto tempo
+  passou nelas (medidas por :mod:`database.medicao`), com os totais em
+  ``saa_sql_consultas_total`` e ``saa_sql_duracao_segundos_total``;
+
+além de ``saa_http_em_andamento`` (requisições em curso) e dos contadores já
+mantidos pelo cache de relatórios, pelo memo de ``/api/simular`` e pela
+fila de simulações.
+
+Cada thread soma em uma fatia própria, sem lock no caminho da requisição; a
+coleta junta as fatias. As de threads encerradas (o servidor de
+desenvolvimento cria uma por requisição) são consolidadas e descartadas na
+coleta ou quando se acumulam. Os valores são do processo: com vários
+workers, cada um expõe os seus.
+
+``SAA_METRICAS=0`` desliga a coleta (a rota continua respondendo).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from flask import Flask, Response, g, request
+
+from database.medicao import adicionar_observador
+
+HABILITADO = os.environ.get("SAA_METRICAS", "1") != "0"
+
+BUCKETS_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# nome: (tipo, ajuda, buckets)
+METRICAS = {
+    "saa_http_requisicoes_total": ("counter", "Requisições atendidas.", None),
+    "saa_http_erros_total": ("counter", "Respostas com status 5xx.", None),
+    "saa_http_em_andamento": ("gauge", "Requisições em andamento.", None),
+    "saa_http_duracao_segundos": ("histogram", "Latência das requisições.", BUCKETS_SEGUNDOS),
+    "saa_sql_consultas_total": ("counter", "Consultas SQLite feitas por requisições.", None),
+    "saa_sql_duracao_segundos_total": (
+        "counter", "Tempo em consultas SQLite durante requisições.", None
+    ),
+    "saa_sql_consultas_por_requisicao": (
+        "histogram", "Consultas SQLite por requisição.", BUCKETS_CONSULTAS
+    ),
+    "saa_sql_duracao_por_requisicao_segundos": (
+        "histogram", "Tempo em consultas SQLite por requisição.", BUCKETS_SEGUNDOS
+    ),
+}
+
+Rotulos = tuple[tuple[str, str], ...]
+# Coletor: devolve (nome, tipo, ajuda, valor) de métricas lidas na hora da coleta.
+Coletor = Callable[[], Iterable[tuple[str, str, str, float]]]
+
+
+class _Fatia:
+    """Valores somados por uma única thread."""
+
+    __slots__ = ("thread", "contadores", "histogramas")
+
+    def __init__(self, thread: threading.Thread | None) -> None:
+        self.thread = thread
+        self.contadores: dict[tuple[str, Rotulos], float] = {}
+        # Por série: contagem de cada bucket (o último é +Inf) e a soma.
+        self.histogramas: dict[tuple[str, Rotulos], list[float]] = {}
+
+    def juntar(self, outra: "_Fatia") -> None:
+        for chave, valor in list(outra.contadores.items()):
+            self.contadores[chave] = self.contadores.get(chave, 0) + valor
+        for chave, valores in list(outra.histogramas.items()):
+            atual = self.histogramas.get(chave)
+            if atual is None:
+                self.histogramas[chave] = list(valores)
+            else:
+                for i, valor in enumerate(valores):
+                    atual[i] += valor
+
+
+class Registro:
+    """Contadores e histogramas em fatias por thread, juntados na coleta."""
+
+    MAX_FATIAS = 64
+
+    def __init__(self, metricas: dict = METRICAS) -> None:
+        self.metricas = metricas
+        self._local = threading.local()
+        self._fatias: list[_Fatia] = []
+        self._encerradas = _Fatia(None)
+        self._lock = threading.Lock()
+
+    def _fatia(self) -> _Fatia:
+        fatia = getattr(self._local, "fatia", None)
+        if fatia is None:
+            fatia = self._local.fatia = _Fatia(threading.current_thread())
+            with self._lock:
+                self._fatias.append(fatia)
+                if len(self._fatias) > self.MAX_FATIAS:
+                    self._consolidar_encerradas()
+        return fatia
+
+    def _consolidar_encerradas(self) -> None:
+        # Com o lock. Uma thread encerrada não escreve mais na sua fatia.
+        vivas = []
+        for fatia in self._fatias:
+            if fatia.thread.is_alive():
+                vivas.append(fatia)
+            else:
+                self._encerradas.juntar(fatia)
+        self._fatias = vivas
+
+    def somar(self, nome: str, rotulos: Rotulos = (), valor: float = 1) -> None:
+        contadores = self._fatia().contadores
+        chave = (nome, rotulos)
+        contadores[chave] = contadores.get(chave, 0) + valor
+
+    def observar(self, nome: str, rotulos: Rotulos, valor: float) -> None:
+        buckets = self.metricas[nome][2]
+        histogramas = self._fatia().histogramas
+        chave = (nome, rotulos)
+        serie = histogramas.get(chave)
+        if serie is None:
+            serie = histogramas[chave] = [0] * (len(buckets) + 2)
+        serie[bisect_left(buckets, valor)] += 1
+        serie[-1] += valor
+
+    def coletar(self) -> _Fatia:
+        """Soma de todas as fatias até agora."""
+
+        total = _Fatia(None)
+        with self._lock:
+            self._consolidar_encerradas()
+            total.juntar(self._encerradas)
+            fatias = list(self._fatias)
+        for fatia in fatias:
+            total.juntar(fatia)
+        return total
+
+    def limpar(self) -> None:
+        """Zera os valores (ex.: após as requisições de aquecimento de um worker)."""
+
+        with self._lock:
+            for fatia in self._fatias:
+                fatia.contadores.clear()
+                fatia.histogramas.clear()
+            self._encerradas = _Fatia(None)
+
+    def exportar(self, coletores: Iterable[Coletor] = ()) -> str:
+        total = self.coletar()
+        series: dict[str, list[str]] = {nome: [] for nome in self.metricas}
+
+        for (nome, rotulos), valor in sorted(total.contadores.items()):
+            series[nome].append(f"{nome}{_formatar_rotulos(rotulos)} {_numero(valor)}")
+
+        for (nome, rotulos), valores in sorted(total.histogramas.items()):
+            buckets = self.metricas[nome][2]
+            acumulado = 0
+            for limite, quantidade in zip((*buckets, "+Inf"), valores):
+                acumulado += quantidade
+                le = limite if limite == "+Inf" else _numero(limite)
+                series[nome].append(
+                    f"{nome}_bucket{_formatar_rotulos((*rotulos, ('le', le)))} {acumulado}"
+                )
+            series[nome].append(f"{nome}_sum{_formatar_rotulos(rotulos)} {_numero(valores[-1])}")
+            series[nome].append(f"{nome}_count{_formatar_rotulos(rotulos)} {acumulado}")
+
+        linhas = []
+        for nome, (tipo, ajuda, _buckets) in self.metricas.items():
+            if series[nome]:
+                linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}", *series[nome]]
+        for coletor in coletores:
+            for nome, tipo, ajuda, valor in coletor():
+                linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}", f"{nome} {_numero(valor)}"]
+        return "\n".join(linhas) + "\n"
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar_rotulos(rotulos: Rotulos) -> str:
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{chave}="{_escapar(str(valor))}"' for chave, valor in rotulos) + "}"
+
+
+registro = Registro()
+
+# Consultas da requisição em curso nesta thread: [quantidade, segundos].
+_consultas = threading.local()
+
+
+def _observar_consulta(_sql: str, segundos: float, _conexao) -> None:
+    atual = getattr(_consultas, "atual", None)
+    if atual is not None:
+        atual[0] += 1
+        atual[1] += segundos
+
+
+def init_metricas(app: Flask, coletores: Iterable[Coletor] = ()) -> None:
+    """Instrumenta as requisições do app e registra ``GET /metrics``."""
+
+    coletores = list(coletores)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(registro.exportar(coletores), content_type=CONTENT_TYPE)
+
+    if not HABILITADO:
+        return
+
+    adicionar_observador(_observar_consulta)
+
+    @app.before_request
+    def iniciar_medicao():
+        g.metricas_inicio = time.perf_counter()
+        _consultas.atual = [0, 0.0]
+        registro.somar("saa_http_em_andamento")
+
+    @app.after_request
+    def registrar_medicao(resposta):
+        inicio = g.pop("metricas_inicio", None)
+        if inicio is None:
+            return resposta
+        duracao = time.perf_counter() - inicio
+        regra = request.url_rule.rule if request.url_rule is not None else "(sem rota)"
+        rotulos = (("rota", regra), ("metodo", request.method))
+
+        registro.observar("saa_http_duracao_segundos", rotulos, duracao)
+        registro.somar(
+            "saa_http_requisicoes_total", (*rotulos, ("status", str(resposta.status_code)))
+        )
+        if resposta.status_code >= 500:
+            registro.somar("saa_http_erros_total", rotulos)
+
+        consultas, segundos = getattr(_consultas, "atual", None) or (0, 0.0)
+        registro.observar("saa_sql_consultas_por_requisicao", rotulos, consultas)
+        registro.observar("saa_sql_duracao_por_requisicao_segundos", rotulos, segundos)
+        if consultas:
+            registro.somar("saa_sql_consultas_total", rotulos, consultas)
+            registro.somar("saa_sql_duracao_segundos_total", rotulos, segundos)
+        return resposta
+
+    @app.teardown_request
+    def encerrar_medicao(_exc):
+        if getattr(_consultas, "atual", None) is not None:
+            _consultas.atual = None
+            registro.somar("saa_http_em_andamento", (), -1)
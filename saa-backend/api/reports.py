@@ -2,77 +2,190 @@
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator
+
+import numpy as np
+from flask import Blueprint, Response, current_app, jsonify, request
 import sqlite3
-from pathlib import Path
+
+from database.db import get_db, get_pool
+from models.clustering import identificar_perfis_lote
+from models.regression import calcular_impacto_lote, calcular_risco_lote
+
+from .cache import get_cache
+from .condicional import (
+    CACHE_PUBLICO,
+    com_validador,
+    gerar_etag,
+    nao_modificado,
+    versao_global,
+    versao_modelos,
+)
 
 reports_bp = Blueprint("reports", __name__, url_prefix="/api/relatorios")
 
-DB_PATH = Path(__file__).parent.parent / "data" / "saa.db"
+# Linhas lidas do cursor (e escritas na resposta) por vez na exportação.
+LOTE_EXPORTACAO = 5_000
+
+COLUNAS_EXPORTACAO = (
+    "matricula",
+    "nome",
+    "email",
+    "horas_estudo",
+    "participacao_projetos",
+    "disciplinas_praticas",
+    "impacto_percebido",
+    "data_registro",
+    "impacto_previsto",
+    "risco",
+    "perfil",
+)
+
+SQL_EXPORTACAO = """
+    SELECT e.matricula, e.nome, e.email,
+           s.horas_estudo, s.participacao_projetos, s.disciplinas_praticas,
+           s.impacto_percebido, s.data_registro
+    FROM estudantes e
+    LEFT JOIN estado_atual_estudantes s ON s.estudante_id = e.id
+    ORDER BY e.id
+"""
+
+FORMATOS_EXPORTACAO = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def calcular_resumo(conn: sqlite3.Connection) -> dict:
+    """Conta estudantes por nível de risco a partir do estado atual de cada um."""
+
+    total = conn.execute("SELECT COUNT(*) FROM estudantes").fetchone()[0]
 
+    riscos = {"ALTO": 0, "MÉDIO": 0, "BAIXO": 0}
+    for risco, quantidade in conn.execute(
+        "SELECT risco, COUNT(*) FROM estado_atual_estudantes GROUP BY risco"
+    ):
+        riscos[risco] = quantidade
 
-def get_db_connection():
-    """Cria conexão com o banco de dados"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return {
+        "total_estudantes": total,
+        "risco_alto": riscos["ALTO"],
+        "risco_medio": riscos["MÉDIO"],
+        "risco_baixo": riscos["BAIXO"],
+    }
 
 
 @reports_bp.get("/resumo")
 def obter_resumo():
     """Retorna resumo geral de riscos com dados reais do banco"""
     try:
-        from models.regression import calcular_risco, calcular_impacto
-        
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Total de estudantes
-        cursor.execute("SELECT COUNT(*) as total FROM estudantes")
-        total_result = cursor.fetchone()
-        total = total_result['total'] if total_result else 0
-        
-        # Calcular riscos para cada estudante
-        cursor.execute("""
-            SELECT e.id, MAX(d.data_registro) as ultima_data
-            FROM estudantes e
-            LEFT JOIN dados_academicos d ON e.id = d.estudante_id
-            GROUP BY e.id
-        """)
-        
-        estudantes = cursor.fetchall()
-        riscos = {"ALTO": 0, "MÉDIO": 0, "BAIXO": 0}
-        
-        for estudante in estudantes:
-            cursor.execute("""
-                SELECT horas_estudo, participacao_projetos, disciplinas_praticas
-                FROM dados_academicos
-                WHERE estudante_id = ? AND data_registro = ?
-                LIMIT 1
-            """, (estudante['id'], estudante['ultima_data']))
-            
-            dados = cursor.fetchone()
-            
-            if dados:
-                horas = dados['horas_estudo'] or 0
-                projetos = dados['participacao_projetos'] or 0
-                disciplinas = dados['disciplinas_praticas'] or 0
-                
-                impacto = calcular_impacto(horas, projetos, disciplinas)
-                risco = calcular_risco(impacto)
-                
-                if risco in riscos:
-                    riscos[risco] += 1
-        
-        conn.close()
-        
-        return jsonify({
-            "total_estudantes": total,
-            "risco_alto": riscos.get("ALTO", 0),
-            "risco_medio": riscos.get("MÉDIO", 0),
-            "risco_baixo": riscos.get("BAIXO", 0),
-        })
-        
+        conn = get_db()
+        # Os riscos vêm dos modelos: uma troca de versão muda o resumo mesmo
+        # sem escritas (o dashboard usa o mesmo validador).
+        versao = gerar_etag(versao_global(conn), versao_modelos())
+        etag = gerar_etag("resumo", versao)
+        nao_mudou = nao_modificado(etag, CACHE_PUBLICO)
+        if nao_mudou is not None:
+            return nao_mudou
+        resumo = get_cache().obter_ou_calcular("resumo", versao, lambda: calcular_resumo(conn))
+        return com_validador(jsonify(resumo), etag, CACHE_PUBLICO)
+
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+
+@reports_bp.get("/cache")
+def estatisticas_cache():
+    """Contadores do cache de relatórios deste processo"""
+    try:
+        return jsonify(get_cache().estatisticas())
+
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+
+def _pontuar_lote(linhas: list[sqlite3.Row]) -> list[list]:
+    """Acrescenta impacto previsto, risco e perfil (modelos atuais) a um lote.
+
+    Estudantes sem registros ficam com as colunas calculadas vazias.
+    """
+
+    metricas = np.array(
+        [
+            [linha["horas_estudo"] or 0, linha["participacao_projetos"] or 0,
+             linha["disciplinas_praticas"] or 0]
+            for linha in linhas
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    impactos = calcular_impacto_lote(metricas[:, 0], metricas[:, 1], metricas[:, 2])
+    riscos = calcular_risco_lote(impactos)
+    perfis = identificar_perfis_lote(metricas)
+
+    saida = []
+    for linha, impacto, risco, perfil in zip(linhas, impactos.tolist(), riscos, perfis):
+        calculadas = [impacto, risco, perfil] if linha["data_registro"] is not None else [None] * 3
+        saida.append([*linha, *calculadas])
+    return saida
+
+
+def gerar_exportacao(conn: sqlite3.Connection, formato: str) -> Iterator[str]:
+    """Gera a extração da coorte em pedaços de :data:`LOTE_EXPORTACAO` linhas.
+
+    Um único SELECT percorre ``estudantes``; com WAL ele enxerga um retrato
+    consistente do banco do início ao fim, mesmo com escritas concorrentes.
+    A memória usada não depende do número de estudantes.
+    """
+
+    cursor = conn.execute(SQL_EXPORTACAO)
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+
+    if formato == "csv":
+        escritor.writerow(COLUNAS_EXPORTACAO)
+
+    while linhas := cursor.fetchmany(LOTE_EXPORTACAO):
+        pontuadas = _pontuar_lote(linhas)
+        if formato == "csv":
+            escritor.writerows(pontuadas)
+        else:
+            for valores in pontuadas:
+                buffer.write(json.dumps(dict(zip(COLUNAS_EXPORTACAO, valores)), ensure_ascii=False))
+                buffer.write("\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@reports_bp.get("/exportar")
+def exportar():
+    """
+    Exporta todos os estudantes com o estado atual, em streaming
+    GET /api/relatorios/exportar?formato=csv (padrão) ou ?formato=ndjson
+    """
+    formato = request.args.get("formato", "csv").lower()
+    if formato not in FORMATOS_EXPORTACAO:
+        return jsonify({"erro": f"formato deve ser um de: {', '.join(FORMATOS_EXPORTACAO)}"}), 400
+
+    try:
+        # Conexão própria, fora de get_db(): fica emprestada enquanto a
+        # resposta é transmitida, depois que a requisição em si terminou.
+        pool = get_pool(current_app.config.get("DATABASE"))
+        conn = pool.acquire()
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
+    nome = f"estudantes_{date.today():%Y%m%d}.{formato}"
+    resposta = Response(
+        gerar_exportacao(conn, formato),
+        content_type=f"{FORMATOS_EXPORTACAO[formato]}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{nome}"'},
+    )
+    # Devolve a conexão ao fim da transmissão, inclusive se o cliente desistir
+    # antes (o gerador pode nem ter começado).
+    resposta.call_on_close(lambda: pool.release(conn))
+    return resposta
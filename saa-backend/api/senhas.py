@@ -0,0 +1,193 @@
+"""Hash e verificação de senhas fora da thread da requisição.
+
+A verificação (bcrypt ou werkzeug) roda em um pool de threads limitado. bcrypt e hashlib liberam o GIL durante o KDF,
+então o pool usa os núcleos disponíveis sem bloquear as demais rotas. Quando
+há mais verificações pendentes do que ``SAA_LOGIN_MAX_PENDENTES``, novas
+tentativas são recusadas na hora com :class:`SobrecargaError` (o login
+responde 503) em vez de formar uma fila sem limite; o mesmo vale para uma
+verificação que não termina em ``SAA_LOGIN_TIMEOUT`` segundos.
+
+O marcador ``hash_padrao`` gravado por ``populate_real_data.py`` só aceita a
+senha compartilhada "senha123" com ``SAA_SENHA_LEGADA=1``, para bancos de
+desenvolvimento; por padrão, contas com ele não entram.
+
+Após um login bem-sucedido com hash werkzeug, legado ou bcrypt com custo
+diferente de ``SAA_BCRYPT_ROUNDS``, a senha é re-hasheada em segundo plano
+no esquema atual. Os rehashes têm um limite próprio de pendências, para não
+tomar as vagas dos logins; sem vaga, ficam para um próximo login.
+
+Parâmetros ajustáveis por variável de ambiente:
+
+- ``SAA_BCRYPT_ROUNDS``: custo do bcrypt para novos hashes (padrão 12)
+- ``SAA_LOGIN_WORKERS``: threads de verificação (padrão: número de CPUs)
+- ``SAA_LOGIN_MAX_PENDENTES``: verificações em execução + na fila (padrão 4x workers)
+- ``SAA_LOGIN_TIMEOUT``: segundos máximos de espera por uma verificação (padrão 10)
+- ``SAA_REHASH_MAX_PENDENTES``: rehashes em execução + na fila (padrão: workers)
+- ``SAA_SENHA_LEGADA``: ``1`` aceita "senha123" para ``hash_padrao`` (padrão 0)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturoTimeoutError
+from pathlib import Path
+
+import bcrypt
+from werkzeug.security import check_password_hash as wz_check_password_hash
+
+from database.db import get_pool
+
+BCRYPT_ROUNDS = int(os.environ.get("SAA_BCRYPT_ROUNDS", "12"))
+LOGIN_WORKERS = int(os.environ.get("SAA_LOGIN_WORKERS", str(os.cpu_count() or 1)))
+LOGIN_MAX_PENDENTES = int(os.environ.get("SAA_LOGIN_MAX_PENDENTES", str(LOGIN_WORKERS * 4)))
+LOGIN_TIMEOUT = float(os.environ.get("SAA_LOGIN_TIMEOUT", "10"))
+REHASH_MAX_PENDENTES = int(os.environ.get("SAA_REHASH_MAX_PENDENTES", str(LOGIN_WORKERS)))
+# Só para desenvolvimento: a senha legada é a mesma para todas as contas.
+ACEITAR_SENHA_LEGADA = os.environ.get("SAA_SENHA_LEGADA", "0") == "1"
+
+HASH_LEGADO = "hash_padrao"
+SENHA_LEGADA = "senha123"
+
+
+class SobrecargaError(RuntimeError):
+    """Há verificações de senha demais pendentes; o cliente deve tentar de novo."""
+
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    """Hash uma senha usando bcrypt"""
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    Verifica se uma senha corresponde ao hash.
+
+    Suporta:
+    - Hashes gerados com bcrypt (usados pelo endpoint atual e pelo script reset_password.py)
+    - Hashes gerados com werkzeug.security.generate_password_hash
+    - O marcador "hash_padrao" usado por scripts antigos, aceitando a senha "senha123"
+      apenas com ``SAA_SENHA_LEGADA=1`` (ambiente de desenvolvimento)
+    """
+    if not password_hash:
+        return False
+
+    # 1) Tentativa com bcrypt (hashes normalmente começam com "$2")
+    try:
+        if password_hash.startswith("$2"):
+            return bcrypt.checkpw(password.encode(), password_hash.encode())
+    except Exception:
+        # Se der erro, continua para o fallback
+        pass
+
+    # 2) Compatibilidade com dados populados por scripts antigos, só se
+    #    habilitada explicitamente (o werkzeug recusaria o marcador)
+    if password_hash == HASH_LEGADO:
+        # Define uma senha padrão simples para ambiente de desenvolvimento
+        return ACEITAR_SENHA_LEGADA and password == SENHA_LEGADA
+
+    # 3) Fallback: hashes gerados com werkzeug (ex: "pbkdf2:sha256:...", "scrypt:...")
+    try:
+        return wz_check_password_hash(password_hash, password)
+    except Exception:
+        pass
+
+    return False
+
+
+def precisa_rehash(password_hash: str) -> bool:
+    """Indica se o hash não está no esquema atual (bcrypt com ``BCRYPT_ROUNDS``)."""
+
+    if not password_hash.startswith("$2"):
+        return True
+    try:
+        return int(password_hash.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+class ExecutorLimitado:
+    """``ThreadPoolExecutor`` com um teto de tarefas pendentes por categoria (backpressure)."""
+
+    def __init__(self, workers: int, limites: dict[str, int]) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="senhas")
+        self._vagas = {categoria: threading.BoundedSemaphore(n) for categoria, n in limites.items()}
+
+    def submit(self, categoria: str, funcao, *args) -> Future:
+        vagas = self._vagas[categoria]
+        if not vagas.acquire(blocking=False):
+            raise SobrecargaError(f"Muitas tarefas pendentes ({categoria})")
+        try:
+            futuro = self._executor.submit(funcao, *args)
+        except Exception:
+            vagas.release()
+            raise
+        futuro.add_done_callback(lambda _: vagas.release())
+        return futuro
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_executor: ExecutorLimitado | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ExecutorLimitado:
+    """Executor compartilhado do processo, criado na primeira utilização."""
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ExecutorLimitado(
+                LOGIN_WORKERS,
+                {"login": LOGIN_MAX_PENDENTES, "rehash": REHASH_MAX_PENDENTES},
+            )
+        return _executor
+
+
+def verificar_senha(password: str, password_hash: str) -> bool:
+    """Executa :func:`verify_password` no pool limitado e aguarda o resultado.
+
+    Casos sem KDF (hash ausente ou o marcador legado) são resolvidos direto.
+    Levanta :class:`SobrecargaError` se o pool estiver saturado ou se a
+    verificação não terminar em ``LOGIN_TIMEOUT`` segundos.
+    """
+
+    if not password_hash or password_hash == HASH_LEGADO:
+        return verify_password(password, password_hash)
+    futuro = get_executor().submit("login", verify_password, password, password_hash)
+    try:
+        return futuro.result(timeout=LOGIN_TIMEOUT)
+    except FuturoTimeoutError:
+        # Ainda na fila: libera a vaga; se já estiver rodando, termina sozinha.
+        futuro.cancel()
+        raise SobrecargaError(f"Verificação de senha excedeu {LOGIN_TIMEOUT:g}s") from None
+
+
+def _rehash(db_path: Path | None, estudante_id: int, password: str, hash_antigo: str) -> None:
+    novo_hash = hash_password(password)
+    with get_pool(db_path).connection() as conn:
+        # Só troca se ninguém alterou a senha enquanto o novo hash era gerado.
+        conn.execute(
+            "UPDATE estudantes SET senha_hash = ? WHERE id = ? AND senha_hash = ?",
+            (novo_hash, estudante_id, hash_antigo),
+        )
+        conn.commit()
+
+
+def agendar_rehash(
+    db_path: Path | None, estudante_id: int, password: str, hash_antigo: str
+) -> bool:
+    """Agenda a troca do hash para o esquema atual, sem esperar o resultado.
+
+    Sob sobrecarga o rehash é simplesmente adiado para um próximo login.
+    """
+
+    try:
+        get_executor().submit("rehash", _rehash, db_path, estudante_id, password, hash_antigo)
+    except SobrecargaError:
+        return False
+    return True
@@ -2,11 +2,37 @@
 API de Estudantes - Integrado com banco de dados real
 """
 
-from flask import Blueprint, jsonify, request
-import sqlite3
-from pathlib import Path
-import bcrypt
-from werkzeug.security import check_password_hash as wz_check_password_hash
+from flask import Blueprint, current_app, jsonify, request
+
+from database.agregados import media_turma
+from database.alertas import avaliar_alertas
+from database.db import get_db
+from database.estado_atual import atualizar_estado_atual
+
+from .alertas import LIMITE_PADRAO as LIMITE_ALERTAS, contar_nao_lidos, listar_alertas, marcar_lidos
+from .cache import get_cache
+from .condicional import (
+    CACHE_PRIVADO,
+    com_validador,
+    gerar_etag,
+    nao_modificado,
+    versao_modelos,
+    versoes_estudante,
+)
+from .historico import (
+    LIMITE_PADRAO as LIMITE_HISTORICO,
+    historico_estudante,
+    validar_parametros,
+)
+from .listagem import LIMITE_PADRAO, ParametroInvalido, listar_estudantes
+from .senhas import (  # noqa: F401 - hash_password/verify_password reexportados
+    SobrecargaError,
+    agendar_rehash,
+    hash_password,
+    precisa_rehash,
+    verificar_senha,
+    verify_password,
+)
 
 # Importações de modelos
 try:
@@ -27,53 +53,36 @@ except ImportError as e:
 
 students_bp = Blueprint('students', __name__, url_prefix='/api/estudantes')
 
-DB_PATH = Path(__file__).parent.parent / "data" / "saa.db"
-
-
-def get_db_connection():
-    """Cria conexão com o banco de dados"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-def hash_password(password: str) -> str:
-    """Hash uma senha usando bcrypt"""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
-
-def verify_password(password: str, password_hash: str) -> bool:
+@students_bp.route('', methods=['GET'])
+def listar():
     """
-    Verifica se uma senha corresponde ao hash.
-
-    Suporta:
-    - Hashes gerados com bcrypt (usados pelo endpoint atual e pelo script reset_password.py)
-    - Hashes gerados com werkzeug.security.generate_password_hash
-    - O marcador "hash_padrao" usado por scripts antigos, aceitando a senha "senha123"
+    Lista estudantes com paginação por cursor
+    GET /api/estudantes?limite=50&risco=ALTO&perfil=...&prefixo=2024&busca=maria&cursor=...
+    Resposta: {"estudantes": [...], "proximo_cursor": "..." ou null}
     """
-    if not password_hash:
-        return False
-
-    # 1) Tentativa com bcrypt (hashes normalmente começam com "$2")
-    try:
-        if password_hash.startswith("$2"):
-            return bcrypt.checkpw(password.encode(), password_hash.encode())
-    except Exception:
-        # Se der erro, continua para o fallback
-        pass
-
-    # 2) Fallback: hashes gerados com werkzeug (ex: "pbkdf2:sha256:...")
     try:
-        return wz_check_password_hash(password_hash, password)
-    except Exception:
-        pass
-
-    # 3) Compatibilidade com dados populados por scripts antigos
-    if password_hash == "hash_padrao":
-        # Define uma senha padrão simples para ambiente de desenvolvimento
-        return password == "senha123"
-
-    return False
+        args = request.args
+        try:
+            limite = int(args.get('limite', LIMITE_PADRAO))
+        except ValueError:
+            return jsonify({"erro": "limite deve ser um número inteiro"}), 400
+        
+        estudantes, proximo = listar_estudantes(
+            get_db(),
+            limite=limite,
+            cursor=args.get('cursor'),
+            perfil=args.get('perfil'),
+            risco=args.get('risco'),
+            prefixo=args.get('prefixo'),
+            busca=args.get('busca'),
+        )
+        return jsonify({"estudantes": estudantes, "proximo_cursor": proximo})
+        
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
 
 
 @students_bp.route('/login', methods=['POST'])
@@ -91,19 +100,33 @@ def login():
         if not matricula or not senha:
             return jsonify({"sucesso": False, "erro": "Matrícula e senha obrigatórias"}), 400
         
-        conn = get_db_connection()
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM estudantes WHERE matricula = ?", (matricula,))
         estudante = cursor.fetchone()
-        conn.close()
         
         if not estudante:
             return jsonify({"sucesso": False, "erro": "Estudante não encontrado"}), 401
         
-        # Verificar senha
-        if not verify_password(senha, estudante['senha_hash']):
+        # Verificar senha (no pool limitado; 503 se estiver saturado)
+        try:
+            senha_ok = verificar_senha(senha, estudante['senha_hash'])
+        except SobrecargaError:
+            resposta = jsonify({"sucesso": False, "erro": "Servidor ocupado, tente novamente"})
+            return resposta, 503, {"Retry-After": "1"}
+        
+        if not senha_ok:
             return jsonify({"sucesso": False, "erro": "Senha incorreta"}), 401
         
+        # Migra hashes antigos para o esquema atual, em segundo plano
+        if precisa_rehash(estudante['senha_hash']):
+            agendar_rehash(
+                current_app.config.get("DATABASE"),
+                estudante['id'],
+                senha,
+                estudante['senha_hash'],
+            )
+        
         # Login bem-sucedido
         return jsonify({
             "sucesso": True,
@@ -124,51 +147,54 @@ def get_dashboard(matricula):
     GET /api/estudantes/2024025/dashboard
     """
     try:
-        conn = get_db_connection()
+        conn = get_db()
         cursor = conn.cursor()
         
-        # Busca dados do estudante
+        # Validador: versão do estudante, da turma (média) e dos modelos.
+        # Se o cliente já tem esta versão, nada mais é consultado.
+        etag = None
+        versoes = versoes_estudante(conn, matricula)
+        if versoes:
+            etag = gerar_etag("dashboard", *versoes, versao_modelos())
+            nao_mudou = nao_modificado(etag, CACHE_PRIVADO)
+            if nao_mudou is not None:
+                return nao_mudou
+        
+        # Busca dados do estudante e seu estado atual (último registro já pontuado)
         cursor.execute("""
-            SELECT e.*, d.horas_estudo, d.participacao_projetos, 
-                   d.disciplinas_praticas, d.impacto_percebido, d.data_registro
+            SELECT e.matricula, e.nome, e.email, e.perfil,
+                   s.horas_estudo, s.participacao_projetos, s.disciplinas_praticas,
+                   s.impacto_percebido, s.risco, s.perfil AS perfil_calculado
             FROM estudantes e
-            LEFT JOIN dados_academicos d ON e.id = d.estudante_id
+            LEFT JOIN estado_atual_estudantes s ON s.estudante_id = e.id
             WHERE e.matricula = ?
-            ORDER BY d.data_registro DESC
-            LIMIT 1
         """, (matricula,))
         
         estudante = cursor.fetchone()
         
         if not estudante:
-            conn.close()
             return jsonify({"erro": "Estudante não encontrado"}), 404
         
-        # Calcula métricas
+        # Métricas (calculadas na hora apenas para estudantes sem registros)
         horas = estudante['horas_estudo'] or 0
         projetos = estudante['participacao_projetos'] or 0
         disciplinas = estudante['disciplinas_praticas'] or 0
         impacto_real = estudante['impacto_percebido'] or 0
         
-        impacto_previsto = calcular_impacto(horas, projetos, disciplinas)
-        risco = calcular_risco(impacto_previsto)
-        perfil = estudante['perfil'] or identificar_perfil(horas, projetos, disciplinas)
-        
-        # Busca média da turma
-        cursor.execute("""
-            SELECT AVG(horas_estudo) as media_horas
-            FROM dados_academicos
-        """)
+        risco = estudante['risco'] or calcular_risco(calcular_impacto(horas, projetos, disciplinas))
+        perfil = (
+            estudante['perfil']
+            or estudante['perfil_calculado']
+            or identificar_perfil(horas, projetos, disciplinas)
+        )
         
-        media_turma = cursor.fetchone()
-        media_horas = media_turma['media_horas'] or 0
+        # Média da turma (mantida incrementalmente em agregados_turma)
+        media_horas = media_turma(conn, "horas_estudo") or 0
         
         percentual_horas = 0
         if media_horas > 0:
             percentual_horas = ((horas - media_horas) / media_horas * 100)
         
-        conn.close()
-        
         # Monta resposta
         response = {
             "estudante": {
@@ -186,12 +212,68 @@ def get_dashboard(matricula):
             }
         }
         
-        return jsonify(response)
+        resposta = jsonify(response)
+        if etag is not None:
+            com_validador(resposta, etag, CACHE_PRIVADO)
+        return resposta
         
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
 
+@students_bp.route('/<matricula>/historico', methods=['GET'])
+def get_historico(matricula):
+    """
+    Série histórica do estudante, bruta ou agrupada por semana/mês
+    GET /api/estudantes/2024001/historico?agrupar=mes&inicio=2024-01-01&fim=2024-12-31&limite=200
+    Resposta: {"agrupar": "mes", "pontos": [{"periodo": "2024-01-01", "registros": 4,
+               "horas_estudo": {"min": 8.0, "media": 9.5, "max": 11.0}, ...}, ...]}
+    """
+    try:
+        # Parâmetros inválidos dão 400 antes de qualquer consulta ou 304.
+        args = request.args
+        try:
+            limite = int(args.get('limite', LIMITE_HISTORICO))
+        except ValueError:
+            return jsonify({"erro": "limite deve ser um número inteiro"}), 400
+        
+        agrupar, inicio, fim, limite = validar_parametros(
+            args.get('agrupar'), args.get('inicio'), args.get('fim'), limite
+        )
+        
+        conn = get_db()
+        
+        estudante = conn.execute(
+            "SELECT id, versao FROM estudantes WHERE matricula = ?", (matricula,)
+        ).fetchone()
+        if not estudante:
+            return jsonify({"erro": "Estudante não encontrado"}), 404
+        
+        # A série só muda com os registros do próprio estudante; o ETag vale
+        # para a URL (com os parâmetros) em que foi recebido.
+        etag = gerar_etag("historico", estudante['versao'])
+        nao_mudou = nao_modificado(etag, CACHE_PRIVADO)
+        if nao_mudou is not None:
+            return nao_mudou
+        
+        pontos = historico_estudante(
+            conn,
+            estudante['id'],
+            agrupar=agrupar,
+            inicio=inicio,
+            fim=fim,
+            limite=limite,
+        )
+        
+        resposta = jsonify({"agrupar": agrupar, "pontos": pontos})
+        return com_validador(resposta, etag, CACHE_PRIVADO)
+        
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+
 @students_bp.route('/<matricula>/atualizar', methods=['POST'])
 def atualizar_dados(matricula):
     """
@@ -207,7 +289,7 @@ def atualizar_dados(matricula):
     try:
         data = request.get_json()
         
-        conn = get_db_connection()
+        conn = get_db()
         cursor = conn.cursor()
         
         # Buscar ID do estudante
@@ -215,7 +297,6 @@ def atualizar_dados(matricula):
         estudante = cursor.fetchone()
         
         if not estudante:
-            conn.close()
             return jsonify({"sucesso": False, "erro": "Estudante não encontrado"}), 404
         
         # Inserir novo registro
@@ -230,11 +311,107 @@ def atualizar_dados(matricula):
             data.get('disciplinas_praticas', 0),
             data.get('impacto_percebido', 0)
         ))
+        atualizar_estado_atual(conn, estudante['id'])
+        alertas = avaliar_alertas(conn, estudante['id'])
         
         conn.commit()
-        conn.close()
+        # A versão dos dados mudou: os relatórios em cache não serão mais usados.
+        get_cache().invalidar()
         
-        return jsonify({"sucesso": True, "mensagem": "Dados atualizados com sucesso"}), 200
+        return jsonify({
+            "sucesso": True,
+            "mensagem": "Dados atualizados com sucesso",
+            "alertas": alertas
+        }), 200
         
     except Exception as e:
-        return jsonify({"sucesso": False, "erro": str(e)}), 500
\ No newline at end of file
+        return jsonify({"sucesso": False, "erro": str(e)}), 500
+
+
+def _id_estudante(conn, matricula):
+    estudante = conn.execute("SELECT id FROM estudantes WHERE matricula = ?", (matricula,)).fetchone()
+    return estudante['id'] if estudante else None
+
+
+@students_bp.route('/<matricula>/alertas', methods=['GET'])
+def listar_alertas_estudante(matricula):
+    """
+    Lista os alertas do estudante, do mais recente para o mais antigo
+    GET /api/estudantes/2024001/alertas?limite=20&nao_lidos=1&cursor=...
+    Resposta: {"alertas": [...], "proximo_cursor": "..." ou null}
+    """
+    try:
+        conn = get_db()
+        estudante_id = _id_estudante(conn, matricula)
+        if estudante_id is None:
+            return jsonify({"erro": "Estudante não encontrado"}), 404
+        
+        args = request.args
+        try:
+            limite = int(args.get('limite', LIMITE_ALERTAS))
+        except ValueError:
+            return jsonify({"erro": "limite deve ser um número inteiro"}), 400
+        
+        alertas, proximo = listar_alertas(
+            conn,
+            estudante_id,
+            limite=limite,
+            cursor=args.get('cursor'),
+            nao_lidos=args.get('nao_lidos', '0').lower() in ('1', 'true', 'sim'),
+        )
+        return jsonify({"alertas": alertas, "proximo_cursor": proximo})
+        
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+
+@students_bp.route('/<matricula>/alertas/nao-lidos', methods=['GET'])
+def contar_alertas_nao_lidos(matricula):
+    """
+    Contagem de alertas não lidos (selo do app)
+    GET /api/estudantes/2024001/alertas/nao-lidos
+    Resposta: {"nao_lidos": 2, "por_tipo": {"RISCO_ALTO": 2}}
+    """
+    try:
+        conn = get_db()
+        estudante_id = _id_estudante(conn, matricula)
+        if estudante_id is None:
+            return jsonify({"erro": "Estudante não encontrado"}), 404
+        
+        return jsonify(contar_nao_lidos(conn, estudante_id))
+        
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+
+@students_bp.route('/<matricula>/alertas/lidos', methods=['POST'])
+def marcar_alertas_lidos(matricula):
+    """
+    Marca alertas como lidos, em uma única instrução
+    POST /api/estudantes/2024001/alertas/lidos
+    Body: {"ids": [10, 12]} (sem "ids", marca todos os não lidos)
+    Resposta: {"sucesso": true, "marcados": 2, "nao_lidos": 0}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        conn = get_db()
+        estudante_id = _id_estudante(conn, matricula)
+        if estudante_id is None:
+            return jsonify({"sucesso": False, "erro": "Estudante não encontrado"}), 404
+        
+        marcados = marcar_lidos(conn, estudante_id, data.get('ids'))
+        conn.commit()
+        
+        return jsonify({
+            "sucesso": True,
+            "marcados": marcados,
+            "nao_lidos": contar_nao_lidos(conn, estudante_id)["nao_lidos"]
+        }), 200
+        
+    except ParametroInvalido as e:
+        return jsonify({"sucesso": False, "erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"sucesso": False, "erro": str(e)}), 500
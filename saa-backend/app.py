@@ -1,13 +1,118 @@
+from pathlib import Path
+
+import numpy as np
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
-from models.regression import calcular_impacto, calcular_risco
+from models.regression import (
+    calcular_impacto_lote,
+    calcular_risco_lote,
+    estatisticas_memo,
+    pontuar_cenario,
+)
+from models import recarregar_modelos_alterados
 from api import reports_bp, students_bp
+from api.cache import get_cache
+from api.metricas import init_metricas
+from database import init_app as init_db_app
+from database.diagnostico import init_diagnostico
+from database.db import DEFAULT_DB_PATH
+from database.estado_atual import sincronizar_com_modelos
+from database.migrate import SchemaDesatualizadoError, exigir_schema_atual
+from database.simulacoes import HABILITADO as REGISTRAR_SIMULACOES, get_fila_simulacoes
+
+# Limite de cenários por requisição em /api/simular/lote.
+MAX_CENARIOS_LOTE = 50_000
+
+CAMPOS_SIMULACAO = ("horas_estudo", "projetos", "disciplinas")
+
+
+def _extrair_cenarios(payload: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Converte o corpo de /api/simular/lote em três arrays de mesmo tamanho.
+
+    Aceita uma lista de cenários (``{"cenarios": [{...}, ...]}``) ou um array
+    por campo (``{"horas_estudo": [...], "projetos": [...], ...}``). Campos
+    ausentes valem 0, como em /api/simular.
+    """
+
+    if "cenarios" in payload:
+        cenarios = payload["cenarios"]
+        if not isinstance(cenarios, list) or not all(isinstance(c, dict) for c in cenarios):
+            raise ValueError("'cenarios' deve ser uma lista de objetos")
+        colunas = [[c.get(campo, 0) for c in cenarios] for campo in CAMPOS_SIMULACAO]
+    else:
+        presentes = [payload[c] for c in CAMPOS_SIMULACAO if c in payload]
+        if not presentes:
+            raise ValueError("Informe 'cenarios' ou arrays de horas_estudo, projetos e disciplinas")
+        if not all(isinstance(valores, list) for valores in presentes):
+            raise ValueError("horas_estudo, projetos e disciplinas devem ser listas")
+        tamanho = len(presentes[0])
+        if any(len(valores) != tamanho for valores in presentes):
+            raise ValueError("horas_estudo, projetos e disciplinas devem ter o mesmo tamanho")
+        colunas = [payload.get(campo, [0] * tamanho) for campo in CAMPOS_SIMULACAO]
 
+    if len(colunas[0]) > MAX_CENARIOS_LOTE:
+        raise ValueError(f"Máximo de {MAX_CENARIOS_LOTE} cenários por requisição")
 
-def create_app() -> Flask:
+    horas, projetos, disciplinas = (np.asarray(c, dtype=np.float64) for c in colunas)
+    # null vira NaN na conversão; /api/simular falharia com o mesmo valor.
+    for campo, valores in zip(CAMPOS_SIMULACAO, (horas, projetos, disciplinas)):
+        if valores.ndim != 1 or not np.isfinite(valores).all():
+            raise ValueError(f"'{campo}' deve conter apenas números finitos")
+    # int() trunca em direção a zero, assim como astype(int64).
+    return horas, projetos.astype(np.int64), disciplinas.astype(np.int64)
+
+
+def _metricas_componentes(app: Flask) -> list[tuple[str, str, str, float]]:
+    """Contadores do memo, da fila de simulações e do cache de relatórios, para /metrics."""
+
+    memo = estatisticas_memo()
+    fila = get_fila_simulacoes(app.config.get("DATABASE")).estatisticas()
+    cache = get_cache().estatisticas()
+    return [
+        ("saa_simular_memo_acertos_total", "counter", "Acertos do memo de /api/simular.", memo["acertos"]),
+        ("saa_simular_memo_faltas_total", "counter", "Faltas do memo de /api/simular.", memo["faltas"]),
+        ("saa_simulacoes_gravadas_total", "counter", "Simulações gravadas em lote.", fila["gravados"]),
+        ("saa_simulacoes_descartadas_total", "counter", "Simulações descartadas com a fila cheia.", fila["descartados"]),
+        ("saa_simulacoes_falhas_total", "counter", "Simulações perdidas em lotes com erro.", fila["falhas"]),
+        ("saa_simulacoes_pendentes", "gauge", "Simulações aguardando gravação.", fila["pendentes"]),
+        ("saa_cache_relatorios_acertos_total", "counter", "Acertos do cache de relatórios.", cache["acertos"]),
+        ("saa_cache_relatorios_faltas_total", "counter", "Faltas do cache de relatórios.", cache["faltas"]),
+    ]
+
+
+def create_app(database: Path | str | None = None) -> Flask:
     app = Flask(__name__)
     CORS(app)
+    # Caminho do banco usado pelas rotas; None usa database.db.DEFAULT_DB_PATH.
+    app.config["DATABASE"] = database
+    init_db_app(app)
+    # Antes dos demais hooks, para que a latência medida inclua todos eles.
+    init_metricas(app, [lambda: _metricas_componentes(app)])
+    # Só com SAA_SQL_DIAGNOSTICO=1: consultas por requisição, lentas e N+1.
+    init_diagnostico(app)
+    # Carrega os artefatos dos modelos (ou os padrões) antes da primeira requisição.
+    recarregar_modelos_alterados()
+    # Banco existente com migrações pendentes: falha já na inicialização.
+    if Path(app.config.get("DATABASE") or DEFAULT_DB_PATH).exists():
+        exigir_schema_atual(app.config.get("DATABASE"))
+
+    @app.before_request
+    def conferir_schema():
+        # O banco pode ser trocado depois de create_app (app.config["DATABASE"]);
+        # cada arquivo é conferido até a primeira vez em que está atualizado.
+        try:
+            exigir_schema_atual(app.config.get("DATABASE"))
+        except SchemaDesatualizadoError as e:
+            return jsonify({"erro": str(e)}), 503
+
+    @app.before_request
+    def atualizar_modelos():
+        # Um stat por artefato: versões gravadas por um novo treino entram
+        # em uso sem reiniciar o processo.
+        recarregar_modelos_alterados()
+        # Estado atual calculado com outras versões: recalculado em segundo plano.
+        sincronizar_com_modelos(app.config.get("DATABASE"))
 
     app.register_blueprint(students_bp)
     app.register_blueprint(reports_bp)
@@ -30,24 +135,60 @@ def create_app() -> Flask:
     def simular_cenario():
         payload = request.get_json(force=True, silent=True) or {}
 
+        # Vai para a fila de gravação: só texto (ou ausente) chega ao INSERT.
+        matricula = payload.get("matricula")
+        if matricula is not None and not isinstance(matricula, str):
+            return jsonify({"erro": "'matricula' deve ser um texto"}), 400
+
         horas_estudo = float(payload.get("horas_estudo", 0))
         projetos = int(payload.get("projetos", 0))
         disciplinas = int(payload.get("disciplinas", 0))
 
-        impacto = calcular_impacto(horas_estudo, projetos, disciplinas)
-        risco = calcular_risco(impacto)
+        impacto, risco = pontuar_cenario(horas_estudo, projetos, disciplinas)
+
+        if REGISTRAR_SIMULACOES:
+            # Só enfileira; a gravação em lote acontece em segundo plano.
+            get_fila_simulacoes(app.config.get("DATABASE")).registrar(
+                matricula, horas_estudo, projetos, disciplinas, impacto, risco
+            )
 
         return jsonify({
             "impacto_previsto": impacto,
             "risco": risco,
         })
 
+    @app.route("/api/simular/estatisticas", methods=["GET"])
+    def estatisticas_simulacao():
+        return jsonify({
+            "cache": estatisticas_memo(),
+            "gravacao": get_fila_simulacoes(app.config.get("DATABASE")).estatisticas(),
+        })
+
+    @app.route("/api/simular/lote", methods=["POST"])
+    def simular_cenarios_lote():
+        payload = request.get_json(force=True, silent=True) or {}
+
+        try:
+            horas_estudo, projetos, disciplinas = _extrair_cenarios(payload)
+        except (TypeError, ValueError) as e:
+            return jsonify({"erro": str(e)}), 400
+
+        impactos = calcular_impacto_lote(horas_estudo, projetos, disciplinas)
+        riscos = calcular_risco_lote(impactos)
+
+        return jsonify({
+            "total": int(impactos.size),
+            "impacto_previsto": impactos.tolist(),
+            "risco": riscos.tolist(),
+        })
+
     return app
 
 
 if __name__ == "__main__":
     # Executa o servidor em modo estável (sem debugger/reloader),
     # para evitar problemas de sandbox/namespace no ambiente.
+    # Em produção, use vários workers: gunicorn -c gunicorn.conf.py
     create_app().run(
         host="0.0.0.0",
         port=5000,
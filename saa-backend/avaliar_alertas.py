@@ -0,0 +1,55 @@
+"""Avalia as regras de alerta para todos os estudantes e cria os que faltam.
+
+Uso:
+    python avaliar_alertas.py [--lote 50000] [--db data/saa.db] [--reconstruir]
+
+A API já avalia as regras a cada ``atualizar_dados``; use este script após
+cargas feitas fora da API, um novo treino dos modelos ou mudança nas regras
+(``SAA_ALERTAS_REGRAS``). Estudantes que já têm um alerta não lido do mesmo
+tipo não recebem outro. Com ``--reconstruir``, o estado atual é recalculado
+antes, com os modelos atuais.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from api.cache import invalidar_cache_compartilhado
+from database.alertas import regras_atuais, varrer_alertas
+from database.db import get_connection
+from database.estado_atual import reconstruir_estado_atual
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Avalia as regras de alerta da coorte inteira.")
+    parser.add_argument("--lote", type=int, default=50_000, help="estudantes por transação")
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    parser.add_argument(
+        "--reconstruir", action="store_true", help="recalcula o estado atual antes de avaliar"
+    )
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    if args.reconstruir:
+        gravados = reconstruir_estado_atual(conn, args.lote)
+        print(f"✅ Estado atual de {gravados} estudantes reconstruído")
+        if (removidos := invalidar_cache_compartilhado()) is not None:
+            print(f"   {removidos} relatórios removidos do cache compartilhado")
+
+    regras = regras_atuais()
+    print(f"🔔 Avaliando {len(regras)} regra(s): {', '.join(r.tipo for r in regras)}")
+    inicio = time.perf_counter()
+    criados = varrer_alertas(conn, args.lote, regras)
+    duracao = time.perf_counter() - inicio
+    total = conn.execute("SELECT COUNT(*) FROM estado_atual_estudantes").fetchone()[0]
+    conn.close()
+
+    taxa = total / duracao if duracao else 0
+    print(f"✅ {criados} alertas criados")
+    print(f"   {duracao:.2f}s ({taxa:,.0f} estudantes/s)")
+
+
+if __name__ == "__main__":
+    main()
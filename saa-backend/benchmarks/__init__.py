@@ -0,0 +1,5 @@
+"""Benchmarks de desempenho do backend.
+
+Cada módulo pode ser executado com ``python -m benchmarks.<nome>`` a partir
+do diretório ``saa-backend``.
+"""
@@ -0,0 +1,157 @@
+"""Benchmark de concorrência: leituras do dashboard misturadas com atualizações.
+
+Executa a mesma carga em dois modos, cada um em um banco próprio:
+
+- ``legado``: ``sqlite3.connect`` a cada operação, journal em modo DELETE e
+  configurações padrão, como as rotas faziam antes do pool;
+- ``pool``: conexões emprestadas de ``database.db.ConnectionPool`` (WAL,
+  busy_timeout, cache e mmap ajustados).
+
+Uso:
+    python -m benchmarks.bench_concorrencia --estudantes 20000 --leitores 8 --escritores 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from database.db import ConnectionPool
+
+from .dados import criar_banco, matricula_sintetica
+
+# Consultas equivalentes às de get_dashboard e atualizar_dados (api/students.py).
+SQL_DASHBOARD = """
+    SELECT e.*, d.horas_estudo, d.participacao_projetos,
+           d.disciplinas_praticas, d.impacto_percebido, d.data_registro
+    FROM estudantes e
+    LEFT JOIN dados_academicos d ON e.id = d.estudante_id
+    WHERE e.matricula = ?
+    ORDER BY d.data_registro DESC
+    LIMIT 1
+"""
+SQL_MEDIA = "SELECT contagem, soma FROM agregados_turma WHERE metrica = 'horas_estudo'"
+SQL_INSERIR = """
+    INSERT INTO dados_academicos
+    (estudante_id, horas_estudo, participacao_projetos, disciplinas_praticas, impacto_percebido, data_registro)
+    VALUES (?, ?, ?, ?, ?, DATE('now'))
+"""
+
+
+def fabrica_legada(db_path: Path):
+    @contextmanager
+    def conexao():
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    return conexao
+
+
+def executar(conexao, n_estudantes: int, leitores: int, escritores: int, duracao: float) -> dict:
+    """Roda leitores e escritores em paralelo por ``duracao`` segundos."""
+
+    latencias = {"leitura": [], "escrita": []}
+    erros = {"leitura": 0, "escrita": 0}
+    lock = threading.Lock()
+    fim = time.perf_counter() + duracao
+
+    def ler(rng: random.Random):
+        with conexao() as conn:
+            conn.execute(SQL_DASHBOARD, (matricula_sintetica(rng.randint(1, n_estudantes)),)).fetchone()
+            conn.execute(SQL_MEDIA).fetchone()
+
+    def escrever(rng: random.Random):
+        with conexao() as conn:
+            conn.execute(SQL_INSERIR, (rng.randint(1, n_estudantes), 10.0, 2, 2, 3.0))
+            conn.commit()
+
+    def trabalhador(tipo: str, operacao, semente: int):
+        rng = random.Random(semente)
+        locais = []
+        falhas = 0
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                operacao(rng)
+                locais.append(time.perf_counter() - inicio)
+            except sqlite3.OperationalError:
+                falhas += 1
+        with lock:
+            latencias[tipo].extend(locais)
+            erros[tipo] += falhas
+
+    threads = [
+        threading.Thread(target=trabalhador, args=("leitura", ler, i)) for i in range(leitores)
+    ] + [
+        threading.Thread(target=trabalhador, args=("escrita", escrever, 1000 + i))
+        for i in range(escritores)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    resultado = {}
+    for tipo, valores in latencias.items():
+        amostras = np.array(valores) * 1e3 if valores else np.array([np.nan])
+        resultado[tipo] = {
+            "ops_s": len(valores) / duracao,
+            "p50_ms": float(np.percentile(amostras, 50)),
+            "p99_ms": float(np.percentile(amostras, 99)),
+            "erros": erros[tipo],
+        }
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--estudantes", type=int, default=20_000)
+    parser.add_argument("--leitores", type=int, default=8)
+    parser.add_argument("--escritores", type=int, default=2)
+    parser.add_argument("--duracao", type=float, default=5.0, help="segundos por modo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modos = {}
+
+        db_legado = criar_banco(Path(tmp) / "legado.db", args.estudantes)
+        with sqlite3.connect(db_legado) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+        modos["legado"] = fabrica_legada(db_legado)
+
+        db_pool = criar_banco(Path(tmp) / "pool.db", args.estudantes)
+        pool = ConnectionPool(db_pool, tamanho=args.leitores + args.escritores)
+        modos["pool"] = pool.connection
+
+        print(
+            f"{args.estudantes} estudantes, {args.leitores} leitores, "
+            f"{args.escritores} escritores, {args.duracao:.0f}s por modo\n"
+        )
+        print(f"{'modo':<8} {'operação':<8} {'ops/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'erros':>6}")
+        for nome, conexao in modos.items():
+            resultado = executar(
+                conexao, args.estudantes, args.leitores, args.escritores, args.duracao
+            )
+            for tipo, r in resultado.items():
+                print(
+                    f"{nome:<8} {tipo:<8} {r['ops_s']:>9.1f} {r['p50_ms']:>9.2f} "
+                    f"{r['p99_ms']:>9.2f} {r['erros']:>6}"
+                )
+
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
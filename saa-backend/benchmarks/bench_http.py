@@ -0,0 +1,378 @@
+"""Benchmark de carga HTTP das rotas do backend.
+
+Para cada tamanho de coorte gera um banco sintético e, para cada nível de
+concorrência, dispara requisições em ciclo fechado (cada cliente espera a
+resposta antes de enviar a próxima) contra cada rota, por ``--duracao``
+segundos. Dois modos:
+
+- ``cliente``: ``create_app()`` chamado no próprio processo pelo Flask test
+  client, sem rede; mede o custo das rotas em si;
+- ``servidor``: a aplicação servida pelo servidor WSGI do werkzeug em um
+  processo separado, com uma conexão HTTP nova por requisição. Com ``--url``
+  usa um servidor já em execução (gerado com ``gerar_dados_sinteticos.py``
+  e com ``--estudantes`` igual ao tamanho daquele banco).
+
+Os estudantes usam um hash bcrypt real com o custo de ``SAA_BCRYPT_ROUNDS``,
+então o login mede a verificação de produção (sem rehash em segundo plano).
+
+O resultado (latências p50/p95/p99, requisições por segundo, erros e códigos
+de status) é salvo em JSON junto com o commit atual; ``--comparar`` mostra a
+variação em relação a um JSON anterior.
+
+Uso:
+    python -m benchmarks.bench_http --estudantes 1000 20000 --concorrencia 1 8
+        [--modos cliente servidor] [--rotas simular dashboard listar] [--duracao 3]
+        [--saida resultado.json] [--comparar anterior.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from api.listagem import codificar_cursor
+from database.sintetico import SENHA_PADRAO, gerar_banco, matricula_sintetica
+
+RESULTADOS_DIR = Path(__file__).resolve().parent / "resultados"
+
+
+def _simular(rng: random.Random, _n: int):
+    corpo = {
+        "horas_estudo": round(rng.uniform(0, 30), 1),
+        "projetos": rng.randint(0, 6),
+        "disciplinas": rng.randint(0, 4),
+    }
+    return "POST", "/api/simular", corpo
+
+
+def _login(rng: random.Random, n: int):
+    corpo = {"matricula": matricula_sintetica(rng.randint(1, n)), "senha": SENHA_PADRAO}
+    return "POST", "/api/estudantes/login", corpo
+
+
+def _dashboard(rng: random.Random, n: int):
+    return "GET", f"/api/estudantes/{matricula_sintetica(rng.randint(1, n))}/dashboard", None
+
+
+def _atualizar(rng: random.Random, n: int):
+    corpo = {
+        "horas_estudo": round(rng.uniform(0, 30), 1),
+        "participacao_projetos": rng.randint(0, 6),
+        "disciplinas_praticas": rng.randint(0, 4),
+        "impacto_percebido": round(rng.uniform(0, 7), 1),
+    }
+    return "POST", f"/api/estudantes/{matricula_sintetica(rng.randint(1, n))}/atualizar", corpo
+
+
+def _resumo(_rng: random.Random, _n: int):
+    return "GET", "/api/relatorios/resumo", None
+
+
+def _listar(rng: random.Random, n: int):
+    # Página em posição aleatória da listagem: deve custar o mesmo que a primeira.
+    cursor = codificar_cursor("matricula", matricula_sintetica(rng.randint(1, n)))
+    return "GET", f"/api/estudantes?limite=50&cursor={cursor}", None
+
+
+def _buscar(rng: random.Random, n: int):
+    return "GET", f"/api/estudantes?limite=50&busca={rng.randint(1, n)}", None
+
+
+# Nome da rota -> função que sorteia (método, caminho, corpo JSON).
+ROTAS = {
+    "simular": _simular,
+    "login": _login,
+    "dashboard": _dashboard,
+    "atualizar": _atualizar,
+    "resumo": _resumo,
+    "listar": _listar,
+    "buscar": _buscar,
+}
+
+
+class ClienteTeste:
+    """Envia requisições pelo Flask test client (um por thread)."""
+
+    def __init__(self, app) -> None:
+        self._cliente = app.test_client()
+
+    def enviar(self, metodo: str, caminho: str, corpo: dict | None) -> int:
+        resposta = self._cliente.open(caminho, method=metodo, json=corpo)
+        resposta.close()
+        return resposta.status_code
+
+
+class ClienteHTTP:
+    """Envia requisições HTTP reais, abrindo uma conexão por requisição."""
+
+    def __init__(self, host: str, porta: int, timeout: float = 30.0) -> None:
+        self.host = host
+        self.porta = porta
+        self.timeout = timeout
+
+    def enviar(self, metodo: str, caminho: str, corpo: dict | None) -> int:
+        conexao = http.client.HTTPConnection(self.host, self.porta, timeout=self.timeout)
+        try:
+            dados = json.dumps(corpo).encode() if corpo is not None else None
+            cabecalhos = {"Content-Type": "application/json"} if dados is not None else {}
+            conexao.request(metodo, caminho, body=dados, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+            return resposta.status
+        finally:
+            conexao.close()
+
+
+def executar_carga(
+    criar_cliente,
+    rota: str,
+    n_estudantes: int,
+    concorrencia: int,
+    duracao: float,
+    aquecimento: int,
+    seed: int,
+) -> dict:
+    """Roda ``concorrencia`` clientes em ciclo fechado contra uma rota."""
+
+    gerar = ROTAS[rota]
+    latencias: list[float] = []
+    status: Counter[str] = Counter()
+    lock = threading.Lock()
+    janela: dict[str, float] = {}
+
+    def abrir_janela() -> None:
+        # Roda uma vez, antes de qualquer thread passar da barreira.
+        janela["inicio"] = time.perf_counter()
+        janela["fim"] = janela["inicio"] + duracao
+
+    pronto = threading.Barrier(concorrencia + 1, action=abrir_janela)
+
+    def trabalhador(indice: int) -> None:
+        rng = random.Random(seed * 1000 + indice)
+        cliente = criar_cliente()
+        for _ in range(aquecimento):
+            try:
+                cliente.enviar(*gerar(rng, n_estudantes))
+            except Exception:
+                pass
+        pronto.wait()
+
+        locais = []
+        codigos: Counter[str] = Counter()
+        while time.perf_counter() < janela["fim"]:
+            metodo, caminho, corpo = gerar(rng, n_estudantes)
+            inicio = time.perf_counter()
+            try:
+                codigo = str(cliente.enviar(metodo, caminho, corpo))
+            except Exception as e:
+                codigo = type(e).__name__
+            locais.append(time.perf_counter() - inicio)
+            codigos[codigo] += 1
+        with lock:
+            latencias.extend(locais)
+            status.update(codigos)
+
+    threads = [threading.Thread(target=trabalhador, args=(i,)) for i in range(concorrencia)]
+    for t in threads:
+        t.start()
+    pronto.wait()
+    for t in threads:
+        t.join()
+    decorrido = time.perf_counter() - janela["inicio"]
+
+    amostras = np.array(latencias) * 1e3 if latencias else np.array([np.nan])
+    p50, p95, p99 = np.percentile(amostras, [50, 95, 99])
+    erros = sum(n for codigo, n in status.items() if not codigo.isdigit() or int(codigo) >= 500)
+    return {
+        "requisicoes": len(latencias),
+        "rps": len(latencias) / decorrido,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "erros": erros,
+        "status": dict(sorted(status.items())),
+    }
+
+
+def _servir(db_path: str, fila) -> None:
+    """Ponto de entrada do processo servidor (modo ``servidor``)."""
+
+    import logging
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+
+    # O log de acesso por requisição do werkzeug distorceria a medição.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = create_app(db_path)
+    servidor = make_server("127.0.0.1", 0, app, threaded=True)
+    fila.put(servidor.port)
+    servidor.serve_forever()
+
+
+def iniciar_servidor(db_path: Path) -> tuple[multiprocessing.Process, int]:
+    """Sobe a aplicação em um processo próprio e retorna (processo, porta)."""
+
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_servir, args=(str(db_path), fila), daemon=True)
+    processo.start()
+    return processo, fila.get(timeout=60)
+
+
+def _commit_atual() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(anterior: dict, atual: dict) -> None:
+    """Imprime a variação de rps e p95 para as combinações presentes nos dois JSONs."""
+
+    def chave(r: dict) -> tuple:
+        return (r["modo"], r["estudantes"], r["concorrencia"], r["rota"])
+
+    base = {chave(r): r for r in anterior["resultados"]}
+    print(f"\nComparação com {anterior['meta'].get('commit') or 'resultado anterior'}:")
+    print(f"{'modo':<9} {'estud.':>7} {'conc.':>5} {'rota':<10} {'Δ req/s':>9} {'Δ p95':>9}")
+    for r in atual["resultados"]:
+        antes = base.get(chave(r))
+        if antes is None:
+            continue
+        delta_rps = (r["rps"] / antes["rps"] - 1) * 100 if antes["rps"] else float("nan")
+        delta_p95 = (r["p95_ms"] / antes["p95_ms"] - 1) * 100 if antes["p95_ms"] else float("nan")
+        print(
+            f"{r['modo']:<9} {r['estudantes']:>7} {r['concorrencia']:>5} {r['rota']:<10} "
+            f"{delta_rps:>+8.1f}% {delta_p95:>+8.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--estudantes", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--modos", nargs="+", choices=["cliente", "servidor"], default=["cliente", "servidor"])
+    parser.add_argument("--rotas", nargs="+", choices=list(ROTAS), default=list(ROTAS))
+    parser.add_argument("--duracao", type=float, default=3.0, help="segundos por combinação")
+    parser.add_argument("--aquecimento", type=int, default=5, help="requisições por cliente antes de medir")
+    parser.add_argument("--semanas", type=int, default=8, help="máximo de registros por estudante")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="servidor já em execução (modo servidor, sem gerar banco)")
+    parser.add_argument("--saida", type=Path, help="arquivo JSON de saída")
+    parser.add_argument("--comparar", type=Path, help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    if args.url and len(args.estudantes) != 1:
+        parser.error("com --url informe um único --estudantes (o tamanho do banco do servidor)")
+    modos = ["servidor"] if args.url else args.modos
+
+    commit = _commit_atual()
+    relatorio = {
+        "meta": {
+            "commit": commit,
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "parametros": {
+                **{k: v for k, v in vars(args).items() if k not in ("saida", "comparar")},
+                "modos": modos,
+            },
+        },
+        "resultados": [],
+    }
+
+    print(f"{'modo':<9} {'estud.':>7} {'conc.':>5} {'rota':<10} {'req/s':>9} "
+          f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'erros':>6}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_estudantes in args.estudantes:
+            db_path = None
+            if not args.url:
+                db_path = gerar_banco(
+                    Path(tmp) / f"http_{n_estudantes}.db",
+                    n_estudantes,
+                    semanas=args.semanas,
+                    seed=args.seed,
+                )
+
+            for modo in modos:
+                processo = None
+                if modo == "cliente":
+                    from app import create_app
+
+                    app = create_app(db_path)
+                    criar_cliente = lambda app=app: ClienteTeste(app)  # noqa: E731
+                else:
+                    if args.url:
+                        partes = urlsplit(args.url)
+                        host, porta = partes.hostname, partes.port or 80
+                    else:
+                        processo, porta = iniciar_servidor(db_path)
+                        host = "127.0.0.1"
+                    criar_cliente = lambda h=host, p=porta: ClienteHTTP(h, p)  # noqa: E731
+
+                try:
+                    for concorrencia in args.concorrencia:
+                        for rota in args.rotas:
+                            r = executar_carga(
+                                criar_cliente,
+                                rota,
+                                n_estudantes,
+                                concorrencia,
+                                args.duracao,
+                                args.aquecimento,
+                                args.seed,
+                            )
+                            print(
+                                f"{modo:<9} {n_estudantes:>7} {concorrencia:>5} {rota:<10} "
+                                f"{r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+                                f"{r['p99_ms']:>9.2f} {r['erros']:>6}"
+                            )
+                            relatorio["resultados"].append({
+                                "modo": modo,
+                                "estudantes": n_estudantes,
+                                "concorrencia": concorrencia,
+                                "rota": rota,
+                                **r,
+                            })
+                finally:
+                    if processo is not None:
+                        processo.terminate()
+                        processo.join()
+
+    sufixo = commit or f"{datetime.now():%Y%m%d%H%M%S}"
+    saida = args.saida or RESULTADOS_DIR / f"http_{sufixo}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n✅ Resultados salvos em {saida}")
+
+    if args.comparar:
+        comparar(json.loads(args.comparar.read_text(encoding="utf-8")), relatorio)
+
+
+if __name__ == "__main__":
+    main()
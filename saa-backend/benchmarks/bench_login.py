@@ -0,0 +1,140 @@
+"""Benchmark de vazão do login para cada tipo de hash de senha.
+
+Cria estudantes com hashes bcrypt (custo atual), werkzeug e o marcador legado
+``hash_padrao``, faz uma rodada de logins concorrentes pelo Flask test client
+e, depois que os rehashes em segundo plano terminam, uma segunda rodada, em
+que todos os hashes já devem estar no esquema atual.
+
+Uso:
+    python -m benchmarks.bench_login --por-tipo 40 --clientes 8 --rounds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from werkzeug.security import generate_password_hash
+
+import api.senhas as senhas
+from app import create_app
+
+from .dados import criar_banco, matricula_sintetica
+
+SENHA = "senha123"
+
+
+def preparar_hashes(db_path: Path, por_tipo: int) -> dict[str, list[str]]:
+    """Atribui um tipo de hash a cada faixa de estudantes; retorna matrículas por tipo."""
+
+    tipos = {
+        "bcrypt": lambda: senhas.hash_password(SENHA),
+        "werkzeug": lambda: generate_password_hash(SENHA),
+        "legado": lambda: senhas.HASH_LEGADO,
+    }
+    matriculas = {}
+    conn = sqlite3.connect(db_path)
+    for indice, (tipo, gerar) in enumerate(tipos.items()):
+        ids = range(indice * por_tipo + 1, (indice + 1) * por_tipo + 1)
+        conn.executemany(
+            "UPDATE estudantes SET senha_hash = ? WHERE id = ?", ((gerar(), i) for i in ids)
+        )
+        matriculas[tipo] = [matricula_sintetica(i) for i in ids]
+    conn.commit()
+    conn.close()
+    return matriculas
+
+
+def rodada(app, matriculas: list[str], clientes: int) -> dict:
+    """Faz um login por matrícula, com ``clientes`` threads em paralelo."""
+
+    fila = list(matriculas)
+    lock = threading.Lock()
+    latencias: list[float] = []
+    status: dict[int, int] = {}
+
+    def cliente():
+        http = app.test_client()
+        while True:
+            with lock:
+                if not fila:
+                    return
+                matricula = fila.pop()
+            inicio = time.perf_counter()
+            resposta = http.post(
+                "/api/estudantes/login", json={"matricula": matricula, "senha": SENHA}
+            )
+            decorrido = time.perf_counter() - inicio
+            with lock:
+                latencias.append(decorrido)
+                status[resposta.status_code] = status.get(resposta.status_code, 0) + 1
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=cliente) for _ in range(clientes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - inicio
+
+    amostras = np.array(latencias) * 1e3
+    return {
+        "logins_s": len(latencias) / duracao,
+        "p50_ms": float(np.percentile(amostras, 50)),
+        "p99_ms": float(np.percentile(amostras, 99)),
+        "status": status,
+    }
+
+
+def contar_atualizados(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    hashes = [row[0] for row in conn.execute("SELECT senha_hash FROM estudantes")]
+    conn.close()
+    return sum(not senhas.precisa_rehash(h) for h in hashes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--por-tipo", type=int, default=40, help="estudantes por tipo de hash")
+    parser.add_argument("--clientes", type=int, default=8, help="logins simultâneos")
+    parser.add_argument("--rounds", type=int, default=senhas.BCRYPT_ROUNDS, help="custo do bcrypt")
+    args = parser.parse_args()
+
+    senhas.BCRYPT_ROUNDS = args.rounds
+    # Banco sintético: o marcador legado entra na medição.
+    senhas.ACEITAR_SENHA_LEGADA = True
+    print(
+        f"bcrypt rounds={args.rounds}, workers={senhas.LOGIN_WORKERS}, "
+        f"max pendentes={senhas.LOGIN_MAX_PENDENTES} (rehash {senhas.REHASH_MAX_PENDENTES}), "
+        f"{args.clientes} clientes\n"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = criar_banco(Path(tmp) / "login.db", args.por_tipo * 3, registros_por_estudante=1)
+        matriculas = preparar_hashes(db_path, args.por_tipo)
+        app = create_app(db_path)
+
+        print(f"{'rodada':<8} {'hash':<9} {'logins/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}  status")
+        for nome_rodada in ("1ª", "2ª"):
+            for tipo, lista in matriculas.items():
+                r = rodada(app, lista, args.clientes)
+                print(
+                    f"{nome_rodada:<8} {tipo:<9} {r['logins_s']:>9.1f} {r['p50_ms']:>9.1f} "
+                    f"{r['p99_ms']:>9.1f}  {r['status']}"
+                )
+            # Espera os rehashes agendados na primeira rodada.
+            senhas.get_executor().shutdown(wait=True)
+            senhas._executor = None
+            print(
+                f"{'':<8} hashes no esquema atual: "
+                f"{contar_atualizados(db_path)}/{args.por_tipo * 3}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark do resumo de riscos (``/api/relatorios/resumo``).
+
+Compara a implementação antiga, que fazia uma consulta por estudante, com
+``calcular_resumo`` (um GROUP BY sobre ``estado_atual_estudantes``) e confere
+que as contagens são idênticas. Também mede a reconstrução completa do estado
+atual, que lê o último registro de cada estudante e pontua tudo vetorizado.
+
+Uso:
+    python -m benchmarks.bench_resumo --tamanhos 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from api.reports import calcular_resumo
+from database.estado_atual import reconstruir_estado_atual
+from models.regression import calcular_impacto, calcular_risco
+
+from .dados import criar_banco
+
+
+def resumo_legado(conn: sqlite3.Connection) -> dict:
+    """Reprodução fiel do laço por estudante usado antes de ``calcular_resumo``."""
+
+    cursor = conn.cursor()
+    total = cursor.execute("SELECT COUNT(*) FROM estudantes").fetchone()[0]
+    cursor.execute("""
+        SELECT e.id, MAX(d.data_registro) as ultima_data
+        FROM estudantes e
+        LEFT JOIN dados_academicos d ON e.id = d.estudante_id
+        GROUP BY e.id
+    """)
+    riscos = {"ALTO": 0, "MÉDIO": 0, "BAIXO": 0}
+    for estudante_id, ultima_data in cursor.fetchall():
+        dados = conn.execute("""
+            SELECT horas_estudo, participacao_projetos, disciplinas_praticas
+            FROM dados_academicos
+            WHERE estudante_id = ? AND data_registro = ?
+            LIMIT 1
+        """, (estudante_id, ultima_data)).fetchone()
+        if dados:
+            impacto = calcular_impacto(dados[0] or 0, dados[1] or 0, dados[2] or 0)
+            riscos[calcular_risco(impacto)] += 1
+    return {
+        "total_estudantes": total,
+        "risco_alto": riscos["ALTO"],
+        "risco_medio": riscos["MÉDIO"],
+        "risco_baixo": riscos["BAIXO"],
+    }
+
+
+def medir(funcao, conn: sqlite3.Connection, repeticoes: int) -> tuple[float, object]:
+    """Retorna o melhor tempo (s) entre as repetições e o último resultado."""
+
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(conn)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--registros", type=int, default=3, help="registros por estudante")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument(
+        "--limite-legado",
+        type=int,
+        default=20_000,
+        help="não executa a versão antiga acima deste número de estudantes",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'estudantes':>10} {'reconstr. (ms)':>15} {'µs/estud.':>10} "
+        f"{'resumo (ms)':>12} {'legado (ms)':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.tamanhos:
+            db_path = criar_banco(Path(tmp) / f"bench_{n}.db", n, args.registros)
+            conn = sqlite3.connect(db_path)
+
+            t_reconstr, _ = medir(reconstruir_estado_atual, conn, 1)
+            t_novo, novo = medir(calcular_resumo, conn, args.repeticoes)
+            linha = (
+                f"{n:>10} {t_reconstr * 1e3:>15.1f} {t_reconstr / n * 1e6:>10.2f} "
+                f"{t_novo * 1e3:>12.2f}"
+            )
+
+            if n <= args.limite_legado:
+                t_legado, legado = medir(resumo_legado, conn, 1)
+                if legado != novo:
+                    raise SystemExit(f"Divergência para {n} estudantes: {legado} != {novo}")
+                linha += f" {t_legado * 1e3:>12.1f}"
+            else:
+                linha += f" {'-':>12}"
+
+            print(linha)
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Geração de bancos temporários para os benchmarks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from database.sintetico import gerar_banco, matricula_sintetica
+
+__all__ = ["criar_banco", "matricula_sintetica"]
+
+# Hash fixo e barato para os benchmarks que não medem login.
+HASH_BENCHMARK = "hash_padrao"
+
+
+def criar_banco(
+    db_path: Path,
+    n_estudantes: int,
+    registros_por_estudante: int = 3,
+    seed: int = 42,
+) -> Path:
+    """Cria uma coorte sintética com exatamente ``registros_por_estudante`` registros cada.
+
+    Os registros de um estudante ficam em semanas distintas, de modo que o
+    "último registro" seja inequívoco.
+    """
+
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+    return gerar_banco(
+        db_path,
+        n_estudantes,
+        semanas=registros_por_estudante,
+        seed=seed,
+        historico_minimo=registros_por_estudante,
+        senha_hash=HASH_BENCHMARK,
+    )
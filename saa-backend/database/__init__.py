@@ -1,6 +1,12 @@
 """Pacote utilitário para acesso ao banco SQLite."""
 
-from .db import get_connection
-
-__all__ = ["get_connection"]
+from .db import ConnectionPool, PoolExhaustedError, get_connection, get_db, get_pool, init_app
 
+__all__ = [
+    "ConnectionPool",
+    "PoolExhaustedError",
+    "get_connection",
+    "get_db",
+    "get_pool",
+    "init_app",
+]
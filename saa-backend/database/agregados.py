@@ -0,0 +1,62 @@
+"""Agregados da turma mantidos incrementalmente (tabela ``agregados_turma``).
+
+Os triggers criados pela migração 0002 atualizam contagem, soma e soma dos
+quadrados de cada métrica a cada INSERT/UPDATE/DELETE em
+``dados_academicos``. Ler a média passa a ser uma busca por chave primária.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+
+METRICAS = (
+    "horas_estudo",
+    "participacao_projetos",
+    "disciplinas_praticas",
+    "impacto_percebido",
+)
+
+SQL_RECONSTRUIR = "\nUNION ALL\n".join(
+    f"SELECT '{m}', COUNT({m}), COALESCE(SUM({m}), 0), COALESCE(SUM({m} * {m}), 0) "
+    "FROM dados_academicos"
+    for m in METRICAS
+)
+
+
+def reconstruir_agregados(conn: sqlite3.Connection) -> None:
+    """Recalcula ``agregados_turma`` do zero em uma única transação."""
+
+    with conn:
+        conn.execute("DELETE FROM agregados_turma")
+        conn.execute(
+            "INSERT INTO agregados_turma (metrica, contagem, soma, soma_quadrados) "
+            + SQL_RECONSTRUIR
+        )
+
+
+def media_turma(conn: sqlite3.Connection, metrica: str) -> float | None:
+    """Média da métrica em todo o histórico, ou ``None`` se não houver dados."""
+
+    row = conn.execute(
+        "SELECT contagem, soma FROM agregados_turma WHERE metrica = ?", (metrica,)
+    ).fetchone()
+    if not row or not row[0]:
+        return None
+    return row[1] / row[0]
+
+
+def estatisticas_turma(conn: sqlite3.Connection) -> dict[str, dict]:
+    """Contagem, média e desvio padrão (populacional) de cada métrica."""
+
+    estatisticas = {}
+    for metrica, contagem, soma, soma_quadrados in conn.execute(
+        "SELECT metrica, contagem, soma, soma_quadrados FROM agregados_turma"
+    ):
+        media = soma / contagem if contagem else None
+        desvio = None
+        if contagem:
+            # max() absorve resíduos negativos de arredondamento.
+            desvio = math.sqrt(max(soma_quadrados / contagem - media * media, 0.0))
+        estatisticas[metrica] = {"contagem": contagem, "media": media, "desvio_padrao": desvio}
+    return estatisticas
@@ -0,0 +1,225 @@
+"""Motor de alertas: regras sobre o risco previsto, avaliadas a cada escrita.
+
+Cada :class:`Regra` dispara para os níveis de risco de
+:func:`models.regression.calcular_risco` que lista (e, opcionalmente, só
+abaixo de um impacto máximo). A entrada é o estado atual do estudante
+(``estado_atual_estudantes``), a mesma linha que o dashboard mostra.
+
+- Na escrita, ``atualizar_dados`` chama :func:`avaliar_alertas` na mesma
+  transação de :func:`~database.estado_atual.atualizar_estado_atual`.
+- Em lote, :func:`varrer_alertas` percorre a coorte inteira por faixas de
+  ``id``, com as regras avaliadas de forma vetorizada sobre cada faixa. Use
+  após cargas, ``reconstruir_estado_atual.py`` ou mudança de regras
+  (``avaliar_alertas.py``).
+
+Um alerta só é criado se o estudante não tiver outro do mesmo tipo ainda não
+lido; um alerta lido não impede um novo. Os abertos são lidos do índice
+parcial ``idx_alertas_nao_lidos`` (migração 0006).
+
+As regras padrão são :data:`REGRAS_PADRAO`. ``SAA_ALERTAS_REGRAS`` aponta
+para um JSON com outra lista, no formato::
+
+    [{"tipo": "RISCO_ALTO", "riscos": ["ALTO"],
+      "mensagem": "Impacto previsto: {impacto:.2f}", "impacto_maximo": null}]
+
+A mensagem aceita ``{impacto}`` e ``{risco}``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable, NamedTuple, Sequence
+
+import numpy as np
+
+from models.regression import NIVEIS_RISCO
+
+from .estado_atual import SQL_FAIXA_IDS
+
+REGRAS_PATH = os.environ.get("SAA_ALERTAS_REGRAS")
+
+
+class Regra(NamedTuple):
+    tipo: str
+    riscos: tuple[str, ...]
+    mensagem: str
+    impacto_maximo: float | None = None
+
+    def dispara(self, impacto: float, risco: str) -> bool:
+        return risco in self.riscos and (
+            self.impacto_maximo is None or impacto < self.impacto_maximo
+        )
+
+    def dispara_lote(self, impactos: np.ndarray, riscos: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de :meth:`dispara` (máscara booleana)."""
+
+        mascara = np.isin(riscos, self.riscos)
+        if self.impacto_maximo is not None:
+            mascara &= impactos < self.impacto_maximo
+        return mascara
+
+    def formatar(self, impacto: float, risco: str) -> str:
+        return self.mensagem.format(impacto=impacto, risco=risco)
+
+
+REGRAS_PADRAO = (
+    Regra("RISCO_ALTO", ("ALTO",), "⚠️ Estudante em risco ALTO! Impacto previsto: {impacto:.2f}"),
+)
+
+
+def carregar_regras(caminho: Path) -> tuple[Regra, ...]:
+    """Lê uma lista de regras em JSON; valida tipos e níveis de risco."""
+
+    regras = []
+    for item in json.loads(Path(caminho).read_text(encoding="utf-8")):
+        riscos = tuple(item["riscos"])
+        desconhecidos = set(riscos) - set(NIVEIS_RISCO)
+        if desconhecidos:
+            raise ValueError(f"regra {item['tipo']!r}: níveis de risco inválidos {desconhecidos}")
+        maximo = item.get("impacto_maximo")
+        regras.append(
+            Regra(
+                str(item["tipo"]),
+                riscos,
+                str(item["mensagem"]),
+                None if maximo is None else float(maximo),
+            )
+        )
+    tipos = [regra.tipo for regra in regras]
+    if len(set(tipos)) != len(tipos):
+        raise ValueError("tipos de regra repetidos")
+    return tuple(regras)
+
+
+_regras: tuple[Regra, ...] | None = None
+
+
+def regras_atuais() -> tuple[Regra, ...]:
+    """Regras em uso pelo processo: as de ``SAA_ALERTAS_REGRAS`` ou as padrão."""
+
+    global _regras
+    if _regras is None:
+        _regras = carregar_regras(Path(REGRAS_PATH)) if REGRAS_PATH else REGRAS_PADRAO
+    return _regras
+
+
+def configurar_regras(regras: Iterable[Regra]) -> tuple[Regra, ...]:
+    """Troca as regras do processo (ex.: regras próprias de uma instalação)."""
+
+    global _regras
+    _regras = tuple(regras)
+    return _regras
+
+
+SQL_ABERTOS_ESTUDANTE = "SELECT tipo FROM alertas WHERE estudante_id = ? AND lido = 0"
+
+SQL_ABERTOS_FAIXA = """
+    SELECT estudante_id, tipo FROM alertas
+    WHERE estudante_id > ? AND estudante_id <= ? AND lido = 0
+"""
+
+SQL_ESTADOS_FAIXA = """
+    SELECT estudante_id, impacto_previsto, risco FROM estado_atual_estudantes
+    WHERE estudante_id > ? AND estudante_id <= ?
+"""
+
+SQL_INSERIR = "INSERT INTO alertas (estudante_id, tipo, mensagem, lido) VALUES (?, ?, ?, 0)"
+
+
+def novos_alertas(
+    ids: Sequence[int],
+    impactos: np.ndarray,
+    riscos: np.ndarray,
+    abertos: set[tuple[int, str]] = frozenset(),
+    regras: Sequence[Regra] | None = None,
+) -> list[tuple[int, str, str]]:
+    """Linhas ``(estudante_id, tipo, mensagem)`` a inserir para um lote.
+
+    ``abertos`` tem os pares ``(estudante_id, tipo)`` com alerta não lido,
+    que não são repetidos.
+    """
+
+    ids = np.asarray(ids)
+    impactos = np.asarray(impactos, dtype=np.float64)
+    riscos = np.asarray(riscos, dtype=object)
+    linhas = []
+    for regra in regras if regras is not None else regras_atuais():
+        for i in np.flatnonzero(regra.dispara_lote(impactos, riscos)).tolist():
+            estudante_id = int(ids[i])
+            if (estudante_id, regra.tipo) not in abertos:
+                linhas.append(
+                    (estudante_id, regra.tipo, regra.formatar(float(impactos[i]), riscos[i]))
+                )
+    return linhas
+
+
+def gravar_alertas(conn: sqlite3.Connection, linhas: Sequence[tuple[int, str, str]]) -> int:
+    """Insere as linhas de :func:`novos_alertas`. Não faz commit."""
+
+    conn.executemany(SQL_INSERIR, linhas)
+    return len(linhas)
+
+
+def avaliar_alertas(conn: sqlite3.Connection, estudante_id: int) -> list[str]:
+    """Avalia as regras para um estudante e cria os alertas que faltam.
+
+    Lê o estado atual já gravado, portanto deve rodar depois de
+    ``atualizar_estado_atual``. Não faz commit: roda na transação do
+    chamador. Retorna os tipos dos alertas criados.
+    """
+
+    estado = conn.execute(
+        "SELECT impacto_previsto, risco FROM estado_atual_estudantes WHERE estudante_id = ?",
+        (estudante_id,),
+    ).fetchone()
+    if estado is None:
+        return []
+    impacto, risco = estado[0], estado[1]
+
+    disparadas = [regra for regra in regras_atuais() if regra.dispara(impacto, risco)]
+    if not disparadas:
+        return []
+    abertos = {linha[0] for linha in conn.execute(SQL_ABERTOS_ESTUDANTE, (estudante_id,))}
+    criados = []
+    for regra in disparadas:
+        if regra.tipo not in abertos:
+            conn.execute(SQL_INSERIR, (estudante_id, regra.tipo, regra.formatar(impacto, risco)))
+            criados.append(regra.tipo)
+    return criados
+
+
+def varrer_alertas(
+    conn: sqlite3.Connection,
+    tamanho_lote: int = 50_000,
+    regras: Sequence[Regra] | None = None,
+) -> int:
+    """Avalia as regras para todos os estudantes, um commit por faixa de ``id``.
+
+    Retorna o número de alertas criados.
+    """
+
+    regras = regras if regras is not None else regras_atuais()
+    criados = 0
+    ultimo_id = 0
+    while True:
+        limite = conn.execute(SQL_FAIXA_IDS, (ultimo_id, tamanho_lote)).fetchone()[0]
+        if limite is None:
+            break
+        estados = conn.execute(SQL_ESTADOS_FAIXA, (ultimo_id, limite)).fetchall()
+        if estados:
+            ids, impactos, riscos = zip(*estados)
+            with conn:
+                # Reserva a escrita antes de ler os abertos: nenhum outro
+                # escritor cria o mesmo alerta entre a leitura e o INSERT.
+                conn.execute("BEGIN IMMEDIATE")
+                abertos = {
+                    (linha[0], linha[1])
+                    for linha in conn.execute(SQL_ABERTOS_FAIXA, (ultimo_id, limite))
+                }
+                linhas = novos_alertas(ids, impactos, riscos, abertos, regras)
+                criados += gravar_alertas(conn, linhas)
+        ultimo_id = limite
+    return criados
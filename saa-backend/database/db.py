@@ -1,24 +1,211 @@
-"""Funções auxiliares para conexão com SQLite."""
+"""Funções auxiliares para conexão com SQLite.
+
+Todas as conexões são :class:`~database.medicao.ConexaoMedida` (consultas
+cronometradas para as métricas) e passam por :func:`configurar_conexao`, que
+liga o modo WAL (leitores não bloqueiam o escritor e vice-versa), um
+``busy_timeout`` para esperar locks em vez de falhar imediatamente e caches
+maiores que os padrões.
+
+As rotas Flask usam :func:`get_db`, que empresta uma conexão de um pool
+limitado (:class:`ConnectionPool`) e a devolve ao fim da requisição. Scripts
+de linha de comando continuam usando :func:`get_connection`.
+
+Parâmetros ajustáveis por variável de ambiente:
+
+- ``SAA_DB_PATH``: caminho do banco (padrão ``data/saa.db``)
+- ``SAA_DB_POOL_SIZE``: máximo de conexões abertas por banco (padrão 8)
+- ``SAA_DB_POOL_TIMEOUT``: segundos de espera por uma conexão livre (padrão 10)
+- ``SAA_DB_BUSY_TIMEOUT_MS``: espera por locks do SQLite (padrão 5000)
+- ``SAA_DB_CACHE_KIB``: tamanho do cache de páginas por conexão (padrão 16384)
+- ``SAA_DB_MMAP_BYTES``: tamanho do mapeamento em memória (padrão 256 MiB)
+
+Com ``SAA_SQL_DIAGNOSTICO=1``, toda conexão criada aqui é instrumentada por
+:mod:`database.diagnostico` (consultas lentas e N+1).
+"""
 
 from __future__ import annotations
 
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator
 
+from flask import Flask, current_app, g
+
+from . import diagnostico
+from .medicao import ConexaoMedida
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-DEFAULT_DB_PATH = BASE_DIR / "data" / "saa.db"
+DEFAULT_DB_PATH = Path(os.environ.get("SAA_DB_PATH", BASE_DIR / "data" / "saa.db"))
+
+POOL_SIZE = int(os.environ.get("SAA_DB_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.environ.get("SAA_DB_POOL_TIMEOUT", "10"))
+BUSY_TIMEOUT_MS = int(os.environ.get("SAA_DB_BUSY_TIMEOUT_MS", "5000"))
+CACHE_SIZE_KIB = int(os.environ.get("SAA_DB_CACHE_KIB", "16384"))
+MMAP_SIZE_BYTES = int(os.environ.get("SAA_DB_MMAP_BYTES", str(256 * 1024 * 1024)))
+
+
+class PoolExhaustedError(RuntimeError):
+    """Nenhuma conexão ficou livre dentro do tempo de espera do pool."""
+
+
+def configurar_conexao(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Aplica os PRAGMAs de desempenho usados por todo o backend."""
+
+    conn.execute("PRAGMA journal_mode = WAL")
+    # Com WAL, NORMAL só perde as últimas transações em queda de energia,
+    # nunca corrompe o banco.
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS:d}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB:d}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES:d}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
 
 
 def get_connection(db_path: Path | None = None) -> sqlite3.Connection:
     """Retorna uma conexão com o banco de dados."""
 
-    target = db_path or DEFAULT_DB_PATH
+    target = Path(db_path or DEFAULT_DB_PATH)
     target.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(target)
+    conn = sqlite3.connect(
+        target,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        factory=ConexaoMedida,
+    )
     conn.row_factory = sqlite3.Row
-    return conn
+    if diagnostico.HABILITADO:
+        diagnostico.instrumentar(conn)
+    return configurar_conexao(conn)
+
+
+class ConnectionPool:
+    """Pool limitado de conexões SQLite para um mesmo arquivo.
+
+    As conexões são criadas sob demanda até ``tamanho`` e reaproveitadas
+    depois. Quando todas estão emprestadas, :meth:`acquire` espera até
+    ``timeout`` segundos antes de levantar :class:`PoolExhaustedError`.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        tamanho: int = POOL_SIZE,
+        timeout: float = POOL_TIMEOUT,
+    ) -> None:
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self._livres: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._criadas = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Empresta uma conexão, criando uma nova se ainda houver espaço."""
+
+        try:
+            return self._livres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            pode_criar = self._criadas < self.tamanho
+            if pode_criar:
+                self._criadas += 1
+        if pode_criar:
+            try:
+                return get_connection(self.db_path)
+            except Exception:
+                with self._lock:
+                    self._criadas -= 1
+                raise
+
+        try:
+            return self._livres.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolExhaustedError(
+                f"Nenhuma conexão livre em {self.timeout}s (pool de {self.tamanho})"
+            ) from None
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Devolve a conexão ao pool, descartando transações pendentes."""
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Conexão inutilizável: fecha e libera a vaga para uma nova.
+            conn.close()
+            with self._lock:
+                self._criadas -= 1
+            return
+        self._livres.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão durante o bloco ``with``."""
+
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        """Fecha as conexões ociosas (as emprestadas são fechadas ao voltar)."""
+
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._criadas -= 1
+
+
+_pools: dict[Path, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Path | None = None) -> ConnectionPool:
+    """Retorna o pool compartilhado do banco indicado (um por arquivo)."""
+
+    target = Path(db_path or DEFAULT_DB_PATH).resolve()
+    with _pools_lock:
+        pool = _pools.get(target)
+        if pool is None:
+            pool = _pools[target] = ConnectionPool(target)
+        return pool
+
+
+def get_db() -> sqlite3.Connection:
+    """Conexão da requisição atual, reaproveitada até o fim da requisição."""
+
+    if "db" not in g:
+        g.db_pool = get_pool(current_app.config.get("DATABASE"))
+        g.db = g.db_pool.acquire()
+    return g.db
+
+
+def close_db(_exc: BaseException | None = None) -> None:
+    """Devolve ao pool a conexão usada pela requisição, se houver."""
+
+    conn = g.pop("db", None)
+    pool = g.pop("db_pool", None)
+    if conn is not None and pool is not None:
+        pool.release(conn)
+
+
+def init_app(app: Flask) -> None:
+    """Registra a devolução automática das conexões ao fim de cada requisição."""
+
+    app.teardown_appcontext(close_db)
 
 
 def iter_rows(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
@@ -26,4 +213,3 @@ def iter_rows(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
 
     for row in cursor:
         yield row
-
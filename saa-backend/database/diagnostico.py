@@ -0,0 +1,224 @@
+"""Diagnóstico de consultas: log de consultas lentas e detector de N+1.
+
+Modo opcional (``SAA_SQL_DIAGNOSTICO=1``), para desenvolvimento e
+investigação. Com ele ligado, :func:`database.db.get_connection` chama
+:func:`instrumentar` em toda conexão nova (pool das rotas e scripts), que
+registra um ``set_trace_callback``: o SQLite informa cada instrução executada,
+já com os parâmetros substituídos. Cada instrução é reduzida à sua *forma*
+(literais trocados por ``?``, espaços normalizados) e contada na sessão da
+thread; o tempo vem de :mod:`database.medicao`.
+
+- Consulta lenta: acima de ``SAA_SQL_LENTA_MS`` milissegundos, vai para o
+  logger ``saa.sql`` com o ``EXPLAIN QUERY PLAN`` da instrução (com os
+  valores reais), em qualquer contexto: rotas ou scripts.
+- N+1: uma requisição que executa a mesma forma mais de
+  ``SAA_SQL_REPETICOES`` vezes é registrada como suspeita, com a rota e a
+  contagem.
+
+Em cada requisição, os cabeçalhos ``X-SQL-Consultas`` e ``X-SQL-Tempo-Ms``
+trazem o total da requisição, e ``GET /api/diagnostico/sql`` lista as
+últimas requisições (consultas por forma, tempo, suspeitas de N+1) e as
+últimas consultas lentas.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from .medicao import adicionar_observador
+
+HABILITADO = os.environ.get("SAA_SQL_DIAGNOSTICO", "0") == "1"
+LIMITE_LENTA_MS = float(os.environ.get("SAA_SQL_LENTA_MS", "50"))
+LIMITE_REPETICOES = int(os.environ.get("SAA_SQL_REPETICOES", "10"))
+MAX_REGISTROS = 100
+
+logger = logging.getLogger("saa.sql")
+
+# Literais de texto, blobs e números; listas de "?" viram uma só.
+_LITERAIS = re.compile(r"[xX]'[0-9a-fA-F]*'|'(?:[^']|'')*'|(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACOS = re.compile(r"\s+")
+
+
+# O texto vem do código (com "?"), então se repete: a forma é calculada uma vez.
+@lru_cache(maxsize=1024)
+def forma_consulta(sql: str) -> str:
+    """Texto da instrução sem os valores: consultas que só mudam de parâmetro se igualam."""
+
+    forma = _LITERAIS.sub("?", sql)
+    forma = _LISTA.sub("(?, ...)", forma)
+    return _ESPACOS.sub(" ", forma).strip()
+
+
+class Sessao:
+    """Consultas de uma requisição (ou trecho de script), por forma."""
+
+    def __init__(self, nome: str) -> None:
+        self.nome = nome
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.segundos = 0.0
+        self.por_forma: dict[str, list] = {}  # forma -> [execuções, segundos]
+
+    def suspeitas(self, limite: int = LIMITE_REPETICOES) -> dict[str, int]:
+        return {forma: n for forma, (n, _s) in self.por_forma.items() if n > limite}
+
+    def resumo(self) -> dict:
+        formas = sorted(self.por_forma.items(), key=lambda item: -item[1][0])
+        return {
+            "nome": self.nome,
+            "duracao_ms": round((time.perf_counter() - self.inicio) * 1000, 3),
+            "consultas": self.consultas,
+            "tempo_sql_ms": round(self.segundos * 1000, 3),
+            "formas": [
+                {"sql": forma, "execucoes": n, "tempo_ms": round(s * 1000, 3)}
+                for forma, (n, s) in formas
+            ],
+            "n_mais_1": self.suspeitas(),
+        }
+
+
+_local = threading.local()
+_recentes: deque[dict] = deque(maxlen=MAX_REGISTROS)
+_lentas: deque[dict] = deque(maxlen=MAX_REGISTROS)
+
+
+def _ao_executar(sql: str) -> None:
+    """Trace callback: guarda a última instrução, já com os valores."""
+
+    # Instruções de triggers chegam como "-- TRIGGER ...": fazem parte da
+    # instrução que as disparou.
+    if not sql.startswith("--"):
+        _local.ultima = sql
+
+
+def _ao_medir(sql: str, segundos: float, conexao: sqlite3.Connection) -> None:
+    # Conta por chamada a execute*: um executemany é uma execução, não N.
+    if getattr(_local, "explicando", False):
+        return
+    sessao = getattr(_local, "sessao", None)
+    if sessao is not None:
+        sessao.consultas += 1
+        sessao.segundos += segundos
+        contagem = sessao.por_forma.setdefault(forma_consulta(sql), [0, 0.0])
+        contagem[0] += 1
+        contagem[1] += segundos
+    if segundos * 1000 >= LIMITE_LENTA_MS:
+        expandida = getattr(_local, "ultima", None)
+        _local.ultima = None
+        _registrar_lenta(expandida or sql, segundos, conexao, sessao)
+
+
+def explicar(conexao: sqlite3.Connection, sql: str) -> list[str]:
+    """``EXPLAIN QUERY PLAN`` da instrução (já com valores), ou o erro."""
+
+    _local.explicando = True
+    try:
+        return [linha[3] for linha in conexao.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    except sqlite3.Error as e:
+        return [f"(sem plano: {e})"]
+    finally:
+        _local.explicando = False
+
+
+def _registrar_lenta(sql: str, segundos: float, conexao, sessao: Sessao | None) -> None:
+    plano = explicar(conexao, sql)
+    registro = {
+        "sql": sql,
+        "tempo_ms": round(segundos * 1000, 3),
+        "plano": plano,
+        "origem": sessao.nome if sessao is not None else None,
+    }
+    _lentas.append(registro)
+    logger.warning(
+        "Consulta lenta (%.1f ms) em %s: %s\n   %s",
+        segundos * 1000,
+        registro["origem"] or "(fora de requisição)",
+        _ESPACOS.sub(" ", sql).strip(),
+        "\n   ".join(plano),
+    )
+
+
+def instrumentar(conexao: sqlite3.Connection) -> sqlite3.Connection:
+    """Liga o rastreamento de instruções na conexão (chamado por get_connection)."""
+
+    adicionar_observador(_ao_medir)
+    conexao.set_trace_callback(_ao_executar)
+    return conexao
+
+
+def iniciar_sessao(nome: str) -> Sessao:
+    """Passa a contar as consultas desta thread em uma nova sessão."""
+
+    sessao = _local.sessao = Sessao(nome)
+    return sessao
+
+
+def encerrar_sessao(nome: str | None = None) -> Sessao | None:
+    """Fecha a sessão da thread, registra suspeitas de N+1 e a devolve."""
+
+    sessao = getattr(_local, "sessao", None)
+    _local.sessao = None
+    if sessao is None:
+        return None
+    if nome:
+        sessao.nome = nome
+    resumo = sessao.resumo()
+    _recentes.append(resumo)
+    for forma, execucoes in resumo["n_mais_1"].items():
+        logger.warning(
+            "Possível N+1 em %s: %d execuções de %s", sessao.nome, execucoes, forma
+        )
+    return sessao
+
+
+def init_diagnostico(app) -> None:
+    """Abre uma sessão por requisição e registra ``GET /api/diagnostico/sql``.
+
+    Não faz nada com o diagnóstico desligado.
+    """
+
+    if not HABILITADO:
+        return
+
+    from flask import jsonify, request
+
+    @app.route("/api/diagnostico/sql", methods=["GET"])
+    def diagnostico_sql():
+        return jsonify(registros_recentes())
+
+    @app.before_request
+    def iniciar_diagnostico():
+        iniciar_sessao(f"{request.method} {request.path}")
+
+    @app.after_request
+    def encerrar_diagnostico(resposta):
+        regra = request.url_rule.rule if request.url_rule is not None else request.path
+        sessao = encerrar_sessao(f"{request.method} {regra}")
+        if sessao is not None:
+            resposta.headers["X-SQL-Consultas"] = str(sessao.consultas)
+            resposta.headers["X-SQL-Tempo-Ms"] = f"{sessao.segundos * 1000:.3f}"
+        return resposta
+
+
+def registros_recentes() -> dict:
+    return {
+        "limite_lenta_ms": LIMITE_LENTA_MS,
+        "limite_repeticoes": LIMITE_REPETICOES,
+        "requisicoes": list(_recentes),
+        "lentas": list(_lentas),
+    }
+
+
+if HABILITADO and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("⚠️ [%(name)s] %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
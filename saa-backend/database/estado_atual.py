@@ -0,0 +1,328 @@
+"""Estado atual de cada estudante (tabela ``estado_atual_estudantes``).
+
+Guarda as métricas do último registro de ``dados_academicos`` junto com o
+impacto previsto, o nível de risco e o perfil já calculados, de modo que o
+dashboard leia uma linha por chave primária e os relatórios sejam um simples
+``GROUP BY``.
+
+A tabela é atualizada pelo caminho de escrita (``atualizar_dados`` chama
+:func:`atualizar_estado_atual` na mesma transação do INSERT). Triggers
+removem a linha quando o estudante ou o registro de origem é apagado; para
+outras alterações feitas fora da API, use ``reconstruir_estado_atual.py``.
+
+Impacto, risco e perfil dependem dos modelos. :func:`reconstruir_estado_atual`
+grava em ``estado_atual_modelos`` as versões dos coeficientes e dos
+centroides com que calculou a tabela, e a API chama
+:func:`sincronizar_com_modelos` a cada requisição: quando carrega uma versão
+diferente da gravada (novo treino, ou banco de antes da migração 0007), a
+tabela é reconstruída em segundo plano, sem bloquear a requisição. Enquanto
+isso, as rotas ainda leem os valores antigos; cada linha reescrita
+incrementa as versões usadas nos ETags. Com vários workers, o primeiro a
+perceber registra a reconstrução no banco e os demais esperam por ela.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from models.clustering import ARTEFATO_CENTROIDES, centroides_atuais, identificar_perfis_lote
+from models.regression import (
+    ARTEFATO_COEFICIENTES,
+    calcular_impacto_lote,
+    calcular_risco_lote,
+    coeficientes_atuais,
+)
+
+from .db import get_connection, get_pool
+
+# Versão de cada modelo usada na última reconstrução completa; a linha
+# 'reconstrucao' marca (com o horário, em segundos) uma reconstrução em curso.
+DDL_MODELOS = """
+CREATE TABLE IF NOT EXISTS estado_atual_modelos (
+    artefato TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL
+)
+"""
+
+DDL = f"""
+{DDL_MODELOS};
+
+CREATE TABLE IF NOT EXISTS estado_atual_estudantes (
+    estudante_id INTEGER PRIMARY KEY,
+    dados_id INTEGER NOT NULL,
+    horas_estudo REAL,
+    participacao_projetos INTEGER,
+    disciplinas_praticas INTEGER,
+    impacto_percebido REAL,
+    data_registro DATE,
+    impacto_previsto REAL NOT NULL,
+    risco TEXT NOT NULL,
+    perfil TEXT NOT NULL,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (estudante_id) REFERENCES estudantes (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_estado_atual_dados ON estado_atual_estudantes (dados_id);
+CREATE INDEX IF NOT EXISTS idx_estado_atual_risco ON estado_atual_estudantes (risco);
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_atual_estudante_delete
+AFTER DELETE ON estudantes
+BEGIN
+    DELETE FROM estado_atual_estudantes WHERE estudante_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_atual_dados_delete
+AFTER DELETE ON dados_academicos
+BEGIN
+    DELETE FROM estado_atual_estudantes WHERE dados_id = OLD.id;
+END;
+"""
+
+_COLUNAS_ORIGEM = """
+    d.estudante_id, d.id, d.horas_estudo, d.participacao_projetos,
+    d.disciplinas_praticas, d.impacto_percebido, d.data_registro
+"""
+
+SQL_ULTIMO_REGISTRO = f"""
+    SELECT {_COLUNAS_ORIGEM}
+    FROM dados_academicos d
+    WHERE d.estudante_id = ?
+    ORDER BY d.data_registro DESC, d.id DESC
+    LIMIT 1
+"""
+
+# Último registro de cada estudante de uma faixa de ids, em uma passada pelo
+# índice idx_dados_academicos_estudante_data.
+SQL_ULTIMOS_REGISTROS_FAIXA = f"""
+    SELECT estudante_id, id, horas_estudo, participacao_projetos,
+           disciplinas_praticas, impacto_percebido, data_registro
+    FROM (
+        SELECT {_COLUNAS_ORIGEM},
+               ROW_NUMBER() OVER (
+                   PARTITION BY d.estudante_id
+                   ORDER BY d.data_registro DESC, d.id DESC
+               ) AS ordem
+        FROM dados_academicos d
+        JOIN estudantes e ON e.id = d.estudante_id
+        WHERE d.estudante_id > ? AND d.estudante_id <= ?
+    )
+    WHERE ordem = 1
+"""
+
+SQL_FAIXA_IDS = """
+    SELECT MAX(id) FROM (
+        SELECT id FROM estudantes WHERE id > ? ORDER BY id LIMIT ?
+    )
+"""
+
+RECONSTRUCAO = "reconstrucao"
+# Uma reconstrução registrada há mais que isso é considerada abandonada.
+PRAZO_RECONSTRUCAO = 15 * 60
+
+SQL_GRAVAR = """
+    INSERT OR REPLACE INTO estado_atual_estudantes
+    (estudante_id, dados_id, horas_estudo, participacao_projetos, disciplinas_praticas,
+     impacto_percebido, data_registro, impacto_previsto, risco, perfil, atualizado_em)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+def gravar_estados(conn: sqlite3.Connection, registros: Sequence[tuple]) -> int:
+    """Calcula impacto, risco e perfil de uma vez e grava os registros.
+
+    Cada registro segue a ordem de colunas de ``SQL_ULTIMO_REGISTRO``:
+    ``(estudante_id, dados_id, horas, projetos, disciplinas, impacto_percebido,
+    data_registro)``. Não faz commit.
+    """
+
+    if not registros:
+        return 0
+
+    metricas = np.array(
+        [(r[2] or 0, r[3] or 0, r[4] or 0) for r in registros], dtype=np.float64
+    )
+    impactos = calcular_impacto_lote(metricas[:, 0], metricas[:, 1], metricas[:, 2])
+    riscos = calcular_risco_lote(impactos)
+    perfis = identificar_perfis_lote(metricas)
+
+    conn.executemany(
+        SQL_GRAVAR,
+        (
+            (*registro, impacto, risco, perfil)
+            for registro, impacto, risco, perfil in zip(
+                registros, impactos.tolist(), riscos, perfis
+            )
+        ),
+    )
+    return len(registros)
+
+
+def atualizar_estado_atual(conn: sqlite3.Connection, estudante_id: int) -> None:
+    """Recalcula o estado de um estudante. Não faz commit: roda na transação do chamador."""
+
+    registro = conn.execute(SQL_ULTIMO_REGISTRO, (estudante_id,)).fetchone()
+    if registro is None:
+        conn.execute(
+            "DELETE FROM estado_atual_estudantes WHERE estudante_id = ?", (estudante_id,)
+        )
+        return
+    gravar_estados(conn, [tuple(registro)])
+
+
+def versoes_modelos() -> dict[str, int]:
+    """Versões dos modelos em uso pelo processo, por artefato."""
+
+    return {
+        ARTEFATO_COEFICIENTES: coeficientes_atuais().versao,
+        ARTEFATO_CENTROIDES: int(centroides_atuais()[1]),
+    }
+
+
+def versoes_modelos_estado(conn: sqlite3.Connection) -> dict[str, int]:
+    """Versões gravadas em ``estado_atual_modelos`` (inclui ``reconstrucao``, se houver)."""
+
+    return {
+        linha[0]: linha[1]
+        for linha in conn.execute("SELECT artefato, versao FROM estado_atual_modelos")
+    }
+
+
+def reconstruir_estado_atual(conn: sqlite3.Connection, tamanho_lote: int = 50_000) -> int:
+    """Recalcula a tabela inteira em lotes por faixa de ``id``, um commit por lote.
+
+    Ao final, registra as versões dos modelos usadas. Retorna o número de
+    estudantes gravados.
+    """
+
+    versoes = versoes_modelos()
+    gravados = 0
+    ultimo_id = 0
+    while True:
+        limite = conn.execute(SQL_FAIXA_IDS, (ultimo_id, tamanho_lote)).fetchone()[0]
+        if limite is None:
+            break
+        registros = conn.execute(SQL_ULTIMOS_REGISTROS_FAIXA, (ultimo_id, limite)).fetchall()
+        with conn:
+            conn.execute(
+                "DELETE FROM estado_atual_estudantes WHERE estudante_id > ? AND estudante_id <= ?",
+                (ultimo_id, limite),
+            )
+            gravados += gravar_estados(conn, [tuple(r) for r in registros])
+        ultimo_id = limite
+
+    with conn:
+        conn.execute("DELETE FROM estado_atual_estudantes WHERE estudante_id > ?", (ultimo_id,))
+        # Se os modelos mudaram no meio, as versões do início ficam gravadas
+        # e a próxima sincronização reconstrói de novo.
+        registrar_versoes_modelos(conn, versoes)
+    return gravados
+
+
+def registrar_versoes_modelos(
+    conn: sqlite3.Connection, versoes: dict[str, int] | None = None
+) -> None:
+    """Grava as versões dos modelos com que o estado atual foi calculado. Não faz commit.
+
+    Sem ``versoes``, usa as do processo (:func:`versoes_modelos`).
+    """
+
+    # Criada aqui também: scripts rodam sobre bancos ainda sem a migração 0007.
+    conn.execute(DDL_MODELOS)
+    conn.execute("DELETE FROM estado_atual_modelos")
+    conn.executemany(
+        "INSERT INTO estado_atual_modelos (artefato, versao) VALUES (?, ?)",
+        (versoes or versoes_modelos()).items(),
+    )
+
+
+# Por valor de db_path: versões com que o estado já foi conferido.
+_sincronizadas: dict[object, dict[str, int]] = {}
+_em_andamento: set = set()
+_conferir_apos: dict[object, float] = {}
+_sincronizacao_lock = threading.Lock()
+
+
+def sincronizar_com_modelos(db_path: Path | str | None = None) -> bool:
+    """Agenda a reconstrução se o estado foi calculado com outras versões dos modelos.
+
+    Chamada a cada requisição: quando as versões em uso são as já conferidas,
+    custa uma comparação de dicionários. Retorna ``True`` se iniciou uma
+    reconstrução em segundo plano.
+    """
+
+    versoes = versoes_modelos()
+    if _sincronizadas.get(db_path) == versoes:
+        return False
+
+    with _sincronizacao_lock:
+        # Reconstrução em curso aqui, ou em outro worker (conferida de novo no
+        # máximo a cada segundo).
+        if db_path in _em_andamento or time.monotonic() < _conferir_apos.get(db_path, 0):
+            return False
+        try:
+            with get_pool(db_path).connection() as conn:
+                gravadas = versoes_modelos_estado(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️ Estado atual não conferido com os modelos: {e}")
+            _sincronizadas[db_path] = versoes
+            return False
+        em_curso = gravadas.pop(RECONSTRUCAO, None)
+        if gravadas == versoes:
+            _sincronizadas[db_path] = versoes
+            return False
+        if em_curso is not None and time.time() - em_curso < PRAZO_RECONSTRUCAO:
+            _conferir_apos[db_path] = time.monotonic() + 1
+            return False
+        _em_andamento.add(db_path)
+
+    threading.Thread(
+        target=_reconstruir_em_segundo_plano,
+        args=(db_path, versoes),
+        name="saa-estado-atual",
+        daemon=True,
+    ).start()
+    return True
+
+
+def _reconstruir_em_segundo_plano(db_path, versoes: dict[str, int]) -> None:
+    conn = get_connection(db_path)
+    try:
+        # Reserva a reconstrução no banco: um só worker a executa.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            gravadas = versoes_modelos_estado(conn)
+            em_curso = gravadas.pop(RECONSTRUCAO, None)
+            if gravadas == versoes or (
+                em_curso is not None and time.time() - em_curso < PRAZO_RECONSTRUCAO
+            ):
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO estado_atual_modelos (artefato, versao) VALUES (?, ?)",
+                (RECONSTRUCAO, int(time.time())),
+            )
+        inicio = time.perf_counter()
+        gravados = reconstruir_estado_atual(conn)
+        print(
+            f"✅ Estado atual recalculado com os modelos {versoes} "
+            f"({gravados} estudantes em {time.perf_counter() - inicio:.1f}s)"
+        )
+    except Exception as e:
+        print(f"⚠️ Falha ao recalcular o estado atual (rode reconstruir_estado_atual.py): {e}")
+        # Sem nova tentativa a cada requisição para um erro que tende a se repetir.
+        with _sincronizacao_lock:
+            _sincronizadas[db_path] = versoes
+        try:
+            with conn:
+                conn.execute("DELETE FROM estado_atual_modelos WHERE artefato = ?", (RECONSTRUCAO,))
+        except sqlite3.Error:
+            pass
+    finally:
+        conn.close()
+        with _sincronizacao_lock:
+            _em_andamento.discard(db_path)
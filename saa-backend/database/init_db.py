@@ -3,14 +3,12 @@
 from __future__ import annotations
 
 from datetime import date
-from pathlib import Path
 
 from werkzeug.security import generate_password_hash
 
 from .db import get_connection
-
-# Caminho do schema SQL
-SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+from .estado_atual import reconstruir_estado_atual
+from .migrate import aplicar_migracoes
 
 
 def init_database() -> None:
@@ -19,11 +17,10 @@ def init_database() -> None:
     conn = get_connection()
     cursor = conn.cursor()
 
-    # 1. Aplicar schema
+    # 1. Aplicar schema e migrações (para só atualizar um banco existente,
+    #    sem apagar os dados, use migrate_db.py)
     print("📋 Aplicando schema do banco de dados...")
-    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-        schema_sql = f.read()
-        cursor.executescript(schema_sql)
+    aplicar_migracoes(conn)
 
     # 2. Limpar dados existentes (para permitir re-execução)
     print("🧹 Limpando dados existentes...")
@@ -121,6 +118,7 @@ def init_database() -> None:
             )
 
     conn.commit()
+    reconstruir_estado_atual(conn)
     print(f"✅ {len(estudantes_dados)} estudantes criados com sucesso!")
 
     # 4. Estatísticas
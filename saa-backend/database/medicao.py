@@ -0,0 +1,88 @@
+"""Medição das consultas feitas pelas conexões do backend.
+
+:func:`database.db.get_connection` cria as conexões com
+:class:`ConexaoMedida`, cujos cursores cronometram ``execute``,
+``executemany`` e ``executescript`` e avisam os observadores registrados com
+:func:`adicionar_observador` (as métricas de ``/metrics`` e o diagnóstico de
+:mod:`database.diagnostico`). Sem observadores, a consulta segue direto, sem
+cronômetro.
+
+O tempo medido é o da chamada a ``execute``: inclui preparar a instrução e
+produzir a primeira linha (toda a agregação de um ``GROUP BY``, por exemplo),
+mas não as linhas lidas depois com ``fetch*``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from typing import Callable
+
+Observador = Callable[[str, float, sqlite3.Connection], None]
+
+_observadores: tuple[Observador, ...] = ()
+
+
+def adicionar_observador(observador: Observador) -> None:
+    """Passa a chamar ``observador(sql, segundos, conexao)`` após cada consulta."""
+
+    global _observadores
+    if observador not in _observadores:
+        _observadores = (*_observadores, observador)
+
+
+def remover_observador(observador: Observador) -> None:
+    global _observadores
+    _observadores = tuple(o for o in _observadores if o is not observador)
+
+
+def _notificar(sql: str, inicio: float, conexao: sqlite3.Connection) -> None:
+    duracao = time.perf_counter() - inicio
+    for observador in _observadores:
+        observador(sql, duracao, conexao)
+
+
+class CursorMedido(sqlite3.Cursor):
+    def execute(self, sql, parametros=()):
+        if not _observadores:
+            return super().execute(sql, parametros)
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            _notificar(sql, inicio, self.connection)
+
+    def executemany(self, sql, parametros):
+        if not _observadores:
+            return super().executemany(sql, parametros)
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, parametros)
+        finally:
+            _notificar(sql, inicio, self.connection)
+
+    def executescript(self, script):
+        if not _observadores:
+            return super().executescript(script)
+        inicio = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            _notificar(script, inicio, self.connection)
+
+
+class ConexaoMedida(sqlite3.Connection):
+    """Conexão cujos cursores (inclusive os de ``conn.execute``) são medidos."""
+
+    def cursor(self, factory=CursorMedido):
+        return super().cursor(factory)
+
+    # Os atalhos da conexão criam o cursor em C, sem passar por cursor().
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
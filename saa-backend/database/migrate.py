@@ -0,0 +1,213 @@
+"""Migrações versionadas do schema SQLite.
+
+``schema.sql`` é a base (versão 0) e usa ``CREATE TABLE IF NOT EXISTS``,
+portanto pode ser reaplicado sem risco. Cada arquivo em ``migrations/`` tem o
+formato ``NNNN_descricao.sql`` e eleva o banco para a versão ``NNNN``. A versão
+aplicada fica em ``PRAGMA user_version``, gravada na mesma transação da
+migração: uma migração que falha não deixa o banco pela metade.
+
+Migrações que precisam de código Python (por exemplo, para preencher tabelas
+com valores calculados pelos modelos) usam ``NNNN_descricao.py`` e definem
+``migrar(conn)``. Elas podem controlar as próprias transações, por isso devem
+ser idempotentes: a versão só é gravada depois que ``migrar`` termina.
+
+A API não migra sozinha: :func:`exigir_schema_atual` recusa bancos com
+migrações pendentes, com uma mensagem indicando ``migrate_db.py``.
+
+Uso:
+    python migrate_db.py [--db data/saa.db] [--explicar]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from .db import DEFAULT_DB_PATH, get_connection
+
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+_NOME_MIGRACAO = re.compile(r"^(\d{4})_[\w-]+\.(sql|py)$")
+
+# Consultas críticas e o índice que cada uma deve usar (ver --explicar).
+CONSULTAS_INDEXADAS = {
+    "idx_dados_academicos_estudante_data": (
+        """
+        SELECT d.horas_estudo FROM dados_academicos d
+        WHERE d.estudante_id = ?
+        ORDER BY d.data_registro DESC, d.id DESC
+        LIMIT 1
+        """,
+        (0,),
+    ),
+    "idx_alertas_estudante_criacao": (
+        "SELECT * FROM alertas WHERE estudante_id = ? ORDER BY created_at DESC",
+        (0,),
+    ),
+    # Selo de não lidos (api/alertas.py): só as linhas abertas do índice parcial.
+    "idx_alertas_nao_lidos": (
+        "SELECT tipo, COUNT(*) FROM alertas WHERE estudante_id = ? AND lido = 0 GROUP BY tipo",
+        (0,),
+    ),
+    # Página da listagem (api/listagem.py): seek por matrícula, sem ordenação.
+    "sqlite_autoindex_estudantes_1": (
+        """
+        SELECT e.matricula, s.risco FROM estudantes e
+        LEFT JOIN estado_atual_estudantes s ON s.estudante_id = e.id
+        WHERE e.matricula > ? AND +s.risco = ?
+        ORDER BY e.matricula
+        LIMIT 51
+        """,
+        ("", "ALTO"),
+    ),
+}
+
+
+class SchemaDesatualizadoError(RuntimeError):
+    """O banco tem migrações pendentes; é preciso rodar ``migrate_db.py``."""
+
+
+def listar_migracoes() -> list[tuple[int, Path]]:
+    """Retorna ``(versao, caminho)`` de todas as migrações, em ordem."""
+
+    migracoes = []
+    for caminho in MIGRATIONS_DIR.iterdir():
+        encontrado = _NOME_MIGRACAO.match(caminho.name)
+        if encontrado:
+            migracoes.append((int(encontrado.group(1)), caminho))
+    return sorted(migracoes)
+
+
+def _executar_migracao_python(conn: sqlite3.Connection, caminho: Path) -> None:
+    """Carrega o módulo da migração e executa ``migrar(conn)``."""
+
+    spec = importlib.util.spec_from_file_location(f"_migracao_{caminho.stem}", caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    modulo.migrar(conn)
+
+
+def versao_atual(conn: sqlite3.Connection) -> int:
+    """Versão do schema registrada no banco."""
+
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def versao_mais_recente() -> int:
+    """Versão a que :func:`aplicar_migracoes` leva o banco."""
+
+    migracoes = listar_migracoes()
+    return migracoes[-1][0] if migracoes else 0
+
+
+_conferidos: set[Path] = set()
+_conferidos_lock = threading.Lock()
+
+
+def exigir_schema_atual(db_path: Path | None = None) -> None:
+    """Levanta :class:`SchemaDesatualizadoError` se o banco não estiver na versão mais recente.
+
+    Usa uma conexão própria (fechada em seguida, não a do pool) e só consulta
+    o banco até o primeiro sucesso de cada arquivo.
+    """
+
+    alvo = Path(db_path or DEFAULT_DB_PATH).resolve()
+    if alvo in _conferidos:
+        return
+    conn = get_connection(alvo)
+    try:
+        versao = versao_atual(conn)
+    finally:
+        conn.close()
+    esperada = versao_mais_recente()
+    if versao < esperada:
+        raise SchemaDesatualizadoError(
+            f"Banco {alvo} na versão {versao} do schema; esta versão do backend "
+            f"precisa da {esperada}. Execute: python migrate_db.py --db {alvo}"
+        )
+    with _conferidos_lock:
+        _conferidos.add(alvo)
+
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> list[int]:
+    """Leva o banco à versão mais recente, preservando os dados existentes.
+
+    Retorna as versões aplicadas nesta chamada.
+    """
+
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+    aplicadas = []
+    versao = versao_atual(conn)
+    for numero, caminho in listar_migracoes():
+        if numero <= versao:
+            continue
+        try:
+            if caminho.suffix == ".py":
+                _executar_migracao_python(conn, caminho)
+                with conn:
+                    conn.execute(f"PRAGMA user_version = {numero:d}")
+            else:
+                script = caminho.read_text(encoding="utf-8")
+                conn.executescript(
+                    f"BEGIN;\n{script}\nPRAGMA user_version = {numero:d};\nCOMMIT;"
+                )
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        aplicadas.append(numero)
+    return aplicadas
+
+
+def explicar_consultas(conn: sqlite3.Connection) -> dict[str, list[str]]:
+    """Plano (``EXPLAIN QUERY PLAN``) das consultas críticas, por índice esperado."""
+
+    planos = {}
+    for indice, (sql, parametros) in CONSULTAS_INDEXADAS.items():
+        linhas = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+        planos[indice] = [linha[3] for linha in linhas]
+    return planos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aplica as migrações pendentes do banco.")
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    parser.add_argument(
+        "--explicar",
+        action="store_true",
+        help="mostra o plano das consultas críticas e falha se algum índice não for usado",
+    )
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    antes = versao_atual(conn)
+    aplicadas = aplicar_migracoes(conn)
+
+    if aplicadas:
+        print(f"✅ Banco migrado da versão {antes} para {aplicadas[-1]}")
+    else:
+        print(f"✅ Banco já está na versão {antes}")
+
+    if args.explicar:
+        sem_indice = []
+        for indice, plano in explicar_consultas(conn).items():
+            print(f"\n{indice}:")
+            for passo in plano:
+                print(f"   {passo}")
+            if not any(indice in passo for passo in plano):
+                sem_indice.append(indice)
+        if sem_indice:
+            conn.close()
+            raise SystemExit(f"\n❌ Índices não usados: {', '.join(sem_indice)}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
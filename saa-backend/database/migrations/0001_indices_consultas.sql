@@ -0,0 +1,11 @@
+-- Índices para os caminhos de acesso mais usados.
+
+-- Último registro de cada estudante (dashboard, resumo de riscos,
+-- recalcular_perfis.py): igualdade em estudante_id, ordenado por
+-- data_registro DESC com desempate pelo registro mais recente.
+CREATE INDEX IF NOT EXISTS idx_dados_academicos_estudante_data
+    ON dados_academicos (estudante_id, data_registro DESC, id DESC);
+
+-- Alertas de um estudante, do mais recente para o mais antigo.
+CREATE INDEX IF NOT EXISTS idx_alertas_estudante_criacao
+    ON alertas (estudante_id, created_at DESC);
@@ -0,0 +1,121 @@
+-- Agregados da turma (contagem, soma e soma dos quadrados por métrica) de
+-- dados_academicos, mantidos por triggers na mesma transação de cada escrita.
+-- Substituem o AVG sobre a tabela inteira feito pelo dashboard. Em caso de
+-- divergência, reconstruir_agregados.py recalcula tudo do zero.
+
+CREATE TABLE IF NOT EXISTS agregados_turma (
+    metrica TEXT PRIMARY KEY,
+    contagem INTEGER NOT NULL DEFAULT 0,
+    soma REAL NOT NULL DEFAULT 0,
+    soma_quadrados REAL NOT NULL DEFAULT 0
+);
+
+-- Valores ausentes (NULL) são ignorados, como em AVG().
+INSERT OR REPLACE INTO agregados_turma (metrica, contagem, soma, soma_quadrados)
+SELECT 'horas_estudo', COUNT(horas_estudo), COALESCE(SUM(horas_estudo), 0), COALESCE(SUM(horas_estudo * horas_estudo), 0)
+FROM dados_academicos
+UNION ALL
+SELECT 'participacao_projetos', COUNT(participacao_projetos), COALESCE(SUM(participacao_projetos), 0), COALESCE(SUM(participacao_projetos * participacao_projetos), 0)
+FROM dados_academicos
+UNION ALL
+SELECT 'disciplinas_praticas', COUNT(disciplinas_praticas), COALESCE(SUM(disciplinas_praticas), 0), COALESCE(SUM(disciplinas_praticas * disciplinas_praticas), 0)
+FROM dados_academicos
+UNION ALL
+SELECT 'impacto_percebido', COUNT(impacto_percebido), COALESCE(SUM(impacto_percebido), 0), COALESCE(SUM(impacto_percebido * impacto_percebido), 0)
+FROM dados_academicos;
+
+CREATE TRIGGER IF NOT EXISTS trg_agregados_turma_insert
+AFTER INSERT ON dados_academicos
+BEGIN
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.horas_estudo,
+        soma_quadrados = soma_quadrados + NEW.horas_estudo * NEW.horas_estudo
+    WHERE metrica = 'horas_estudo' AND NEW.horas_estudo IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.participacao_projetos,
+        soma_quadrados = soma_quadrados + NEW.participacao_projetos * NEW.participacao_projetos
+    WHERE metrica = 'participacao_projetos' AND NEW.participacao_projetos IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.disciplinas_praticas,
+        soma_quadrados = soma_quadrados + NEW.disciplinas_praticas * NEW.disciplinas_praticas
+    WHERE metrica = 'disciplinas_praticas' AND NEW.disciplinas_praticas IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.impacto_percebido,
+        soma_quadrados = soma_quadrados + NEW.impacto_percebido * NEW.impacto_percebido
+    WHERE metrica = 'impacto_percebido' AND NEW.impacto_percebido IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_agregados_turma_delete
+AFTER DELETE ON dados_academicos
+BEGIN
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.horas_estudo,
+        soma_quadrados = soma_quadrados - OLD.horas_estudo * OLD.horas_estudo
+    WHERE metrica = 'horas_estudo' AND OLD.horas_estudo IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.participacao_projetos,
+        soma_quadrados = soma_quadrados - OLD.participacao_projetos * OLD.participacao_projetos
+    WHERE metrica = 'participacao_projetos' AND OLD.participacao_projetos IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.disciplinas_praticas,
+        soma_quadrados = soma_quadrados - OLD.disciplinas_praticas * OLD.disciplinas_praticas
+    WHERE metrica = 'disciplinas_praticas' AND OLD.disciplinas_praticas IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.impacto_percebido,
+        soma_quadrados = soma_quadrados - OLD.impacto_percebido * OLD.impacto_percebido
+    WHERE metrica = 'impacto_percebido' AND OLD.impacto_percebido IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_agregados_turma_update
+AFTER UPDATE OF horas_estudo, participacao_projetos, disciplinas_praticas, impacto_percebido
+ON dados_academicos
+BEGIN
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.horas_estudo,
+        soma_quadrados = soma_quadrados - OLD.horas_estudo * OLD.horas_estudo
+    WHERE metrica = 'horas_estudo' AND OLD.horas_estudo IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.horas_estudo,
+        soma_quadrados = soma_quadrados + NEW.horas_estudo * NEW.horas_estudo
+    WHERE metrica = 'horas_estudo' AND NEW.horas_estudo IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.participacao_projetos,
+        soma_quadrados = soma_quadrados - OLD.participacao_projetos * OLD.participacao_projetos
+    WHERE metrica = 'participacao_projetos' AND OLD.participacao_projetos IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.participacao_projetos,
+        soma_quadrados = soma_quadrados + NEW.participacao_projetos * NEW.participacao_projetos
+    WHERE metrica = 'participacao_projetos' AND NEW.participacao_projetos IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.disciplinas_praticas,
+        soma_quadrados = soma_quadrados - OLD.disciplinas_praticas * OLD.disciplinas_praticas
+    WHERE metrica = 'disciplinas_praticas' AND OLD.disciplinas_praticas IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.disciplinas_praticas,
+        soma_quadrados = soma_quadrados + NEW.disciplinas_praticas * NEW.disciplinas_praticas
+    WHERE metrica = 'disciplinas_praticas' AND NEW.disciplinas_praticas IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem - 1,
+        soma = soma - OLD.impacto_percebido,
+        soma_quadrados = soma_quadrados - OLD.impacto_percebido * OLD.impacto_percebido
+    WHERE metrica = 'impacto_percebido' AND OLD.impacto_percebido IS NOT NULL;
+    UPDATE agregados_turma
+    SET contagem = contagem + 1,
+        soma = soma + NEW.impacto_percebido,
+        soma_quadrados = soma_quadrados + NEW.impacto_percebido * NEW.impacto_percebido
+    WHERE metrica = 'impacto_percebido' AND NEW.impacto_percebido IS NOT NULL;
+END;
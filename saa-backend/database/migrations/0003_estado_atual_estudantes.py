@@ -0,0 +1,119 @@
+"""Cria ``estado_atual_estudantes`` e preenche com o último registro de cada estudante.
+
+O schema e as consultas ficam copiados aqui como eram na versão 3, em vez de
+importados de :mod:`database.estado_atual`: mudanças posteriores naquele
+módulo não podem alterar o que esta migração faz. Só impacto, risco e perfil
+vêm dos modelos; a API os recalcula com as versões em uso depois da migração
+0007.
+"""
+
+import numpy as np
+
+from models.clustering import identificar_perfis_lote
+from models.regression import calcular_impacto_lote, calcular_risco_lote
+
+DDL = """
+CREATE TABLE IF NOT EXISTS estado_atual_estudantes (
+    estudante_id INTEGER PRIMARY KEY,
+    dados_id INTEGER NOT NULL,
+    horas_estudo REAL,
+    participacao_projetos INTEGER,
+    disciplinas_praticas INTEGER,
+    impacto_percebido REAL,
+    data_registro DATE,
+    impacto_previsto REAL NOT NULL,
+    risco TEXT NOT NULL,
+    perfil TEXT NOT NULL,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (estudante_id) REFERENCES estudantes (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_estado_atual_dados ON estado_atual_estudantes (dados_id);
+CREATE INDEX IF NOT EXISTS idx_estado_atual_risco ON estado_atual_estudantes (risco);
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_atual_estudante_delete
+AFTER DELETE ON estudantes
+BEGIN
+    DELETE FROM estado_atual_estudantes WHERE estudante_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_atual_dados_delete
+AFTER DELETE ON dados_academicos
+BEGIN
+    DELETE FROM estado_atual_estudantes WHERE dados_id = OLD.id;
+END;
+"""
+
+TAMANHO_LOTE = 50_000
+
+SQL_FAIXA_IDS = """
+    SELECT MAX(id) FROM (
+        SELECT id FROM estudantes WHERE id > ? ORDER BY id LIMIT ?
+    )
+"""
+
+SQL_ULTIMOS_REGISTROS_FAIXA = """
+    SELECT estudante_id, id, horas_estudo, participacao_projetos,
+           disciplinas_praticas, impacto_percebido, data_registro
+    FROM (
+        SELECT d.estudante_id, d.id, d.horas_estudo, d.participacao_projetos,
+               d.disciplinas_praticas, d.impacto_percebido, d.data_registro,
+               ROW_NUMBER() OVER (
+                   PARTITION BY d.estudante_id
+                   ORDER BY d.data_registro DESC, d.id DESC
+               ) AS ordem
+        FROM dados_academicos d
+        JOIN estudantes e ON e.id = d.estudante_id
+        WHERE d.estudante_id > ? AND d.estudante_id <= ?
+    )
+    WHERE ordem = 1
+"""
+
+SQL_GRAVAR = """
+    INSERT OR REPLACE INTO estado_atual_estudantes
+    (estudante_id, dados_id, horas_estudo, participacao_projetos, disciplinas_praticas,
+     impacto_percebido, data_registro, impacto_previsto, risco, perfil, atualizado_em)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+def _gravar(conn, registros):
+    if not registros:
+        return
+    metricas = np.array(
+        [(r[2] or 0, r[3] or 0, r[4] or 0) for r in registros], dtype=np.float64
+    )
+    impactos = calcular_impacto_lote(metricas[:, 0], metricas[:, 1], metricas[:, 2])
+    riscos = calcular_risco_lote(impactos)
+    perfis = identificar_perfis_lote(metricas)
+    conn.executemany(
+        SQL_GRAVAR,
+        (
+            (*registro, impacto, risco, perfil)
+            for registro, impacto, risco, perfil in zip(
+                registros, impactos.tolist(), riscos, perfis
+            )
+        ),
+    )
+
+
+def migrar(conn):
+    conn.executescript(DDL)
+
+    # Em lotes por faixa de id, um commit por lote (a migração é idempotente).
+    ultimo_id = 0
+    while True:
+        limite = conn.execute(SQL_FAIXA_IDS, (ultimo_id, TAMANHO_LOTE)).fetchone()[0]
+        if limite is None:
+            break
+        registros = conn.execute(SQL_ULTIMOS_REGISTROS_FAIXA, (ultimo_id, limite)).fetchall()
+        with conn:
+            conn.execute(
+                "DELETE FROM estado_atual_estudantes WHERE estudante_id > ? AND estudante_id <= ?",
+                (ultimo_id, limite),
+            )
+            _gravar(conn, [tuple(r) for r in registros])
+        ultimo_id = limite
+
+    with conn:
+        conn.execute("DELETE FROM estado_atual_estudantes WHERE estudante_id > ?", (ultimo_id,))
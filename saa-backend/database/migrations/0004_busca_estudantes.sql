@@ -0,0 +1,40 @@
+-- Busca textual em nome e matrícula dos estudantes (FTS5), usada pela
+-- listagem GET /api/estudantes?busca=... . A tabela FTS não guarda cópia dos
+-- dados (content=estudantes) e é mantida por triggers; o rowid é o id do
+-- estudante. Acentos são ignorados ("joao" encontra "João"). A busca trata
+-- cada termo como prefixo; os índices de prefixo respondem termos de até 6
+-- letras sem percorrer todas as palavras que começam com eles.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS estudantes_fts USING fts5(
+    matricula,
+    nome,
+    content = 'estudantes',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4 5 6'
+);
+
+INSERT INTO estudantes_fts (estudantes_fts) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS trg_estudantes_fts_insert
+AFTER INSERT ON estudantes
+BEGIN
+    INSERT INTO estudantes_fts (rowid, matricula, nome)
+    VALUES (NEW.id, NEW.matricula, NEW.nome);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estudantes_fts_delete
+AFTER DELETE ON estudantes
+BEGIN
+    INSERT INTO estudantes_fts (estudantes_fts, rowid, matricula, nome)
+    VALUES ('delete', OLD.id, OLD.matricula, OLD.nome);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estudantes_fts_update
+AFTER UPDATE OF matricula, nome ON estudantes
+BEGIN
+    INSERT INTO estudantes_fts (estudantes_fts, rowid, matricula, nome)
+    VALUES ('delete', OLD.id, OLD.matricula, OLD.nome);
+    INSERT INTO estudantes_fts (rowid, matricula, nome)
+    VALUES (NEW.id, NEW.matricula, NEW.nome);
+END;
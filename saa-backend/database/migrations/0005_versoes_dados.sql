@@ -0,0 +1,81 @@
+-- Contadores de versão para validação de cache HTTP (ETag). Cada escrita
+-- relevante incrementa, na mesma transação e por triggers (valendo para a API,
+-- importações e scripts):
+--
+-- - estudantes.versao: dados do próprio estudante (cadastro, registros
+--   acadêmicos, estado atual);
+-- - contadores_versao 'global': qualquer mudança que altere a turma como um
+--   todo (estudantes incluídos/removidos, registros acadêmicos, estado atual),
+--   ou seja, a média da turma e o resumo de riscos.
+
+ALTER TABLE estudantes ADD COLUMN versao INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS contadores_versao (
+    escopo TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO contadores_versao (escopo, versao) VALUES ('global', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_estudantes_insert
+AFTER INSERT ON estudantes
+BEGIN
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_estudantes_delete
+AFTER DELETE ON estudantes
+BEGIN
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+-- Alterações cadastrais só afetam o próprio estudante. A lista de colunas
+-- exclui "versao", então o UPDATE abaixo não dispara o trigger de novo.
+CREATE TRIGGER IF NOT EXISTS trg_versao_estudantes_update
+AFTER UPDATE OF matricula, nome, email, perfil ON estudantes
+BEGIN
+    UPDATE estudantes SET versao = versao + 1 WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_dados_insert
+AFTER INSERT ON dados_academicos
+BEGIN
+    UPDATE estudantes SET versao = versao + 1 WHERE id = NEW.estudante_id;
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_dados_update
+AFTER UPDATE ON dados_academicos
+BEGIN
+    UPDATE estudantes SET versao = versao + 1 WHERE id IN (OLD.estudante_id, NEW.estudante_id);
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_dados_delete
+AFTER DELETE ON dados_academicos
+BEGIN
+    UPDATE estudantes SET versao = versao + 1 WHERE id = OLD.estudante_id;
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+-- INSERT OR REPLACE (usado ao gravar o estado atual) dispara o trigger de
+-- INSERT; reconstruções completas incrementam os contadores uma vez por linha.
+CREATE TRIGGER IF NOT EXISTS trg_versao_estado_insert
+AFTER INSERT ON estado_atual_estudantes
+BEGIN
+    UPDATE estudantes SET versao = versao + 1 WHERE id = NEW.estudante_id;
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_estado_update
+AFTER UPDATE ON estado_atual_estudantes
+BEGIN
+    UPDATE estudantes SET versao = versao + 1 WHERE id = NEW.estudante_id;
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_versao_estado_delete
+AFTER DELETE ON estado_atual_estudantes
+BEGIN
+    UPDATE contadores_versao SET versao = versao + 1 WHERE escopo = 'global';
+END;
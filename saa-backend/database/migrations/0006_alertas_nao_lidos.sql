@@ -0,0 +1,8 @@
+-- Alertas não lidos (lido = 0), em um índice parcial: só as linhas abertas
+-- entram, então o selo de não lidos de um estudante, a marcação como lido e a
+-- deduplicação do motor de alertas (database/alertas.py) custam o número de
+-- alertas abertos, não o histórico inteiro. As consultas precisam repetir o
+-- termo "lido = 0" para o planejador escolher este índice; "lido" também é
+-- coluna do índice para que ele seja de cobertura (sem ler a tabela).
+CREATE INDEX IF NOT EXISTS idx_alertas_nao_lidos
+    ON alertas (estudante_id, tipo, lido) WHERE lido = 0;
@@ -0,0 +1,17 @@
+"""Cria ``estado_atual_modelos``, com as versões dos modelos usadas no estado atual.
+
+Em bancos existentes a tabela começa vazia (as versões usadas são
+desconhecidas), e a API reconstrói o estado uma vez ao encontrá-la assim.
+O schema fica copiado aqui, como na versão 7.
+"""
+
+
+def migrar(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS estado_atual_modelos (
+            artefato TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL
+        )
+        """
+    )
@@ -0,0 +1,250 @@
+"""Gravação em segundo plano (write-behind) das simulações em ``simulacoes``.
+
+``/api/simular`` não grava na requisição: :meth:`FilaSimulacoes.registrar`
+só acrescenta o registro a uma fila em memória e volta. Uma thread por banco
+grava a fila em lotes, em uma transação por lote, quando ela atinge
+``SAA_SIMULACOES_LOTE`` registros ou a cada ``SAA_SIMULACOES_INTERVALO``
+segundos, o que vier primeiro.
+
+A fila tem no máximo ``SAA_SIMULACOES_MAX_PENDENTES`` registros. Cheia (o
+banco não acompanha a carga), novos registros são descartados e contados em
+``descartados``; a simulação em si nunca espera nem falha por isso. Lotes
+que falham ao gravar são contados em ``falhas``, inclusive quando o banco
+não abre (a conexão é tentada de novo no lote seguinte). Se um registro
+inválido derruba o lote, os demais são regravados um a um e só ele se
+perde. Ao encerrar o processo (``atexit``), a fila é esvaziada antes de sair.
+
+O estudante é opcional: a matrícula enviada é resolvida para o id no
+próprio INSERT, e fica ``NULL`` se não existir.
+
+Parâmetros ajustáveis por variável de ambiente:
+
+- ``SAA_SIMULACOES``: ``0`` desliga o registro (padrão ``1``)
+- ``SAA_SIMULACOES_LOTE``: registros por transação (padrão 500)
+- ``SAA_SIMULACOES_INTERVALO``: segundos máximos até a gravação (padrão 1)
+- ``SAA_SIMULACOES_MAX_PENDENTES``: registros em memória (padrão 10000)
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from .db import DEFAULT_DB_PATH, get_connection
+
+HABILITADO = os.environ.get("SAA_SIMULACOES", "1") != "0"
+TAMANHO_LOTE = int(os.environ.get("SAA_SIMULACOES_LOTE", "500"))
+INTERVALO = float(os.environ.get("SAA_SIMULACOES_INTERVALO", "1"))
+MAX_PENDENTES = int(os.environ.get("SAA_SIMULACOES_MAX_PENDENTES", "10000"))
+
+SQL_INSERIR = """
+    INSERT INTO simulacoes
+    (estudante_id, horas_simuladas, projetos_simulados, disciplinas_simuladas,
+     impacto_previsto, risco_previsto, data_simulacao)
+    VALUES ((SELECT id FROM estudantes WHERE matricula = ?), ?, ?, ?, ?, ?, datetime(?, 'unixepoch'))
+"""
+
+
+class FilaSimulacoes:
+    """Fila limitada de simulações, gravada em lotes por uma thread própria.
+
+    A thread é criada no primeiro registro (e recriada em um processo filho
+    após ``fork``, com a fila vazia, ou se tiver morrido).
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        tamanho_lote: int = TAMANHO_LOTE,
+        intervalo: float = INTERVALO,
+        max_pendentes: int = MAX_PENDENTES,
+    ) -> None:
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.max_pendentes = max_pendentes
+        self._pendentes: deque[tuple] = deque()
+        self._condicao = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+        self._parando = False
+        self._contadores = {
+            "registrados": 0,
+            "gravados": 0,
+            "descartados": 0,
+            "falhas": 0,
+            "lotes": 0,
+        }
+
+    def registrar(
+        self,
+        matricula: str | None,
+        horas: float,
+        projetos: int,
+        disciplinas: int,
+        impacto: float,
+        risco: str,
+    ) -> bool:
+        """Enfileira uma simulação sem bloquear. ``False`` se foi descartada."""
+
+        # Instante da simulação (não da gravação); formatado pelo SQLite no INSERT.
+        data = time.time()
+        with self._condicao:
+            self._garantir_thread()
+            if self._parando or len(self._pendentes) >= self.max_pendentes:
+                self._contadores["descartados"] += 1
+                return False
+            self._pendentes.append((matricula, horas, projetos, disciplinas, impacto, risco, data))
+            self._contadores["registrados"] += 1
+            if len(self._pendentes) >= self.tamanho_lote:
+                self._condicao.notify()
+        return True
+
+    def _garantir_thread(self) -> None:
+        # Chamado com o lock. Após um fork, a thread do processo pai não
+        # existe no filho e os pendentes copiados pertencem ao pai.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._pendentes.clear()
+            self._thread = None
+        if (self._thread is None or not self._thread.is_alive()) and not self._parando:
+            self._thread = threading.Thread(
+                target=self._executar, name="saa-simulacoes", daemon=True
+            )
+            self._thread.start()
+
+    def _proximo_lote(self) -> list[tuple] | None:
+        """Espera o lote encher ou o intervalo passar. ``None`` ao encerrar."""
+
+        with self._condicao:
+            self._condicao.wait_for(
+                lambda: len(self._pendentes) >= self.tamanho_lote or self._parando,
+                timeout=self.intervalo,
+            )
+            if self._parando and not self._pendentes:
+                return None
+            quantidade = min(len(self._pendentes), self.tamanho_lote)
+            return [self._pendentes.popleft() for _ in range(quantidade)]
+
+    def _executar(self) -> None:
+        conn = None
+        try:
+            while (lote := self._proximo_lote()) is not None:
+                if not lote:
+                    continue
+                if conn is None:
+                    # Aberta aqui, e não antes do laço: se o banco não abrir,
+                    # o lote é perdido, mas a thread segue e tenta de novo.
+                    try:
+                        conn = get_connection(self.db_path)
+                    except Exception as e:
+                        self._contar_falha(lote, f"não foi possível abrir o banco: {e}")
+                        continue
+                self._gravar(conn, lote)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _contar_falha(self, lote: list[tuple], motivo: object) -> None:
+        print(f"⚠️ Falha ao gravar {len(lote)} simulações: {motivo}")
+        with self._condicao:
+            self._contadores["falhas"] += len(lote)
+
+    def _gravar(self, conn, lote: list[tuple]) -> None:
+        try:
+            with conn:
+                conn.executemany(SQL_INSERIR, lote)
+        except sqlite3.OperationalError as e:
+            # Banco travado, disco cheio...: registro a registro falharia igual.
+            self._contar_falha(lote, e)
+            return
+        except Exception:
+            # Um registro inválido não pode levar junto os demais do lote.
+            self._gravar_um_a_um(conn, lote)
+            return
+        with self._condicao:
+            self._contadores["gravados"] += len(lote)
+            self._contadores["lotes"] += 1
+
+    def _gravar_um_a_um(self, conn, lote: list[tuple]) -> None:
+        """Grava o lote registro a registro, na mesma transação, pulando os inválidos."""
+
+        validos, invalidos = [], []
+        try:
+            with conn:
+                for registro in lote:
+                    try:
+                        conn.execute(SQL_INSERIR, registro)
+                    except sqlite3.OperationalError:
+                        raise
+                    except Exception as e:
+                        invalidos.append(registro)
+                        erro = e
+                    else:
+                        validos.append(registro)
+        except Exception as e:
+            self._contar_falha(lote, e)
+            return
+        if invalidos:
+            self._contar_falha(invalidos, erro)
+        if validos:
+            with self._condicao:
+                self._contadores["gravados"] += len(validos)
+                self._contadores["lotes"] += 1
+
+    def parar(self, timeout: float = 10) -> None:
+        """Grava o que estiver pendente e encerra a thread."""
+
+        with self._condicao:
+            self._parando = True
+            thread = self._thread if self._pid == os.getpid() else None
+            self._condicao.notify()
+        if thread is not None:
+            thread.join(timeout)
+
+    def estatisticas(self) -> dict:
+        with self._condicao:
+            return {
+                **self._contadores,
+                "pendentes": len(self._pendentes),
+                "max_pendentes": self.max_pendentes,
+                "tamanho_lote": self.tamanho_lote,
+                "intervalo_segundos": self.intervalo,
+            }
+
+
+_filas: dict[Path, FilaSimulacoes] = {}
+# Fila de cada valor de db_path já visto, para não resolver o caminho (uma
+# chamada ao sistema de arquivos) a cada simulação.
+_atalhos: dict[object, FilaSimulacoes] = {}
+_filas_lock = threading.Lock()
+
+
+def get_fila_simulacoes(db_path: Path | str | None = None) -> FilaSimulacoes:
+    """Retorna a fila compartilhada do banco indicado (uma por arquivo)."""
+
+    fila = _atalhos.get(db_path)
+    if fila is not None:
+        return fila
+    target = Path(db_path or DEFAULT_DB_PATH).resolve()
+    with _filas_lock:
+        fila = _filas.get(target)
+        if fila is None:
+            fila = _filas[target] = FilaSimulacoes(target)
+        _atalhos[db_path] = fila
+        return fila
+
+
+@atexit.register
+def parar_filas() -> None:
+    """Esvazia todas as filas (chamado ao encerrar o processo)."""
+
+    with _filas_lock:
+        filas = list(_filas.values())
+    for fila in filas:
+        fila.parar()
@@ -0,0 +1,269 @@
+"""Gerador de coortes sintéticas para testes de carga e de escala.
+
+Cada estudante sorteia um dos três perfis de ``models.clustering`` e recebe
+métricas em torno do centroide correspondente, com ruído por estudante e por
+semana. O histórico tem entre ``historico_minimo`` e ``semanas`` registros
+semanais em datas distintas. O impacto percebido segue a regressão do estudo
+(sempre os coeficientes da Tabela 6, mesmo com outra versão treinada) com
+ruído. O último registro de cada estudante passa pelas regras de
+:mod:`database.alertas` (as mesmas da API), e os alertas gerados recebem a
+mensagem dessas regras; parte deles já vem marcada como lida.
+
+A carga é feita em um banco novo, em lotes com ``executemany`` e ids
+explícitos, sem journal nem fsync; índices, agregados e o estado atual são
+criados no final pelas migrações, de uma vez. Com a mesma semente o banco
+gerado é sempre o mesmo.
+
+Uso:
+    python gerar_dados_sinteticos.py --estudantes 100000 [--semanas 8] [--seed 42]
+        [--db data/sintetico.db] [--forcar]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from models.clustering import DEFAULT_CENTROIDES, PERFIS, classificar_perfis_lote
+from models.regression import COEFICIENTES_PADRAO, calcular_impacto_lote, calcular_risco_lote
+
+from .alertas import novos_alertas
+from .db import BASE_DIR
+from .estado_atual import registrar_versoes_modelos
+from .migrate import SCHEMA_PATH, aplicar_migracoes
+
+DEFAULT_SINTETICO_PATH = BASE_DIR / "data" / "sintetico.db"
+
+# Proporção de cada perfil (índices de PERFIS) e o desvio padrão do ruído
+# por estudante e por semana de (horas, projetos, disciplinas).
+PESOS_PERFIS = np.array([0.45, 0.35, 0.20])
+DESVIO_ESTUDANTE = np.array([2.5, 1.5, 0.7])
+DESVIO_SEMANA = np.array([1.5, 0.8, 0.3])
+DESVIO_IMPACTO = 0.6
+FRACAO_ALERTAS_LIDOS = 0.3
+
+TAMANHO_LOTE = 100_000
+SENHA_PADRAO = "senha123"
+
+
+def matricula_sintetica(estudante_id: int) -> str:
+    """Matrícula do estudante ``estudante_id`` em um banco gerado por este módulo."""
+
+    return f"S{estudante_id:08d}"
+
+
+def _gerar_lote(
+    rng: np.random.Generator,
+    primeiro_id: int,
+    quantidade: int,
+    semanas: int,
+    historico_minimo: int,
+) -> dict[str, np.ndarray]:
+    """Sorteia perfis, históricos e impactos de um lote de estudantes."""
+
+    clusters = rng.choice(len(PESOS_PERFIS), size=quantidade, p=PESOS_PERFIS)
+    base = DEFAULT_CENTROIDES[clusters] + rng.normal(0, DESVIO_ESTUDANTE, (quantidade, 3))
+
+    n_registros = rng.integers(historico_minimo, semanas + 1, quantidade)
+    total = int(n_registros.sum())
+    dono = np.repeat(np.arange(quantidade), n_registros)
+    inicio_estudante = np.cumsum(n_registros) - n_registros
+    # Registros de cada estudante ocupam as últimas n semanas, em ordem.
+    semana = np.repeat(semanas - n_registros, n_registros) + (
+        np.arange(total) - np.repeat(inicio_estudante, n_registros)
+    )
+
+    metricas = base[dono] + rng.normal(0, DESVIO_SEMANA, (total, 3))
+    metricas = np.clip(metricas, 0, None)
+    horas = np.round(metricas[:, 0], 1)
+    projetos = np.rint(metricas[:, 1]).astype(np.int64)
+    disciplinas = np.rint(metricas[:, 2]).astype(np.int64)
+
+    verdadeiro = calcular_impacto_lote(horas, projetos, disciplinas, COEFICIENTES_PADRAO)
+    impacto_percebido = np.round(
+        np.clip(verdadeiro + rng.normal(0, DESVIO_IMPACTO, total), 0, 7), 1
+    )
+    previsto = calcular_impacto_lote(horas, projetos, disciplinas)
+
+    ultimo = inicio_estudante + n_registros - 1
+    return {
+        "ids": np.arange(primeiro_id, primeiro_id + quantidade),
+        "dono": dono,
+        "semana": semana,
+        "horas": horas,
+        "projetos": projetos,
+        "disciplinas": disciplinas,
+        "impacto_percebido": impacto_percebido,
+        "ultimo": ultimo,
+        "previsto_ultimo": previsto[ultimo],
+        "alerta_lido": rng.random(quantidade) < FRACAO_ALERTAS_LIDOS,
+    }
+
+
+def gerar_banco(
+    db_path: Path,
+    n_estudantes: int,
+    semanas: int = 8,
+    seed: int = 42,
+    historico_minimo: int = 1,
+    senha_hash: str | None = None,
+    verbose: bool = False,
+) -> Path:
+    """Cria em ``db_path`` (que não pode existir) uma coorte sintética completa."""
+
+    if not 1 <= historico_minimo <= semanas:
+        raise ValueError("historico_minimo deve estar entre 1 e semanas")
+
+    db_path = Path(db_path)
+    if db_path.exists():
+        raise FileExistsError(f"{db_path} já existe")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if senha_hash is None:
+        from api.senhas import hash_password
+
+        # Um único hash real para todos: logins custam o mesmo que em produção.
+        senha_hash = hash_password(SENHA_PADRAO)
+
+    rng = np.random.default_rng(seed)
+    hoje = date.today()
+    datas = [(hoje - timedelta(weeks=semanas - 1 - s)).isoformat() for s in range(semanas)]
+    nomes_perfis = [PERFIS[i] for i in range(len(PERFIS))]
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+    inicio = time.perf_counter()
+    proximo_dado = 1
+    gerados = 0
+    for primeiro_id in range(1, n_estudantes + 1, TAMANHO_LOTE):
+        quantidade = min(TAMANHO_LOTE, n_estudantes - primeiro_id + 1)
+        lote = _gerar_lote(rng, primeiro_id, quantidade, semanas, historico_minimo)
+        ids = lote["ids"]
+        ultimo = lote["ultimo"]
+        perfis = classificar_perfis_lote(
+            np.column_stack(
+                (lote["horas"][ultimo], lote["projetos"][ultimo], lote["disciplinas"][ultimo])
+            )
+        )
+        alertas = novos_alertas(
+            ids, lote["previsto_ultimo"], calcular_risco_lote(lote["previsto_ultimo"])
+        )
+
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO estudantes (id, matricula, nome, email, senha_hash, perfil)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        i,
+                        matricula_sintetica(i),
+                        f"Estudante {i}",
+                        f"estudante{i}@exemplo.com",
+                        senha_hash,
+                        nomes_perfis[p],
+                    )
+                    for i, p in zip(ids.tolist(), perfis.tolist())
+                ),
+            )
+
+            total = len(lote["dono"])
+            conn.executemany(
+                """
+                INSERT INTO dados_academicos
+                (id, estudante_id, horas_estudo, participacao_projetos, disciplinas_praticas,
+                 impacto_percebido, data_registro)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                zip(
+                    range(proximo_dado, proximo_dado + total),
+                    ids[lote["dono"]].tolist(),
+                    lote["horas"].tolist(),
+                    lote["projetos"].tolist(),
+                    lote["disciplinas"].tolist(),
+                    lote["impacto_percebido"].tolist(),
+                    (datas[s] for s in lote["semana"].tolist()),
+                ),
+            )
+            proximo_dado += total
+
+            lidos = lote["alerta_lido"].tolist()
+            conn.executemany(
+                "INSERT INTO alertas (estudante_id, tipo, mensagem, lido) VALUES (?, ?, ?, ?)",
+                (
+                    (i, tipo, mensagem, int(lidos[i - primeiro_id]))
+                    for i, tipo, mensagem in alertas
+                ),
+            )
+
+        gerados += quantidade
+        if verbose:
+            decorrido = time.perf_counter() - inicio
+            print(f"   ✓ {gerados}/{n_estudantes} estudantes ({gerados / decorrido:,.0f}/s)")
+
+    # Índices, agregados e estado atual construídos de uma vez sobre os dados.
+    if verbose:
+        print("🔧 Aplicando migrações (índices, agregados, estado atual)...")
+    aplicar_migracoes(conn)
+    # O estado atual acabou de ser calculado (migração 0003) com os modelos
+    # deste processo: sem registrar as versões, a API o reconstruiria de novo.
+    with conn:
+        registrar_versoes_modelos(conn)
+    conn.close()
+    return db_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera uma coorte sintética de estudantes.")
+    parser.add_argument("--estudantes", type=int, default=10_000)
+    parser.add_argument("--semanas", type=int, default=8, help="máximo de registros semanais")
+    parser.add_argument(
+        "--historico-minimo", type=int, default=1, help="mínimo de registros por estudante"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", type=Path, default=DEFAULT_SINTETICO_PATH)
+    parser.add_argument("--forcar", action="store_true", help="sobrescreve o banco se já existir")
+    args = parser.parse_args()
+
+    if args.db.exists():
+        if not args.forcar:
+            print(f"❌ {args.db} já existe (use --forcar para sobrescrever)")
+            sys.exit(1)
+        args.db.unlink()
+
+    print(f"🧪 Gerando {args.estudantes} estudantes (seed={args.seed}) em {args.db}...")
+    inicio = time.perf_counter()
+    gerar_banco(
+        args.db,
+        args.estudantes,
+        semanas=args.semanas,
+        seed=args.seed,
+        historico_minimo=args.historico_minimo,
+        verbose=True,
+    )
+    duracao = time.perf_counter() - inicio
+
+    conn = sqlite3.connect(args.db)
+    contagens = {
+        tabela: conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+        for tabela in ("estudantes", "dados_academicos", "alertas")
+    }
+    conn.close()
+
+    print(f"\n✅ Banco gerado em {duracao:.1f}s")
+    for tabela, total in contagens.items():
+        print(f"   - {tabela}: {total}")
+    print(f"   Senha de todos os estudantes: {SENHA_PADRAO}")
+
+
+if __name__ == "__main__":
+    main()
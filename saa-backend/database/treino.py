@@ -0,0 +1,60 @@
+"""Leitura em streaming dos dados de treino dos modelos.
+
+Usado por ``treinar_clusters.py`` e ``treinar_regressao.py``: cada fonte é
+percorrida com um único cursor, ``tamanho_lote`` linhas por vez, e cada lote
+vira um array ``float64``, sem carregar a tabela inteira na memória.
+
+Fontes:
+    historico  todos os registros de ``dados_academicos``
+    atual      apenas o último registro de cada estudante (``estado_atual_estudantes``)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from itertools import chain
+from typing import Iterator
+
+import numpy as np
+
+FONTES = {
+    "historico": "dados_academicos",
+    "atual": "estado_atual_estudantes",
+}
+
+SQL_METRICAS = """
+    SELECT COALESCE(horas_estudo, 0),
+           COALESCE(participacao_projetos, 0),
+           COALESCE(disciplinas_praticas, 0)
+    FROM {tabela}
+"""
+
+SQL_AMOSTRAS = """
+    SELECT COALESCE(horas_estudo, 0),
+           COALESCE(participacao_projetos, 0),
+           COALESCE(disciplinas_praticas, 0),
+           impacto_percebido
+    FROM {tabela}
+    WHERE impacto_percebido IS NOT NULL
+"""
+
+
+def _ler(conn: sqlite3.Connection, sql: str, colunas: int, tamanho_lote: int) -> Iterator[np.ndarray]:
+    cursor = conn.execute(sql)
+    while linhas := cursor.fetchmany(tamanho_lote):
+        yield np.fromiter(chain.from_iterable(linhas), dtype=np.float64).reshape(-1, colunas)
+
+
+def ler_metricas(conn: sqlite3.Connection, fonte: str, tamanho_lote: int) -> Iterator[np.ndarray]:
+    """Lotes ``(n, 3)`` de (horas, projetos, disciplinas) da fonte."""
+
+    return _ler(conn, SQL_METRICAS.format(tabela=FONTES[fonte]), 3, tamanho_lote)
+
+
+def ler_amostras(conn: sqlite3.Connection, fonte: str, tamanho_lote: int) -> Iterator[np.ndarray]:
+    """Lotes ``(n, 4)``: as métricas e, na última coluna, o ``impacto_percebido``.
+
+    Registros sem impacto percebido ficam de fora.
+    """
+
+    return _ler(conn, SQL_AMOSTRAS.format(tabela=FONTES[fonte]), 4, tamanho_lote)
@@ -0,0 +1,12 @@
+"""Script executável para gerar uma coorte sintética (ver database/sintetico.py)."""
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório do backend ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from database.sintetico import main
+
+if __name__ == "__main__":
+    main()
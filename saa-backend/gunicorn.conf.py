@@ -0,0 +1,91 @@
+"""Configuração do gunicorn para produção.
+
+Uso (em ``saa-backend``)::
+
+    gunicorn -c gunicorn.conf.py
+
+O mestre importa :mod:`wsgi` (app, modelos e :func:`wsgi.preaquecer`) uma
+vez, congela o coletor de lixo (``gc.freeze``, para que as coletas dos
+workers não escrevam nas páginas herdadas e desfaçam o compartilhamento) e
+cria os workers com ``fork``. Cada worker roda :func:`wsgi.aquecer_worker`
+antes de aceitar conexões e, ao sair, grava as simulações pendentes.
+
+Parâmetros ajustáveis por variável de ambiente:
+
+- ``SAA_BIND``: endereço de escuta (padrão ``0.0.0.0:5000``)
+- ``SAA_WORKERS``: processos (padrão: número de CPUs)
+- ``SAA_THREADS``: threads por processo (padrão 4)
+- ``SAA_TIMEOUT``: segundos até um worker parado ser reiniciado (padrão 30)
+- ``SAA_MAX_REQUESTS``: requisições até reciclar um worker (padrão 0, nunca)
+
+Cada worker tem seu próprio pool de conexões (``SAA_DB_POOL_SIZE``, mantenha
+≥ ``SAA_THREADS``), fila de simulações, memo de ``/api/simular`` e
+``/metrics``; para o cache de relatórios ser compartilhado entre workers,
+use ``SAA_CACHE_RELATORIOS=sqlite``. O SQLite aceita um escritor por vez:
+workers a mais ajudam as leituras e o cálculo, não as escritas.
+
+Medições com ``python -m benchmarks.bench_http --url http://127.0.0.1:5000
+--estudantes 20000 --concorrencia 8 --rotas simular dashboard resumo
+--duracao 5`` (20 mil estudantes, 1 CPU dividida com o gerador de carga,
+Python 3.11), em requisições por segundo; cada faixa vai da pior à melhor de
+duas execuções:
+
+=========================  =======  =========  =======  ==========
+servidor                   simular  dashboard  resumo   p95 (ms)
+=========================  =======  =========  =======  ==========
+``python app.py``          496-554    473-522  359-543  22-29
+1 worker × 1 thread        606-629    473-480  414-636  16-24
+1 worker × 4 threads       501-639    523-543  591-638  17-24
+2 workers × 1 thread       357-500    328-351  418-456  30-43
+2 workers × 4 threads      442-678    340-456  380-445  20-37
+4 workers × 4 threads      333-429    322-471  364-490  29-40
+=========================  =======  =========  =======  ==========
+
+Com uma CPU, mais workers que núcleos só disputam o processador: a vazão
+não sobe e o p95 quase dobra. Por isso o padrão é um worker por CPU; as 4
+threads cobrem a espera pelo SQLite e pelo bcrypt (que liberam o GIL). Se o
+login ou as escritas dominarem a carga, aumente ``SAA_THREADS`` antes de
+``SAA_WORKERS``.
+
+O aquecimento leva cerca de 30-50 ms por worker; sem ele, o primeiro
+dashboard de um worker leva 8,2 ms e o primeiro resumo 4,7 ms (contra
+1,2 ms e 1,0 ms depois dele). Com ``preload_app``, os workers não repetem os
+~390 ms de importação e carga dos modelos, e cerca de 34 MB dos 46 MB de
+RSS de cada worker ficam compartilhados com o mestre.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+
+bind = os.environ.get("SAA_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("SAA_WORKERS", str(os.cpu_count() or 1)))
+threads = int(os.environ.get("SAA_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.environ.get("SAA_TIMEOUT", "30"))
+max_requests = int(os.environ.get("SAA_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+keepalive = 5
+
+wsgi_app = "wsgi:app"
+preload_app = True
+
+
+def when_ready(server):
+    # Mestre, com o app já carregado e antes do primeiro fork.
+    gc.collect()
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    from wsgi import aquecer_worker
+
+    segundos = aquecer_worker(worker.wsgi)
+    worker.log.info("Worker %s aquecido em %.0f ms", worker.pid, segundos * 1000)
+
+
+def worker_exit(server, worker):
+    from database.simulacoes import parar_filas
+
+    parar_filas()
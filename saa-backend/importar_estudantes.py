@@ -0,0 +1,278 @@
+"""Importa estudantes em massa a partir de um arquivo CSV ou NDJSON.
+
+Uso:
+    python importar_estudantes.py alunos.csv [--lote 2000] [--processos 8] [--db data/saa.db]
+
+Colunas/campos reconhecidos (os de dados acadêmicos são opcionais):
+
+    matricula, nome, email, senha (ou senha_hash), horas_estudo,
+    participacao_projetos, disciplinas_praticas, impacto_percebido, data_registro
+
+O arquivo é lido em streaming, em lotes. Para cada lote as senhas são
+hasheadas em paralelo em um pool de processos e, em uma única transação,
+são gravados ``estudantes``, ``dados_academicos``, os alertas das regras de
+``database.alertas`` e o ``estado_atual_estudantes``, sempre com ``executemany``.
+Matrículas já cadastradas (ou repetidas no arquivo) são ignoradas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from api.cache import invalidar_cache_compartilhado
+from api.senhas import hash_password
+from database.alertas import gravar_alertas, novos_alertas
+from database.db import get_connection
+from database.estado_atual import gravar_estados
+from database.migrate import aplicar_migracoes
+from models.clustering import identificar_perfis_lote
+from models.regression import calcular_impacto_lote, calcular_risco_lote
+
+CAMPOS_NUMERICOS = {
+    "horas_estudo": float,
+    "participacao_projetos": int,
+    "disciplinas_praticas": int,
+    "impacto_percebido": float,
+}
+
+
+def ler_registros(caminho: Path) -> Iterator[dict]:
+    """Lê o arquivo linha a linha; o formato vem da extensão (.csv, .ndjson, .jsonl)."""
+
+    sufixo = caminho.suffix.lower()
+    with open(caminho, "r", encoding="utf-8", newline="") as arquivo:
+        if sufixo == ".csv":
+            yield from csv.DictReader(arquivo)
+        elif sufixo in (".ndjson", ".jsonl"):
+            for linha in arquivo:
+                if linha.strip():
+                    yield json.loads(linha)
+        else:
+            raise ValueError(f"Formato não suportado: {caminho.name} (use .csv, .ndjson ou .jsonl)")
+
+
+def _normalizar(registro: dict) -> dict:
+    """Converte campos numéricos; valores vazios viram ``None``."""
+
+    normalizado = {chave: (valor if valor != "" else None) for chave, valor in registro.items()}
+    for campo, tipo in CAMPOS_NUMERICOS.items():
+        valor = normalizado.get(campo)
+        normalizado[campo] = tipo(float(valor)) if valor is not None else None
+    if not normalizado.get("matricula") or not normalizado.get("nome"):
+        raise ValueError(f"Registro sem matrícula ou nome: {registro}")
+    if not normalizado.get("senha") and not normalizado.get("senha_hash"):
+        raise ValueError(f"Registro sem senha: matrícula {normalizado['matricula']}")
+    return normalizado
+
+
+def _filtrar_novos(conn: sqlite3.Connection, lote: list[dict], vistas: set[str]) -> list[dict]:
+    """Remove matrículas já cadastradas ou repetidas no próprio arquivo."""
+
+    matriculas = [str(r["matricula"]) for r in lote]
+    marcadores = ",".join("?" * len(matriculas))
+    existentes = {
+        row[0]
+        for row in conn.execute(
+            f"SELECT matricula FROM estudantes WHERE matricula IN ({marcadores})", matriculas
+        )
+    }
+    novos = []
+    for registro, matricula in zip(lote, matriculas):
+        if matricula in existentes or matricula in vistas:
+            continue
+        vistas.add(matricula)
+        registro["matricula"] = matricula
+        novos.append(registro)
+    return novos
+
+
+def _proximo_id(conn: sqlite3.Connection, tabela: str) -> int:
+    """Primeiro id livre de uma tabela ``AUTOINCREMENT``, sem reaproveitar ids.
+
+    ``sqlite_sequence`` guarda o maior id já atribuído, mesmo que a linha
+    tenha sido apagada; ao inserir um id explícito maior, o SQLite o atualiza.
+    """
+
+    return conn.execute(
+        f"""
+        SELECT MAX(
+            COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+            COALESCE(MAX(id), 0)
+        ) + 1
+        FROM {tabela}
+        """,
+        (tabela,),
+    ).fetchone()[0]
+
+
+def _gravar_lote(conn: sqlite3.Connection, lote: list[dict], hashes: list[str]) -> int:
+    """Grava um lote já filtrado e com senhas hasheadas. Retorna os alertas criados."""
+
+    metricas = np.array(
+        [
+            [r["horas_estudo"] or 0, r["participacao_projetos"] or 0, r["disciplinas_praticas"] or 0]
+            for r in lote
+        ],
+        dtype=np.float64,
+    )
+    perfis = identificar_perfis_lote(metricas)
+    impactos = calcular_impacto_lote(metricas[:, 0], metricas[:, 1], metricas[:, 2])
+    riscos = calcular_risco_lote(impactos)
+    hoje = date.today().isoformat()
+
+    # BEGIN IMMEDIATE reserva a escrita antes de ler os ids, então os ids
+    # atribuídos aqui não colidem com os de outro escritor.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Ids de estudantes apagados não voltam a ser usados: linhas antigas
+        # em alertas/simulacoes com esses ids não passam a outra pessoa.
+        primeiro_estudante = _proximo_id(conn, "estudantes")
+        primeiro_dado = _proximo_id(conn, "dados_academicos")
+        ids = range(primeiro_estudante, primeiro_estudante + len(lote))
+        ids_dados = range(primeiro_dado, primeiro_dado + len(lote))
+
+        conn.executemany(
+            """
+            INSERT INTO estudantes (id, matricula, nome, email, senha_hash, perfil)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (i, r["matricula"], r["nome"], r.get("email"), h, p)
+                for i, r, h, p in zip(ids, lote, hashes, perfis)
+            ),
+        )
+
+        registros_dados = [
+            (
+                estudante_id,
+                dado_id,
+                r["horas_estudo"],
+                r["participacao_projetos"],
+                r["disciplinas_praticas"],
+                r["impacto_percebido"],
+                r.get("data_registro") or hoje,
+            )
+            for estudante_id, dado_id, r in zip(ids, ids_dados, lote)
+        ]
+        conn.executemany(
+            """
+            INSERT INTO dados_academicos
+            (estudante_id, id, horas_estudo, participacao_projetos, disciplinas_praticas,
+             impacto_percebido, data_registro)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            registros_dados,
+        )
+
+        alertas = gravar_alertas(conn, novos_alertas(list(ids), impactos, riscos))
+
+        gravar_estados(conn, registros_dados)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return alertas
+
+
+def importar(
+    conn: sqlite3.Connection,
+    registros: Iterable[dict],
+    tamanho_lote: int = 2_000,
+    processos: int | None = None,
+) -> dict:
+    """Importa os registros em lotes e retorna as estatísticas da carga."""
+
+    estatisticas = {"lidos": 0, "importados": 0, "ignorados": 0, "alertas": 0}
+    vistas: set[str] = set()
+    iterador = iter(registros)
+    inicio = time.perf_counter()
+
+    workers = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            lote = [_normalizar(r) for r in islice(iterador, tamanho_lote)]
+            if not lote:
+                break
+            estatisticas["lidos"] += len(lote)
+
+            novos = _filtrar_novos(conn, lote, vistas)
+            estatisticas["ignorados"] += len(lote) - len(novos)
+            if not novos:
+                continue
+
+            pendentes = [r for r in novos if not r.get("senha_hash")]
+            calculados = iter(
+                executor.map(
+                    hash_password,
+                    [str(r["senha"]) for r in pendentes],
+                    chunksize=max(1, len(pendentes) // (workers * 4)),
+                )
+            )
+            hashes = [r.get("senha_hash") or next(calculados) for r in novos]
+
+            estatisticas["alertas"] += _gravar_lote(conn, novos, hashes)
+            estatisticas["importados"] += len(novos)
+
+            decorrido = time.perf_counter() - inicio
+            print(
+                f"   ✓ {estatisticas['importados']} importados "
+                f"({estatisticas['importados'] / decorrido:,.0f} linhas/s)"
+            )
+
+    estatisticas["segundos"] = time.perf_counter() - inicio
+    return estatisticas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importa estudantes de um CSV ou NDJSON.")
+    parser.add_argument("arquivo", type=Path, help="arquivo .csv, .ndjson ou .jsonl")
+    parser.add_argument("--lote", type=int, default=2_000, help="linhas por transação")
+    parser.add_argument(
+        "--processos", type=int, default=os.cpu_count(), help="processos para hash de senhas"
+    )
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    args = parser.parse_args()
+
+    if not args.arquivo.exists():
+        print(f"❌ Arquivo não encontrado: {args.arquivo}")
+        sys.exit(1)
+
+    conn = get_connection(args.db)
+    # Transações controladas explicitamente em _gravar_lote.
+    conn.isolation_level = None
+    aplicar_migracoes(conn)
+
+    print(f"📥 Importando {args.arquivo.name} em lotes de {args.lote}...")
+    try:
+        estatisticas = importar(conn, ler_registros(args.arquivo), args.lote, args.processos)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    segundos = estatisticas["segundos"]
+    taxa = estatisticas["importados"] / segundos if segundos else 0
+    print(f"\n✅ {estatisticas['importados']} estudantes importados em {segundos:.1f}s ({taxa:,.0f} linhas/s)")
+    print(f"   • {estatisticas['ignorados']} ignorados (matrícula já existente ou repetida)")
+    print(f"   • {estatisticas['alertas']} alertas criados")
+    if (removidos := invalidar_cache_compartilhado()) is not None:
+        print(f"   • {removidos} relatórios removidos do cache compartilhado")
+
+
+if __name__ == "__main__":
+    main()
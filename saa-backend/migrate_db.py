@@ -0,0 +1,12 @@
+"""Script executável para aplicar as migrações do banco de dados."""
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório do backend ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from database.migrate import main
+
+if __name__ == "__main__":
+    main()
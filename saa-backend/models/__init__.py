@@ -1,9 +1,27 @@
 """Pacote com os modelos analíticos do sistema."""
 
-from .regression import calcular_impacto, calcular_risco
+from .clustering import recarregar_centroides_se_alterados
+from .regression import (
+    calcular_impacto,
+    calcular_impacto_lote,
+    calcular_risco,
+    calcular_risco_lote,
+    recarregar_coeficientes_se_alterados,
+)
+
+
+def recarregar_modelos_alterados() -> bool:
+    """Troca centroides e coeficientes cujos artefatos mudaram desde a última leitura."""
+
+    centroides = recarregar_centroides_se_alterados()
+    coeficientes = recarregar_coeficientes_se_alterados()
+    return centroides or coeficientes
+
 
 __all__ = [
     "calcular_impacto",
+    "calcular_impacto_lote",
     "calcular_risco",
+    "calcular_risco_lote",
+    "recarregar_modelos_alterados",
 ]
-
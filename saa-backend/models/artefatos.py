@@ -0,0 +1,117 @@
+"""Artefatos versionados dos modelos (centroides, coeficientes).
+
+Cada modelo ``nome`` tem arquivos ``{nome}_vNNNN.npy`` e um manifesto
+``{nome}.json`` que aponta para a versão atual e guarda os metadados do
+treino. O ``.npy`` é gravado antes do manifesto, ambos por renomeação
+atômica, então um leitor nunca vê uma versão pela metade.
+
+O diretório pode ser trocado com a variável de ambiente ``SAA_MODELOS_DIR``
+(padrão ``data/modelos``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+MODELOS_DIR = Path(
+    os.environ.get("SAA_MODELOS_DIR", Path(__file__).resolve().parent.parent / "data" / "modelos")
+)
+
+
+def caminho_manifesto(nome: str, diretorio: Path | None = None) -> Path:
+    return Path(diretorio or MODELOS_DIR) / f"{nome}.json"
+
+
+def assinatura_manifesto(nome: str, diretorio: Path | None = None) -> tuple[int, int] | None:
+    """``(mtime_ns, tamanho)`` do manifesto, ou ``None`` se não existir (uma chamada a ``stat``)."""
+
+    try:
+        info = caminho_manifesto(nome, diretorio).stat()
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def carregar_versao(
+    nome: str, diretorio: Path | None = None, mmap: bool = False
+) -> tuple[np.ndarray, dict] | None:
+    """Lê a versão atual: ``(array, manifesto)``, ou ``None`` se não houver manifesto.
+
+    Levanta ``OSError``/``ValueError``/``KeyError`` se o artefato estiver corrompido.
+    """
+
+    manifesto = caminho_manifesto(nome, diretorio)
+    if not manifesto.exists():
+        return None
+    metadados = json.loads(manifesto.read_text(encoding="utf-8"))
+    array = np.load(manifesto.parent / metadados["arquivo"], mmap_mode="r" if mmap else None)
+    return array, metadados
+
+
+def gravar_versao(
+    nome: str, array: np.ndarray, metadados: dict, diretorio: Path | None = None
+) -> int:
+    """Grava uma nova versão e a torna a atual. Retorna o número da versão."""
+
+    diretorio = Path(diretorio or MODELOS_DIR)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    existentes = [int(p.stem.rsplit("_v", 1)[1]) for p in diretorio.glob(f"{nome}_v*.npy")]
+    versao = max(existentes, default=0) + 1
+    arquivo = f"{nome}_v{versao:04d}.npy"
+
+    temporario = diretorio / f".{arquivo}.tmp"
+    with open(temporario, "wb") as f:
+        np.save(f, np.asarray(array, dtype=np.float64))
+    os.replace(temporario, diretorio / arquivo)
+
+    manifesto = caminho_manifesto(nome, diretorio)
+    temporario = diretorio / f".{manifesto.name}.tmp"
+    conteudo = {**metadados, "versao": versao, "arquivo": arquivo}
+    temporario.write_text(json.dumps(conteudo, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(temporario, manifesto)
+    return versao
+
+
+class VersaoAtual:
+    """Versão carregada de um artefato, trocada quando o manifesto muda.
+
+    ``carregar(diretorio)`` deve devolver o valor pronto para uso (com o
+    fallback para os padrões já aplicado). A troca é a atribuição de uma
+    única referência, então leitores concorrentes veem a versão antiga ou a
+    nova inteira, nunca uma mistura.
+    """
+
+    def __init__(self, nome: str, carregar, diretorio: Path | None = None) -> None:
+        self.nome = nome
+        self._carregar = carregar
+        self._diretorio = diretorio
+        self._valor = None
+        self._assinatura: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def atual(self):
+        valor = self._valor
+        if valor is None:
+            valor = self.recarregar()
+        return valor
+
+    def recarregar(self):
+        with self._lock:
+            self._assinatura = assinatura_manifesto(self.nome, self._diretorio)
+            self._valor = self._carregar(self._diretorio)
+            return self._valor
+
+    def recarregar_se_alterado(self) -> bool:
+        """Recarrega se o manifesto mudou desde a última leitura (custa um ``stat``)."""
+
+        if self._valor is not None and (
+            assinatura_manifesto(self.nome, self._diretorio) == self._assinatura
+        ):
+            return False
+        self.recarregar()
+        return True
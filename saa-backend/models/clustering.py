@@ -1,9 +1,21 @@
-"""Funções relacionadas ao agrupamento de perfis estudantis."""
+"""Funções relacionadas ao agrupamento de perfis estudantis.
+
+Os centroides usados na classificação vêm do artefato mais recente gerado
+por ``treinar_clusters.py`` (um ``.npy`` versionado, carregado como array
+mapeado em memória; ver :mod:`models.artefatos`) ou, se não houver artefato
+válido, de :data:`DEFAULT_CENTROIDES`. A API verifica o manifesto a cada
+requisição e troca de versão sem reiniciar o processo.
+"""
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import numpy as np
 
+from .artefatos import VersaoAtual, carregar_versao, gravar_versao
+
+ARTEFATO_CENTROIDES = "centroides"
 
 DEFAULT_CENTROIDES = np.array(
     [
@@ -20,11 +32,84 @@ PERFIS = {
 }
 
 
+def carregar_centroides(diretorio: Path | None = None) -> tuple[np.ndarray, int]:
+    """Lê o artefato atual e retorna ``(centroides, versao)``.
+
+    A versão 0 indica :data:`DEFAULT_CENTROIDES` (sem artefato, ou artefato
+    inválido).
+    """
+
+    try:
+        carregado = carregar_versao(ARTEFATO_CENTROIDES, diretorio, mmap=True)
+        if carregado is None:
+            return DEFAULT_CENTROIDES, 0
+        centroides, metadados = carregado
+        if centroides.shape != DEFAULT_CENTROIDES.shape or not np.isfinite(centroides).all():
+            raise ValueError(f"centroides com formato inválido: {centroides.shape}")
+        return centroides, int(metadados["versao"])
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        print(f"⚠️ Artefato de centroides inválido, usando os padrões: {e}")
+        return DEFAULT_CENTROIDES, 0
+
+
+def salvar_centroides(
+    centroides: np.ndarray, metadados: dict, diretorio: Path | None = None
+) -> int:
+    """Grava uma nova versão do artefato e a torna a atual. Retorna a versão."""
+
+    centroides = np.asarray(centroides, dtype=np.float64)
+    if centroides.shape != DEFAULT_CENTROIDES.shape:
+        raise ValueError(f"esperado {DEFAULT_CENTROIDES.shape}, recebido {centroides.shape}")
+    return gravar_versao(ARTEFATO_CENTROIDES, centroides, {**metadados, "perfis": PERFIS}, diretorio)
+
+
+_centroides = VersaoAtual(ARTEFATO_CENTROIDES, carregar_centroides)
+
+
+def centroides_atuais() -> tuple[np.ndarray, int]:
+    """Centroides em uso pelo processo, carregados na primeira chamada."""
+
+    return _centroides.atual()
+
+
+def recarregar_centroides() -> int:
+    """Relê o artefato (ex.: após um novo treino) e retorna a versão carregada."""
+
+    return _centroides.recarregar()[1]
+
+
+def recarregar_centroides_se_alterados() -> bool:
+    """Troca os centroides se um novo treino mudou o manifesto."""
+
+    return _centroides.recarregar_se_alterado()
+
+
 def identificar_perfil(horas_estudo: float, projetos: int, disciplinas: int) -> str:
     """Retorna o perfil mais próximo usando distância Euclidiana."""
 
+    centroides, _ = centroides_atuais()
     estudante = np.array([[horas_estudo, projetos, disciplinas]])
-    distancias = np.linalg.norm(DEFAULT_CENTROIDES - estudante, axis=1)
+    distancias = np.linalg.norm(centroides - estudante, axis=1)
     cluster = int(np.argmin(distancias))
     return PERFIS[cluster]
 
+
+def classificar_perfis_lote(estudantes, centroides: np.ndarray | None = None) -> np.ndarray:
+    """Retorna o índice do cluster mais próximo para cada linha de uma matriz N x 3.
+
+    As distâncias para todos os centroides são calculadas de uma vez por
+    broadcasting, sem laço em Python.
+    """
+
+    matriz = np.asarray(estudantes, dtype=np.float64).reshape(-1, 3)
+    centros = centroides_atuais()[0] if centroides is None else centroides
+    diferencas = matriz[:, np.newaxis, :] - centros[np.newaxis, :, :]
+    distancias = np.sqrt(np.add.reduce(diferencas * diferencas, axis=2))
+    return np.argmin(distancias, axis=1)
+
+
+def identificar_perfis_lote(estudantes, centroides: np.ndarray | None = None) -> np.ndarray:
+    """Versão vetorizada de :func:`identificar_perfil` (array de nomes de perfil)."""
+
+    nomes = np.array([PERFIS[i] for i in range(len(PERFIS))], dtype=object)
+    return nomes[classificar_perfis_lote(estudantes, centroides)]
@@ -1,19 +1,107 @@
-"""Implementa a regressão linear baseada na Tabela 6 do estudo."""
+"""Implementa a regressão linear baseada na Tabela 6 do estudo.
+
+Os coeficientes da Tabela 6 são o padrão. ``treinar_regressao.py`` pode
+gravar versões reajustadas aos dados (artefato ``coeficientes``, ver
+:mod:`models.artefatos`); a versão mais recente é carregada no primeiro uso
+e a API a troca, sem reiniciar, na requisição seguinte a um novo treino
+(recalculando também o estado atual gravado, ver :mod:`database.estado_atual`).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from .artefatos import VersaoAtual, carregar_versao
 
 INTERCEPTACAO = 0.56
 COEF_HORAS = 0.04
 COEF_PROJETOS = -0.04
 COEF_DISCIPLINAS = 1.51
 
+ARTEFATO_COEFICIENTES = "coeficientes"
+
+# Cenários distintos guardados por pontuar_cenario (LRU).
+MEMO_MAX_ITENS = int(os.environ.get("SAA_SIMULAR_MEMO_ITENS", "4096"))
+
+# Limiares (exclusivos) que separam os níveis de risco, em ordem crescente.
+LIMIARES_RISCO = np.array([2.0, 3.5])
+NIVEIS_RISCO = ("ALTO", "MÉDIO", "BAIXO")
+
+
+class Coeficientes(NamedTuple):
+    interceptacao: float
+    horas: float
+    projetos: float
+    disciplinas: float
+    versao: int = 0
+
+
+# Versão 0: os coeficientes do estudo.
+COEFICIENTES_PADRAO = Coeficientes(INTERCEPTACAO, COEF_HORAS, COEF_PROJETOS, COEF_DISCIPLINAS)
+
+
+def carregar_coeficientes(diretorio: Path | None = None) -> Coeficientes:
+    """Lê a versão atual do artefato; sem artefato válido, :data:`COEFICIENTES_PADRAO`."""
+
+    try:
+        carregado = carregar_versao(ARTEFATO_COEFICIENTES, diretorio)
+        if carregado is None:
+            return COEFICIENTES_PADRAO
+        valores, metadados = carregado
+        if valores.shape != (4,) or not np.isfinite(valores).all():
+            raise ValueError(f"coeficientes com formato inválido: {valores.shape}")
+        return Coeficientes(*map(float, valores), versao=int(metadados["versao"]))
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        print(f"⚠️ Artefato de coeficientes inválido, usando os do estudo: {e}")
+        return COEFICIENTES_PADRAO
+
 
-def calcular_impacto(horas_estudo: float, projetos: int, disciplinas: int) -> float:
-    """Calcula o impacto previsto conforme o modelo linear."""
+_coeficientes = VersaoAtual(ARTEFATO_COEFICIENTES, carregar_coeficientes)
 
+
+def coeficientes_atuais() -> Coeficientes:
+    """Coeficientes em uso pelo processo, carregados na primeira chamada."""
+
+    return _coeficientes.atual()
+
+
+def recarregar_coeficientes() -> int:
+    """Relê o artefato (ex.: após um novo treino) e retorna a versão carregada."""
+
+    versao = _coeficientes.recarregar().versao
+    limpar_memo()
+    return versao
+
+
+def recarregar_coeficientes_se_alterados() -> bool:
+    """Troca os coeficientes se um novo treino mudou o manifesto."""
+
+    alterados = _coeficientes.recarregar_se_alterado()
+    if alterados:
+        limpar_memo()
+    return alterados
+
+
+def calcular_impacto(
+    horas_estudo: float, projetos: int, disciplinas: int, coeficientes: Coeficientes | None = None
+) -> float:
+    """Calcula o impacto previsto conforme o modelo linear.
+
+    ``coeficientes`` fixa uma versão específica em vez da atual.
+    """
+
+    c = coeficientes or coeficientes_atuais()
     impacto = (
-        INTERCEPTACAO
-        + (COEF_HORAS * horas_estudo)
-        + (COEF_PROJETOS * projetos)
-        + (COEF_DISCIPLINAS * disciplinas)
+        c.interceptacao
+        + (c.horas * horas_estudo)
+        + (c.projetos * projetos)
+        + (c.disciplinas * disciplinas)
     )
 
     return round(impacto, 2)
@@ -28,3 +116,118 @@ def calcular_risco(impacto: float) -> str:
         return "MÉDIO"
     return "BAIXO"
 
+
+@lru_cache(maxsize=MEMO_MAX_ITENS)
+def _pontuar_memo(
+    horas_estudo: float, projetos: int, disciplinas: int, coeficientes: Coeficientes
+) -> tuple[float, str]:
+    impacto = calcular_impacto(horas_estudo, projetos, disciplinas, coeficientes)
+    return impacto, calcular_risco(impacto)
+
+
+def pontuar_cenario(horas_estudo: float, projetos: int, disciplinas: int) -> tuple[float, str]:
+    """``(impacto, risco)`` de um cenário, memorizado por entrada e versão do modelo.
+
+    As entradas de simulação se repetem muito (projetos e disciplinas
+    inteiros, horas arredondadas), então os cenários já vistos vêm de um LRU
+    de até ``SAA_SIMULAR_MEMO_ITENS`` entradas. A chave inclui os
+    coeficientes em uso (e sua versão): um resultado de outra versão nunca é
+    devolvido, e o LRU é esvaziado quando os coeficientes são trocados.
+    """
+
+    return _pontuar_memo(
+        float(horas_estudo), int(projetos), int(disciplinas), coeficientes_atuais()
+    )
+
+
+# Contadores de LRUs já esvaziados (cache_info recomeça do zero a cada limpeza).
+_memo_anterior = {"acertos": 0, "faltas": 0, "invalidacoes": 0}
+_memo_lock = threading.Lock()
+
+
+def limpar_memo() -> None:
+    """Esvazia o LRU de :func:`pontuar_cenario`, preservando os contadores."""
+
+    with _memo_lock:
+        info = _pontuar_memo.cache_info()
+        _pontuar_memo.cache_clear()
+        _memo_anterior["acertos"] += info.hits
+        _memo_anterior["faltas"] += info.misses
+        if info.currsize:
+            _memo_anterior["invalidacoes"] += 1
+
+
+def estatisticas_memo() -> dict:
+    """Acertos, faltas e ocupação do LRU de :func:`pontuar_cenario`."""
+
+    with _memo_lock:
+        info = _pontuar_memo.cache_info()
+        acertos = _memo_anterior["acertos"] + info.hits
+        faltas = _memo_anterior["faltas"] + info.misses
+        invalidacoes = _memo_anterior["invalidacoes"]
+    consultas = acertos + faltas
+    return {
+        "acertos": acertos,
+        "faltas": faltas,
+        "taxa_acertos": acertos / consultas if consultas else None,
+        "itens": info.currsize,
+        "max_itens": info.maxsize,
+        "invalidacoes": invalidacoes,
+        "versao_coeficientes": coeficientes_atuais().versao,
+    }
+
+
+def _arredondar_lote(valores: np.ndarray) -> np.ndarray:
+    """Arredonda para 2 casas reproduzindo exatamente o ``round`` do Python.
+
+    ``np.round`` multiplica por 100 antes de arredondar, o que pode mudar o
+    resultado quando o valor está a poucos ulps de um empate ``x.xx5``. Esses
+    casos (raros) são refeitos com ``round`` escalar.
+    """
+
+    arredondados = np.round(valores, 2)
+    escalados = valores * 100
+    ambiguos = np.abs(np.abs(escalados - np.trunc(escalados)) - 0.5) < 1e-6
+    if ambiguos.any():
+        arredondados[ambiguos] = [round(float(v), 2) for v in valores[ambiguos]]
+    return arredondados
+
+
+def calcular_impacto_lote(
+    horas_estudo, projetos, disciplinas, coeficientes: Coeficientes | None = None
+) -> np.ndarray:
+    """Versão vetorizada de :func:`calcular_impacto`.
+
+    Aceita escalares ou sequências do mesmo tamanho e devolve um array
+    ``float64`` com valores idênticos aos da função escalar. ``coeficientes``
+    fixa uma versão específica em vez da atual.
+    """
+
+    horas = np.asarray(horas_estudo, dtype=np.float64)
+    proj = np.asarray(projetos, dtype=np.float64)
+    disc = np.asarray(disciplinas, dtype=np.float64)
+
+    # Mesma ordem de operações da versão escalar, para resultados bit a bit iguais.
+    c = coeficientes or coeficientes_atuais()
+    impacto = (
+        c.interceptacao
+        + (c.horas * horas)
+        + (c.projetos * proj)
+        + (c.disciplinas * disc)
+    )
+
+    return _arredondar_lote(np.atleast_1d(impacto))
+
+
+def classificar_risco_lote(impactos) -> np.ndarray:
+    """Retorna o índice em :data:`NIVEIS_RISCO` de cada impacto."""
+
+    valores = np.asarray(impactos, dtype=np.float64)
+    return np.searchsorted(LIMIARES_RISCO, valores, side="right")
+
+
+def calcular_risco_lote(impactos) -> np.ndarray:
+    """Versão vetorizada de :func:`calcular_risco` (array de strings)."""
+
+    niveis = np.array(NIVEIS_RISCO, dtype=object)
+    return niveis[classificar_risco_lote(impactos)]
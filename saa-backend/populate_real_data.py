@@ -7,6 +7,11 @@ import sqlite3
 import sys
 from pathlib import Path
 
+from api.cache import invalidar_cache_compartilhado
+from database.estado_atual import reconstruir_estado_atual
+from database.migrate import aplicar_migracoes
+from models.clustering import identificar_perfil
+
 # Dados reais do Apêndice C
 DADOS_REAIS = [
     {"ordem": 25, "horas": 8, "projetos": 2, "impacto": 3, "disciplinas": 2},
@@ -62,35 +67,6 @@ def calcular_risco(impacto):
         return "BAIXO"
 
 
-def identificar_perfil(horas, projetos, disciplinas):
-    """
-    Identifica o perfil do estudante baseado nos clusters da pesquisa
-    Cluster 0 (Pouco Engajado): baixo estudo, baixa participação
-    Cluster 1 (Altamente Prático): alta participação em projetos
-    Cluster 2 (Estudioso Dedicado): muitas horas de estudo
-    """
-    import numpy as np
-    
-    # Centroides dos 3 perfis (do seu trabalho)
-    centroides = np.array([
-        [3, 0, 1],   # Pouco Engajado
-        [8, 6, 2],   # Altamente Prático
-        [20, 2, 3]   # Estudioso Dedicado
-    ])
-    
-    estudante = np.array([horas, projetos, disciplinas])
-    distancias = np.linalg.norm(centroides - estudante, axis=1)
-    cluster = np.argmin(distancias)
-    
-    perfis = {
-        0: "Pouco Engajado",
-        1: "Altamente Prático",
-        2: "Estudioso Dedicado"
-    }
-    
-    return perfis[cluster]
-
-
 def limpar_banco(conn):
     """Limpa todas as tabelas"""
     print("🗑️  Limpando dados antigos...")
@@ -207,14 +183,18 @@ def main():
     
     try:
         conn = sqlite3.connect(db_path)
+        aplicar_migracoes(conn)
         
         # Limpa dados antigos
         limpar_banco(conn)
         
         # Popula com dados reais
         popular_dados_reais(conn)
+        reconstruir_estado_atual(conn)
         
         conn.close()
+        if (removidos := invalidar_cache_compartilhado()) is not None:
+            print(f"🧹 {removidos} relatórios removidos do cache compartilhado")
         
         print("\n" + "="*60)
         print("✅ BANCO DE DADOS POPULADO COM SUCESSO!")
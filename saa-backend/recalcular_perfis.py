@@ -0,0 +1,101 @@
+"""Recalcula o perfil (cluster) de todos os estudantes a partir do último registro.
+
+Uso:
+    python recalcular_perfis.py [--lote 50000] [--db data/saa.db]
+
+Os estudantes são percorridos em lotes por faixa de ``id``; cada lote é
+classificado de uma vez com ``identificar_perfis_lote`` e gravado com
+``executemany`` em uma transação própria. Apenas linhas cujo perfil mudou
+são reescritas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+
+from database.db import get_connection
+from models.clustering import identificar_perfis_lote
+
+SQL_FAIXA_IDS = """
+    SELECT MAX(id) FROM (
+        SELECT id FROM estudantes WHERE id > ? ORDER BY id LIMIT ?
+    )
+"""
+
+SQL_ULTIMOS_REGISTROS_FAIXA = """
+    SELECT estudante_id,
+           COALESCE(horas_estudo, 0),
+           COALESCE(participacao_projetos, 0),
+           COALESCE(disciplinas_praticas, 0)
+    FROM (
+        SELECT estudante_id, horas_estudo, participacao_projetos, disciplinas_praticas,
+               ROW_NUMBER() OVER (
+                   PARTITION BY estudante_id
+                   ORDER BY data_registro DESC, id DESC
+               ) AS ordem
+        FROM dados_academicos
+        WHERE estudante_id > ? AND estudante_id <= ?
+    )
+    WHERE ordem = 1
+"""
+
+
+def recalcular_perfis(conn: sqlite3.Connection, tamanho_lote: int = 50_000) -> tuple[int, int]:
+    """Atualiza ``estudantes.perfil`` para toda a tabela.
+
+    Retorna ``(estudantes_classificados, perfis_alterados)``.
+    """
+
+    classificados = 0
+    alterados = 0
+    ultimo_id = 0
+
+    while True:
+        limite = conn.execute(SQL_FAIXA_IDS, (ultimo_id, tamanho_lote)).fetchone()[0]
+        if limite is None:
+            break
+
+        cursor = conn.execute(SQL_ULTIMOS_REGISTROS_FAIXA, (ultimo_id, limite))
+        valores = np.fromiter(chain.from_iterable(cursor), dtype=np.float64).reshape(-1, 4)
+
+        if len(valores):
+            ids = valores[:, 0].astype(np.int64)
+            perfis = identificar_perfis_lote(valores[:, 1:])
+            with conn:
+                cursor = conn.executemany(
+                    "UPDATE estudantes SET perfil = ? WHERE id = ? AND perfil IS NOT ?",
+                    zip(perfis, ids.tolist(), perfis),
+                )
+            classificados += len(ids)
+            alterados += cursor.rowcount
+
+        ultimo_id = limite
+
+    return classificados, alterados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recalcula os perfis de todos os estudantes.")
+    parser.add_argument("--lote", type=int, default=50_000, help="estudantes por transação")
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    inicio = time.perf_counter()
+    classificados, alterados = recalcular_perfis(conn, args.lote)
+    duracao = time.perf_counter() - inicio
+    conn.close()
+
+    taxa = classificados / duracao if duracao else 0
+    print(f"✅ {classificados} estudantes classificados, {alterados} perfis alterados")
+    print(f"   {duracao:.2f}s ({taxa:,.0f} estudantes/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Reconstrói os agregados da turma (``agregados_turma``) a partir do histórico.
+
+Uso:
+    python reconstruir_agregados.py [--db data/saa.db]
+
+Os agregados são mantidos por triggers; este comando serve para conferir e
+corrigir eventuais divergências (por exemplo, após edições manuais no banco).
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from pathlib import Path
+
+from database.agregados import estatisticas_turma, reconstruir_agregados
+from database.db import get_connection
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconstrói os agregados da turma.")
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    antes = estatisticas_turma(conn)
+
+    inicio = time.perf_counter()
+    reconstruir_agregados(conn)
+    duracao = time.perf_counter() - inicio
+
+    depois = estatisticas_turma(conn)
+    conn.close()
+
+    print(f"✅ Agregados reconstruídos em {duracao:.2f}s")
+    for metrica, valores in depois.items():
+        anterior = antes.get(metrica, {})
+        media = valores["media"]
+        media_anterior = anterior.get("media")
+        mudou = anterior.get("contagem") != valores["contagem"] or (
+            (media is None) != (media_anterior is None)
+            or (media is not None and not math.isclose(media, media_anterior, rel_tol=1e-9))
+        )
+        ajuste = "  (corrigido)" if mudou else ""
+        media_str = f"{media:.4f}" if media is not None else "-"
+        print(f"   • {metrica}: n={valores['contagem']} média={media_str}{ajuste}")
+
+
+if __name__ == "__main__":
+    main()
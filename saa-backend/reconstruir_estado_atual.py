@@ -0,0 +1,41 @@
+"""Reconstrói o estado atual (último registro, impacto, risco e perfil) de todos os estudantes.
+
+Uso:
+    python reconstruir_estado_atual.py [--lote 50000] [--db data/saa.db]
+
+Use após cargas ou alterações feitas diretamente no banco, fora da API.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from api.cache import invalidar_cache_compartilhado
+from database.db import get_connection
+from database.estado_atual import reconstruir_estado_atual
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconstrói estado_atual_estudantes.")
+    parser.add_argument("--lote", type=int, default=50_000, help="estudantes por transação")
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+
+    inicio = time.perf_counter()
+    gravados = reconstruir_estado_atual(conn, args.lote)
+    duracao = time.perf_counter() - inicio
+    conn.close()
+
+    taxa = gravados / duracao if duracao else 0
+    print(f"✅ Estado atual de {gravados} estudantes reconstruído")
+    print(f"   {duracao:.2f}s ({taxa:,.0f} estudantes/s)")
+    if (removidos := invalidar_cache_compartilhado()) is not None:
+        print(f"   {removidos} relatórios removidos do cache compartilhado")
+
+
+if __name__ == "__main__":
+    main()
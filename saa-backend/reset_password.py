@@ -6,12 +6,14 @@ Uso:
 Exemplo:
     python reset_password.py 2024001 123456
 
-O script usa bcrypt para gerar o hash no mesmo formato que a API espera.
+O script usa bcrypt para gerar o hash no mesmo formato (e custo, definido por
+SAA_BCRYPT_ROUNDS) que a API espera.
 """
 from pathlib import Path
 import sys
 import sqlite3
-import bcrypt
+
+from api.senhas import hash_password
 
 
 def usage_and_exit():
@@ -34,7 +36,7 @@ def main():
         sys.exit(1)
 
     # Gerar hash com bcrypt
-    senha_hash = bcrypt.hashpw(nova_senha.encode(), bcrypt.gensalt()).decode()
+    senha_hash = hash_password(nova_senha)
 
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -0,0 +1,29 @@
+"""Fixtures compartilhadas: banco sintético migrado e o app Flask sobre ele."""
+
+import pytest
+
+from app import create_app
+from benchmarks.dados import criar_banco
+from database import get_pool
+from database.simulacoes import get_fila_simulacoes
+
+N_ESTUDANTES = 50
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    return criar_banco(tmp_path_factory.mktemp("banco") / "saa.db", N_ESTUDANTES)
+
+
+@pytest.fixture(scope="module")
+def app(db_path):
+    app = create_app(db_path)
+    yield app
+    # Grava as simulações pendentes antes de o diretório temporário sumir.
+    get_fila_simulacoes(db_path).parar()
+    get_pool(db_path).close_all()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
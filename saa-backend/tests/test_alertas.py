@@ -0,0 +1,121 @@
+"""Rotas de alertas: listagem paginada, contagem de não lidos e leitura em lote."""
+
+import sqlite3
+
+import pytest
+
+MATRICULA = "ALERTA01"
+OUTRA = "ALERTA02"
+
+# (tipo, lido, created_at), do mais antigo para o mais recente.
+ALERTAS = [
+    ("RISCO_ALTO", 1, "2024-03-01 10:00:00"),
+    ("RISCO_ALTO", 0, "2024-03-02 10:00:00"),
+    ("QUEDA", 0, "2024-03-03 10:00:00"),
+    ("RISCO_ALTO", 1, "2024-03-04 10:00:00"),
+    ("RISCO_ALTO", 0, "2024-03-05 10:00:00"),
+]
+
+
+@pytest.fixture
+def ids(db_path):
+    """Recria os alertas dos dois estudantes a cada teste (as rotas POST os alteram)."""
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        estudantes = []
+        for matricula in (MATRICULA, OUTRA):
+            conn.execute(
+                "INSERT OR IGNORE INTO estudantes (matricula, nome, email, senha_hash) "
+                "VALUES (?, ?, ?, ?)",
+                (matricula, matricula, f"{matricula}@x", "hash_padrao"),
+            )
+            estudantes.append(
+                conn.execute("SELECT id FROM estudantes WHERE matricula = ?", (matricula,)).fetchone()[0]
+            )
+        conn.execute("DELETE FROM alertas WHERE estudante_id IN (?, ?)", estudantes)
+        ids = [
+            conn.execute(
+                "INSERT INTO alertas (estudante_id, tipo, mensagem, lido, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (estudantes[0], tipo, f"alerta {i}", lido, criado_em),
+            ).lastrowid
+            for i, (tipo, lido, criado_em) in enumerate(ALERTAS)
+        ]
+        outro = conn.execute(
+            "INSERT INTO alertas (estudante_id, tipo, mensagem, lido) VALUES (?, 'RISCO_ALTO', 'x', 0)",
+            (estudantes[1],),
+        ).lastrowid
+    conn.close()
+    return {"proprios": ids, "outro": outro}
+
+
+def _url(sufixo="", matricula=MATRICULA):
+    return f"/api/estudantes/{matricula}/alertas{sufixo}"
+
+
+def test_lista_paginada_do_mais_recente(cliente, ids):
+    vistos, cursor = [], None
+    for _ in range(len(ALERTAS)):
+        query = f"?limite=2&cursor={cursor}" if cursor else "?limite=2"
+        corpo = cliente.get(_url(query)).get_json()
+        vistos += [alerta["id"] for alerta in corpo["alertas"]]
+        cursor = corpo["proximo_cursor"]
+        if cursor is None:
+            break
+
+    assert vistos == ids["proprios"][::-1]
+
+
+def test_filtro_nao_lidos(cliente, ids):
+    alertas = cliente.get(_url("?nao_lidos=1")).get_json()["alertas"]
+
+    assert [a["id"] for a in alertas] == [ids["proprios"][i] for i in (4, 2, 1)]
+    assert not any(a["lido"] for a in alertas)
+
+
+def test_contagem_nao_lidos(cliente, ids):
+    resposta = cliente.get(_url("/nao-lidos"))
+
+    assert resposta.status_code == 200
+    assert resposta.get_json() == {"nao_lidos": 3, "por_tipo": {"RISCO_ALTO": 2, "QUEDA": 1}}
+
+
+def test_marca_so_os_ids_abertos_do_proprio_estudante(cliente, ids):
+    proprios = ids["proprios"]
+    # Um aberto, um já lido e um de outro estudante: só o primeiro conta.
+    resposta = cliente.post(_url("/lidos"), json={"ids": [proprios[1], proprios[0], ids["outro"]]})
+
+    assert resposta.status_code == 200
+    assert resposta.get_json() == {"sucesso": True, "marcados": 1, "nao_lidos": 2}
+    assert cliente.get(_url("/nao-lidos", OUTRA)).get_json()["nao_lidos"] == 1
+
+
+def test_sem_ids_marca_todos(cliente, ids):
+    resposta = cliente.post(_url("/lidos"), json={})
+
+    assert resposta.get_json() == {"sucesso": True, "marcados": 3, "nao_lidos": 0}
+    assert cliente.get(_url("?nao_lidos=1")).get_json()["alertas"] == []
+
+
+@pytest.mark.parametrize(
+    "metodo, sufixo, corpo",
+    [
+        ("GET", "?limite=0", None),
+        ("GET", "?limite=x", None),
+        ("GET", "?cursor=invalido", None),
+        ("POST", "/lidos", {"ids": "1,2"}),
+        ("POST", "/lidos", {"ids": [1, True]}),
+    ],
+)
+def test_parametros_invalidos(cliente, ids, metodo, sufixo, corpo):
+    resposta = cliente.open(_url(sufixo), method=metodo, json=corpo)
+
+    assert resposta.status_code == 400
+
+
+@pytest.mark.parametrize("metodo, sufixo", [("GET", ""), ("GET", "/nao-lidos"), ("POST", "/lidos")])
+def test_estudante_inexistente(cliente, metodo, sufixo):
+    resposta = cliente.open(_url(sufixo, "NAOEXISTE"), method=metodo, json={})
+
+    assert resposta.status_code == 404
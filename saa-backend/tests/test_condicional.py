@@ -0,0 +1,58 @@
+"""ETags e respostas 304 do dashboard, do histórico e do resumo."""
+
+import pytest
+
+from benchmarks.dados import matricula_sintetica
+
+MATRICULA = matricula_sintetica(1)
+
+ROTAS_ESTUDANTE = [
+    f"/api/estudantes/{MATRICULA}/dashboard",
+    f"/api/estudantes/{MATRICULA}/historico?agrupar=mes",
+]
+
+
+@pytest.mark.parametrize("rota", [*ROTAS_ESTUDANTE, "/api/relatorios/resumo"])
+def test_mesmo_etag_responde_304(cliente, rota):
+    primeira = cliente.get(rota)
+    etag = primeira.headers["ETag"]
+
+    repetida = cliente.get(rota, headers={"If-None-Match": etag})
+
+    assert primeira.status_code == 200
+    assert repetida.status_code == 304
+    assert repetida.headers["ETag"] == etag
+    assert repetida.get_data() == b""
+
+
+@pytest.mark.parametrize("query", ["?agrupar=ano", "?limite=0", "?inicio=2024-13-01"])
+def test_historico_valida_parametros_antes_do_304(cliente, query):
+    rota = f"/api/estudantes/{MATRICULA}/historico"
+    etag = cliente.get(rota).headers["ETag"]
+
+    resposta = cliente.get(rota + query, headers={"If-None-Match": etag})
+
+    assert resposta.status_code == 400
+
+
+def test_escrita_muda_o_etag(cliente):
+    etags = {rota: cliente.get(rota).headers["ETag"] for rota in ROTAS_ESTUDANTE}
+    etag_resumo = cliente.get("/api/relatorios/resumo").headers["ETag"]
+
+    resposta = cliente.post(
+        f"/api/estudantes/{MATRICULA}/atualizar",
+        json={
+            "horas_estudo": 0,
+            "participacao_projetos": 0,
+            "disciplinas_praticas": 0,
+            "impacto_percebido": 1.0,
+        },
+    )
+    assert resposta.status_code == 200
+
+    for rota, etag in etags.items():
+        nova = cliente.get(rota, headers={"If-None-Match": etag})
+        assert nova.status_code == 200, rota
+        assert nova.headers["ETag"] != etag, rota
+    resumo = cliente.get("/api/relatorios/resumo", headers={"If-None-Match": etag_resumo})
+    assert resumo.status_code == 200
@@ -0,0 +1,99 @@
+"""Série histórica do estudante: registros brutos, agrupamentos e validação."""
+
+import sqlite3
+
+import pytest
+
+MATRICULA = "HIST0001"
+
+# (data, horas, projetos, disciplinas, impacto): duas semanas de janeiro e
+# uma de fevereiro; 2024-01-01 e 2024-02-05 são segundas-feiras.
+REGISTROS = [
+    ("2024-01-01", 10.0, 1, 1, 2.0),
+    ("2024-01-03", 20.0, 3, 2, 4.0),
+    ("2024-01-10", 5.0, 0, 1, 1.0),
+    ("2024-02-05", 8.0, 2, 2, 3.0),
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def estudante(db_path):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        estudante_id = conn.execute(
+            "INSERT INTO estudantes (matricula, nome, email, senha_hash) VALUES (?, ?, ?, ?)",
+            (MATRICULA, "Histórico", "hist@x", "hash_padrao"),
+        ).lastrowid
+        conn.executemany(
+            """
+            INSERT INTO dados_academicos
+            (estudante_id, data_registro, horas_estudo, participacao_projetos,
+             disciplinas_praticas, impacto_percebido)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [(estudante_id, *registro) for registro in REGISTROS],
+        )
+    conn.close()
+
+
+def _historico(cliente, query=""):
+    return cliente.get(f"/api/estudantes/{MATRICULA}/historico{query}")
+
+
+def test_registros_brutos_em_ordem_cronologica(cliente):
+    resposta = _historico(cliente)
+
+    assert resposta.status_code == 200
+    corpo = resposta.get_json()
+    assert corpo["agrupar"] is None
+    assert [p["data"] for p in corpo["pontos"]] == [r[0] for r in REGISTROS]
+    assert corpo["pontos"][1]["horas_estudo"] == 20.0
+
+
+def test_limite_devolve_os_mais_recentes(cliente):
+    pontos = _historico(cliente, "?limite=2").get_json()["pontos"]
+
+    assert [p["data"] for p in pontos] == ["2024-01-10", "2024-02-05"]
+
+
+def test_intervalo_de_datas(cliente):
+    pontos = _historico(cliente, "?inicio=2024-01-02&fim=2024-01-31").get_json()["pontos"]
+
+    assert [p["data"] for p in pontos] == ["2024-01-03", "2024-01-10"]
+
+
+def test_agrupa_por_semana(cliente):
+    pontos = _historico(cliente, "?agrupar=semana").get_json()["pontos"]
+
+    assert [(p["periodo"], p["registros"]) for p in pontos] == [
+        ("2024-01-01", 2),
+        ("2024-01-08", 1),
+        ("2024-02-05", 1),
+    ]
+    assert pontos[0]["horas_estudo"] == {"min": 10.0, "media": 15.0, "max": 20.0}
+
+
+def test_agrupa_por_mes(cliente):
+    pontos = _historico(cliente, "?agrupar=mes").get_json()["pontos"]
+
+    assert [(p["periodo"], p["registros"]) for p in pontos] == [
+        ("2024-01-01", 3),
+        ("2024-02-01", 1),
+    ]
+    assert pontos[0]["horas_estudo"] == {"min": 5.0, "media": 11.67, "max": 20.0}
+    assert pontos[0]["participacao_projetos"] == {"min": 0, "media": 1.33, "max": 3}
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["?agrupar=ano", "?limite=0", "?limite=x", "?inicio=2024-13-01", "?fim=ontem"],
+)
+def test_parametros_invalidos(cliente, query):
+    resposta = _historico(cliente, query)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+def test_estudante_inexistente(cliente):
+    assert cliente.get("/api/estudantes/NAOEXISTE/historico").status_code == 404
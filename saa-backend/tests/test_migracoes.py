@@ -0,0 +1,28 @@
+"""As consultas críticas devem usar os índices criados pelas migrações."""
+
+import sqlite3
+
+import pytest
+
+from database.migrate import CONSULTAS_INDEXADAS, aplicar_migracoes, explicar_consultas, listar_migracoes
+
+
+@pytest.fixture(scope="module")
+def planos(tmp_path_factory):
+    conn = sqlite3.connect(tmp_path_factory.mktemp("migracoes") / "saa.db")
+    aplicadas = aplicar_migracoes(conn)
+    assert aplicadas == [numero for numero, _caminho in listar_migracoes()]
+    yield explicar_consultas(conn)
+    conn.close()
+
+
+@pytest.mark.parametrize("indice", list(CONSULTAS_INDEXADAS))
+def test_consulta_usa_indice(planos, indice):
+    plano = planos[indice]
+
+    assert any(
+        f"USING INDEX {indice} " in linha or f"USING COVERING INDEX {indice} " in linha
+        for linha in plano
+    ), plano
+    assert not any(linha.startswith("SCAN") for linha in plano), plano
+    assert not any("TEMP B-TREE" in linha for linha in plano), plano
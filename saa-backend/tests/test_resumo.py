@@ -0,0 +1,53 @@
+"""O resumo por GROUP BY deve bater com o antigo laço por estudante."""
+
+import sqlite3
+
+import pytest
+
+from api.reports import calcular_resumo
+from benchmarks.bench_resumo import resumo_legado
+from benchmarks.dados import criar_banco
+from database.estado_atual import reconstruir_estado_atual
+
+N_ESTUDANTES = 300
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db_path = criar_banco(tmp_path / "resumo.db", N_ESTUDANTES, registros_por_estudante=3)
+    conn = sqlite3.connect(db_path)
+
+    # Estudantes sem nenhum registro acadêmico: contam no total, em nenhum risco.
+    conn.executemany(
+        "INSERT INTO estudantes (matricula, nome, email, senha_hash) VALUES (?, ?, ?, ?)",
+        [(f"SEM{i:04d}", f"Sem dados {i}", f"sem{i}@x", "hash_padrao") for i in range(5)],
+    )
+    # Empates na última data: um segundo registro no mesmo dia, com risco
+    # diferente do primeiro (0 horas -> ALTO, 30 horas e 4 disciplinas -> BAIXO).
+    for estudante_id in range(1, 41):
+        ultima = conn.execute(
+            "SELECT MAX(data_registro) FROM dados_academicos WHERE estudante_id = ?",
+            (estudante_id,),
+        ).fetchone()[0]
+        horas, disciplinas = (30.0, 4) if estudante_id % 2 else (0.0, 0)
+        conn.execute(
+            """
+            INSERT INTO dados_academicos
+            (estudante_id, horas_estudo, participacao_projetos, disciplinas_praticas,
+             impacto_percebido, data_registro)
+            VALUES (?, ?, 0, ?, 3.0, ?)
+            """,
+            (estudante_id, horas, disciplinas, ultima),
+        )
+    conn.commit()
+    reconstruir_estado_atual(conn)
+    yield conn
+    conn.close()
+
+
+def test_resumo_igual_ao_laco_legado(conn):
+    resumo = calcular_resumo(conn)
+
+    assert resumo == resumo_legado(conn)
+    assert resumo["total_estudantes"] == N_ESTUDANTES + 5
+    assert resumo["risco_alto"] + resumo["risco_medio"] + resumo["risco_baixo"] == N_ESTUDANTES
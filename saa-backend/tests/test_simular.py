@@ -0,0 +1,132 @@
+"""Simulação de cenários: /api/simular e o lote vetorizado de /api/simular/lote."""
+
+import sqlite3
+
+import pytest
+
+import app as app_module
+from database.simulacoes import FilaSimulacoes
+from models.regression import pontuar_cenario
+
+HORAS = [0.0, 5.5, 12.0, 30.0]
+PROJETOS = [0, 1, 3, 5]
+DISCIPLINAS = [0, 2, 1, 4]
+
+
+def test_lote_por_colunas_igual_ao_cenario_individual(cliente):
+    resposta = cliente.post(
+        "/api/simular/lote",
+        json={"horas_estudo": HORAS, "projetos": PROJETOS, "disciplinas": DISCIPLINAS},
+    )
+
+    assert resposta.status_code == 200
+    corpo = resposta.get_json()
+    esperado = [pontuar_cenario(*cenario) for cenario in zip(HORAS, PROJETOS, DISCIPLINAS)]
+    assert corpo["total"] == len(HORAS)
+    assert corpo["impacto_previsto"] == pytest.approx([impacto for impacto, _ in esperado])
+    assert corpo["risco"] == [risco for _, risco in esperado]
+
+
+def test_lote_por_cenarios_igual_ao_por_colunas(cliente):
+    colunas = cliente.post(
+        "/api/simular/lote",
+        json={"horas_estudo": HORAS, "projetos": PROJETOS, "disciplinas": DISCIPLINAS},
+    ).get_json()
+    cenarios = cliente.post(
+        "/api/simular/lote",
+        json={
+            "cenarios": [
+                {"horas_estudo": h, "projetos": p, "disciplinas": d}
+                for h, p, d in zip(HORAS, PROJETOS, DISCIPLINAS)
+            ]
+        },
+    ).get_json()
+
+    assert cenarios == colunas
+
+
+def test_lote_campos_ausentes_valem_zero(cliente):
+    corpo = cliente.post("/api/simular/lote", json={"cenarios": [{}, {"horas_estudo": 10}]}).get_json()
+    impacto, risco = pontuar_cenario(0.0, 0, 0)
+
+    assert corpo["total"] == 2
+    assert corpo["impacto_previsto"][0] == pytest.approx(impacto)
+    assert corpo["risco"][0] == risco
+
+
+@pytest.mark.parametrize(
+    "corpo",
+    [
+        {},
+        {"cenarios": {"horas_estudo": 1}},
+        {"cenarios": [{"horas_estudo": 1}, 2]},
+        {"cenarios": [{"horas_estudo": None}]},
+        {"horas_estudo": 1},
+        {"horas_estudo": [1, 2], "projetos": [1]},
+        {"horas_estudo": [1, None]},
+        {"horas_estudo": ["abc"]},
+        {"horas_estudo": [[1, 2]]},
+    ],
+)
+def test_lote_corpo_invalido(cliente, corpo):
+    resposta = cliente.post("/api/simular/lote", json=corpo)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+@pytest.mark.parametrize("valor", ["NaN", "Infinity", "-Infinity"])
+def test_lote_rejeita_valores_nao_finitos(cliente, valor):
+    # json.dumps não gera esses literais; o corpo vai cru, como um cliente o enviaria.
+    resposta = cliente.post(
+        "/api/simular/lote",
+        data=f'{{"horas_estudo": [1, {valor}]}}',
+        content_type="application/json",
+    )
+
+    assert resposta.status_code == 400
+
+
+def test_lote_acima_do_limite(cliente, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_CENARIOS_LOTE", 2)
+
+    resposta = cliente.post("/api/simular/lote", json={"horas_estudo": [1, 2, 3]})
+
+    assert resposta.status_code == 400
+    assert "2" in resposta.get_json()["erro"]
+
+
+@pytest.mark.parametrize("matricula", [{"x": 1}, ["S00000001"], 123])
+def test_simular_rejeita_matricula_que_nao_e_texto(cliente, matricula):
+    resposta = cliente.post("/api/simular", json={"matricula": matricula, "horas_estudo": 5})
+
+    assert resposta.status_code == 400
+
+
+@pytest.mark.parametrize("matricula", ["S00000001", "NAOEXISTE", None])
+def test_simular_aceita_matricula_texto_ou_ausente(cliente, matricula):
+    resposta = cliente.post("/api/simular", json={"matricula": matricula, "horas_estudo": 5})
+
+    assert resposta.status_code == 200
+
+
+def test_registro_invalido_nao_derruba_o_lote(db_path):
+    # Horas fora do comum identificam as linhas deste teste: a fila do app
+    # grava no mesmo banco em segundo plano.
+    fila = FilaSimulacoes(db_path, tamanho_lote=10, intervalo=60)
+
+    fila.registrar("S00000001", 901.0, 1, 1, 2.5, "Baixo")
+    # Um dict não tem conversão para o SQLite: só este registro deve falhar.
+    fila.registrar({"x": 1}, 902.0, 1, 1, 2.5, "Baixo")
+    fila.registrar(None, 903.0, 2, 1, 3.0, "Baixo")
+    fila.parar()
+
+    estatisticas = fila.estatisticas()
+    assert (estatisticas["gravados"], estatisticas["falhas"], estatisticas["lotes"]) == (2, 1, 1)
+    conn = sqlite3.connect(db_path)
+    gravadas = conn.execute(
+        "SELECT horas_simuladas, estudante_id IS NOT NULL FROM simulacoes "
+        "WHERE horas_simuladas > 900 ORDER BY horas_simuladas"
+    ).fetchall()
+    conn.close()
+    assert gravadas == [(901.0, 1), (903.0, 0)]
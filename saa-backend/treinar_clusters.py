@@ -0,0 +1,143 @@
+"""Treina os centroides dos perfis a partir dos dados gravados.
+
+Uso:
+    python treinar_clusters.py [--fonte historico|atual] [--lote 100000] [--epocas 1]
+        [--seed 42] [--db data/saa.db] [--recalcular]
+
+Os registros são lidos em streaming, em lotes de ``--lote`` linhas, e cada
+lote alimenta ``MiniBatchKMeans.partial_fit``; a memória usada não depende
+do tamanho da tabela. O treino parte de ``DEFAULT_CENTROIDES`` e os
+centroides obtidos são reordenados para corresponder aos nomes em
+``PERFIS``. O resultado é gravado como uma nova versão do artefato em
+``data/modelos`` (ou ``SAA_MODELOS_DIR``).
+
+Fontes (ver :mod:`database.treino`):
+    historico  todos os registros de ``dados_academicos`` (padrão)
+    atual      apenas o último registro de cada estudante (``estado_atual_estudantes``)
+
+A API passa a usar a nova versão na requisição seguinte e recalcula em
+segundo plano os perfis de ``estado_atual_estudantes``; os perfis gravados
+em ``estudantes`` só mudam com ``--recalcular`` (ou rodando
+``recalcular_perfis.py``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from datetime import datetime
+from itertools import permutations
+from pathlib import Path
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from database.db import get_connection
+from database.estado_atual import reconstruir_estado_atual
+from database.treino import FONTES, ler_metricas
+from models.clustering import (
+    DEFAULT_CENTROIDES,
+    PERFIS,
+    recarregar_centroides,
+    salvar_centroides,
+)
+from recalcular_perfis import recalcular_perfis
+
+def alinhar_aos_perfis(centroides: np.ndarray) -> np.ndarray:
+    """Reordena os centroides para que a linha i corresponda a ``PERFIS[i]``.
+
+    Escolhe a permutação de menor distância total até ``DEFAULT_CENTROIDES``.
+    """
+
+    melhor = min(
+        permutations(range(len(centroides))),
+        key=lambda ordem: np.linalg.norm(centroides[list(ordem)] - DEFAULT_CENTROIDES, axis=1).sum(),
+    )
+    return centroides[list(melhor)]
+
+
+def treinar_centroides(
+    conn: sqlite3.Connection,
+    fonte: str = "historico",
+    tamanho_lote: int = 100_000,
+    epocas: int = 1,
+    seed: int = 42,
+) -> tuple[np.ndarray, int]:
+    """Ajusta o MiniBatchKMeans em streaming. Retorna ``(centroides, amostras)``."""
+
+    modelo = MiniBatchKMeans(
+        n_clusters=len(DEFAULT_CENTROIDES),
+        init=DEFAULT_CENTROIDES.astype(np.float64),
+        n_init=1,
+        batch_size=tamanho_lote,
+        random_state=seed,
+    )
+    amostras = 0
+    for _ in range(epocas):
+        amostras = 0
+        for lote in ler_metricas(conn, fonte, tamanho_lote):
+            # partial_fit exige ao menos n_clusters amostras no lote.
+            if len(lote) < modelo.n_clusters:
+                continue
+            modelo.partial_fit(lote)
+            amostras += len(lote)
+
+    if amostras == 0:
+        raise ValueError(f"Nenhum registro em {FONTES[fonte]} para treinar")
+    return alinhar_aos_perfis(modelo.cluster_centers_), amostras
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Treina os centroides dos perfis.")
+    parser.add_argument("--fonte", choices=list(FONTES), default="historico")
+    parser.add_argument("--lote", type=int, default=100_000, help="linhas por partial_fit")
+    parser.add_argument("--epocas", type=int, default=1, help="passadas sobre os dados")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    parser.add_argument(
+        "--recalcular", action="store_true", help="reclassifica os estudantes com a nova versão"
+    )
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    print(f"🔧 Treinando centroides ({args.fonte}, lotes de {args.lote}, {args.epocas} época(s))...")
+    inicio = time.perf_counter()
+    try:
+        centroides, amostras = treinar_centroides(
+            conn, args.fonte, args.lote, args.epocas, args.seed
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        conn.close()
+        raise SystemExit(1)
+    duracao = time.perf_counter() - inicio
+
+    versao = salvar_centroides(
+        centroides,
+        {
+            "treinado_em": datetime.now().isoformat(timespec="seconds"),
+            "fonte": args.fonte,
+            "amostras": amostras,
+            "epocas": args.epocas,
+            "lote": args.lote,
+            "seed": args.seed,
+            "centroides": centroides.round(4).tolist(),
+        },
+    )
+    print(f"✅ Versão {versao} gravada ({amostras} amostras em {duracao:.1f}s)")
+    for nome, anterior, novo in zip(PERFIS.values(), DEFAULT_CENTROIDES, centroides):
+        print(f"   • {nome}: {anterior.tolist()} → {np.round(novo, 2).tolist()}")
+
+    if args.recalcular:
+        recarregar_centroides()
+        classificados, alterados = recalcular_perfis(conn)
+        reconstruir_estado_atual(conn)
+        print(f"✅ {classificados} estudantes reclassificados, {alterados} perfis alterados")
+    else:
+        print("   Rode recalcular_perfis.py para reclassificar os perfis cadastrados.")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
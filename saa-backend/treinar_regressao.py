@@ -0,0 +1,135 @@
+"""Reajusta os coeficientes da regressão do impacto aos dados gravados.
+
+Uso:
+    python treinar_regressao.py [--fonte historico|atual] [--lote 100000]
+        [--db data/saa.db] [--recalcular]
+
+Mínimos quadrados em streaming: os registros com ``impacto_percebido`` são
+lidos em lotes e cada lote soma sua parte em X^T X (4x4), X^T y, Σy e Σy²,
+com X = [1, horas, projetos, disciplinas]. A solução, o R² e o RMSE saem
+desses acumuladores, em uma única passada e com memória constante. Para
+comparação, o mesmo erro é calculado para os coeficientes do estudo.
+
+Os coeficientes são gravados como uma nova versão do artefato
+``coeficientes`` e a API passa a usá-los na requisição seguinte; ao
+perceber a nova versão, ela também recalcula em segundo plano o impacto e o
+risco gravados em ``estado_atual_estudantes``. ``--recalcular`` faz esse
+recálculo aqui mesmo, antes de a API perceber (útil com a API parada).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from database.db import get_connection
+from database.estado_atual import reconstruir_estado_atual
+from database.treino import FONTES, ler_amostras
+from models.artefatos import gravar_versao
+from models.regression import (
+    ARTEFATO_COEFICIENTES,
+    COEFICIENTES_PADRAO,
+    recarregar_coeficientes,
+)
+
+
+class Acumulador:
+    """Estatísticas suficientes de mínimos quadrados, somadas lote a lote."""
+
+    def __init__(self) -> None:
+        self.xtx = np.zeros((4, 4))
+        self.xty = np.zeros(4)
+        self.soma_y = 0.0
+        self.soma_y2 = 0.0
+        self.n = 0
+
+    def adicionar(self, metricas: np.ndarray, y: np.ndarray) -> None:
+        x = np.column_stack((np.ones(len(metricas)), metricas))
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.soma_y += float(y.sum())
+        self.soma_y2 += float(y @ y)
+        self.n += len(y)
+
+    def resolver(self) -> np.ndarray:
+        if np.linalg.matrix_rank(self.xtx) < 4:
+            raise ValueError("Dados insuficientes: as métricas não variam o bastante para o ajuste")
+        return np.linalg.solve(self.xtx, self.xty)
+
+    def erro(self, beta: np.ndarray) -> dict:
+        """R² e RMSE de ``beta`` sobre os dados acumulados."""
+
+        sse = self.soma_y2 - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        sst = self.soma_y2 - self.soma_y**2 / self.n
+        return {
+            "r2": float(1 - sse / sst) if sst > 0 else 0.0,
+            "rmse": float(np.sqrt(max(sse, 0.0) / self.n)),
+        }
+
+
+def acumular(conn: sqlite3.Connection, fonte: str, tamanho_lote: int) -> Acumulador:
+    acumulador = Acumulador()
+    for lote in ler_amostras(conn, fonte, tamanho_lote):
+        acumulador.adicionar(lote[:, :3], lote[:, 3])
+    return acumulador
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reajusta os coeficientes da regressão.")
+    parser.add_argument("--fonte", choices=list(FONTES), default="historico")
+    parser.add_argument("--lote", type=int, default=100_000, help="linhas por lote")
+    parser.add_argument("--db", type=Path, default=None, help="caminho do banco SQLite")
+    parser.add_argument(
+        "--recalcular", action="store_true", help="reconstrói o estado atual com a nova versão"
+    )
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    print(f"🔧 Ajustando a regressão ({args.fonte}, lotes de {args.lote})...")
+    inicio = time.perf_counter()
+    acumulador = acumular(conn, args.fonte, args.lote)
+    try:
+        beta = acumulador.resolver()
+    except ValueError as e:
+        print(f"❌ {e}")
+        conn.close()
+        raise SystemExit(1)
+    duracao = time.perf_counter() - inicio
+
+    erro = acumulador.erro(beta)
+    erro_estudo = acumulador.erro(np.array(COEFICIENTES_PADRAO[:4]))
+    versao = gravar_versao(
+        ARTEFATO_COEFICIENTES,
+        beta,
+        {
+            "treinado_em": datetime.now().isoformat(timespec="seconds"),
+            "fonte": args.fonte,
+            "amostras": acumulador.n,
+            "coeficientes": dict(zip(COEFICIENTES_PADRAO._fields, beta.tolist())),
+            **erro,
+        },
+    )
+
+    print(f"✅ Versão {versao} gravada ({acumulador.n} amostras em {duracao:.1f}s)")
+    for nome, anterior, novo in zip(COEFICIENTES_PADRAO._fields, COEFICIENTES_PADRAO, beta):
+        print(f"   • {nome}: {anterior:+.4f} → {novo:+.4f}")
+    print(f"   R² {erro_estudo['r2']:.3f} → {erro['r2']:.3f}, "
+          f"RMSE {erro_estudo['rmse']:.3f} → {erro['rmse']:.3f}")
+
+    if args.recalcular:
+        recarregar_coeficientes()
+        gravados = reconstruir_estado_atual(conn)
+        print(f"✅ Impacto e risco de {gravados} estudantes recalculados")
+    else:
+        print("   A API recalcula os riscos gravados ao carregar a nova versão "
+              "(ou rode reconstruir_estado_atual.py).")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
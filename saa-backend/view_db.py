@@ -8,6 +8,8 @@ def visualizar_estudantes():
     conn = get_connection()
     cursor = conn.cursor()
 
+    # Um registro por linha de dados_academicos (todo o histórico); as linhas
+    # são impressas à medida que são lidas, sem carregar tudo na memória.
     cursor.execute("""
         SELECT e.matricula, e.nome, e.email, e.perfil,
                d.horas_estudo, d.participacao_projetos, d.disciplinas_praticas, d.impacto_percebido
@@ -22,13 +24,44 @@ def visualizar_estudantes():
     print(f"{'Matrícula':<12} {'Nome':<25} {'Perfil':<20} {'Horas':<8} {'Proj.':<6} {'Disc.':<6} {'Impacto':<8}")
     print("-" * 100)
 
-    for row in cursor.fetchall():
+    for row in cursor:
         matricula, nome, email, perfil, horas, projetos, disciplinas, impacto = row
         print(f"{matricula:<12} {nome:<25} {perfil:<20} {horas:<8.1f} {projetos:<6} {disciplinas:<6} {impacto:<8.2f}")
 
     conn.close()
 
 
+def visualizar_estado_atual():
+    """Mostra só o último registro de cada estudante (estado_atual_estudantes)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT e.matricula, e.nome, COALESCE(e.perfil, s.perfil), s.risco,
+               s.horas_estudo, s.participacao_projetos, s.disciplinas_praticas, s.impacto_percebido
+        FROM estudantes e
+        JOIN estado_atual_estudantes s ON s.estudante_id = e.id
+        ORDER BY e.matricula
+    """)
+
+    print("\n" + "=" * 100)
+    print("ESTADO ATUAL DOS ESTUDANTES")
+    print("=" * 100)
+    print(f"{'Matrícula':<12} {'Nome':<25} {'Perfil':<20} {'Risco':<8} {'Horas':<8} {'Proj.':<6} {'Disc.':<6} {'Impacto':<8}")
+    print("-" * 100)
+
+    for row in cursor:
+        matricula, nome, perfil, risco, horas, projetos, disciplinas, impacto = row
+        # As métricas do registro de origem podem ser NULL.
+        horas = "-" if horas is None else f"{horas:.1f}"
+        projetos = "-" if projetos is None else projetos
+        disciplinas = "-" if disciplinas is None else disciplinas
+        impacto = "-" if impacto is None else f"{impacto:.2f}"
+        print(f"{matricula:<12} {nome:<25} {perfil or '-':<20} {risco:<8} {horas:<8} {projetos:<6} {disciplinas:<6} {impacto:<8}")
+
+    conn.close()
+
+
 def visualizar_alertas():
     """Mostra os alertas gerados."""
     conn = get_connection()
@@ -47,7 +80,7 @@ def visualizar_alertas():
     print(f"{'Matrícula':<12} {'Nome':<25} {'Tipo':<15} {'Lido':<6} {'Mensagem'}")
     print("-" * 100)
 
-    for row in cursor.fetchall():
+    for row in cursor:
         matricula, nome, tipo, mensagem, lido = row
         lido_str = "Sim" if lido else "Não"
         print(f"{matricula:<12} {nome:<25} {tipo:<15} {lido_str:<6} {mensagem}")
@@ -109,12 +142,14 @@ if __name__ == "__main__":
         comando = sys.argv[1]
         if comando == "estudantes":
             visualizar_estudantes()
+        elif comando == "atual":
+            visualizar_estado_atual()
         elif comando == "alertas":
             visualizar_alertas()
         elif comando == "stats":
             estatisticas()
         else:
-            print("Comandos disponíveis: estudantes, alertas, stats")
+            print("Comandos disponíveis: estudantes, atual, alertas, stats")
     else:
         visualizar_estudantes()
         estatisticas()
@@ -0,0 +1,89 @@
+"""Ponto de entrada WSGI de produção (``gunicorn -c gunicorn.conf.py``).
+
+O servidor de desenvolvimento de ``python app.py`` é um processo só. Em
+produção, o gunicorn importa este módulo uma vez no processo mestre
+(``preload_app``) e só depois cria os workers com ``fork``: o Flask, o
+numpy, o scikit-learn, o bcrypt e os artefatos dos modelos já carregados
+ficam em páginas compartilhadas (copy-on-write) por todos os workers, em
+vez de cada worker importar tudo do zero.
+
+O aquecimento tem duas partes:
+
+- :func:`preaquecer`, no mestre, exercita os caminhos de numpy usados pelas
+  rotas (pontuação, risco e perfis) sem tocar no banco: conexões SQLite,
+  threads e filas não podem atravessar o ``fork``;
+- :func:`aquecer_worker`, em cada worker antes de aceitar conexões, faz
+  algumas requisições de leitura pelo test client: abre a conexão do pool
+  (PRAGMAs, mmap), preenche o cache de relatórios do processo e passa pelo
+  roteamento e serialização JSON. As métricas dessas requisições são
+  descartadas em seguida.
+
+Configuração de workers e threads em ``gunicorn.conf.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from app import create_app
+from api.metricas import registro
+from database import get_db
+from models.clustering import classificar_perfis_lote, identificar_perfil
+from models.regression import calcular_impacto_lote, calcular_risco_lote, pontuar_cenario
+
+# Carregado no import: com preload_app, no mestre, antes do fork.
+app = create_app()
+
+# Requisições sem efeitos colaterais usadas no aquecimento dos workers:
+# (método, rota, corpo JSON).
+REQUISICOES_AQUECIMENTO = (
+    ("GET", "/api/health", None),
+    ("GET", "/api/relatorios/resumo", None),
+    ("POST", "/api/simular/lote", {"horas_estudo": [10.0], "projetos": [2], "disciplinas": [1]}),
+)
+
+
+def preaquecer() -> float:
+    """Exercita numpy e os modelos no processo atual. Retorna os segundos gastos."""
+
+    inicio = time.perf_counter()
+    horas = np.linspace(0, 30, 64)
+    projetos = np.arange(64) % 7
+    disciplinas = np.arange(64) % 5
+    calcular_risco_lote(calcular_impacto_lote(horas, projetos, disciplinas))
+    classificar_perfis_lote(np.column_stack([horas, projetos, disciplinas]))
+    identificar_perfil(10.0, 2, 1)
+    pontuar_cenario(10.0, 2, 1)
+    return time.perf_counter() - inicio
+
+
+def aquecer_worker(aplicacao=app) -> float:
+    """Faz as requisições de aquecimento no worker. Retorna os segundos gastos."""
+
+    inicio = time.perf_counter()
+    cliente = aplicacao.test_client()
+    requisicoes = list(REQUISICOES_AQUECIMENTO)
+    try:
+        with aplicacao.app_context():
+            linha = get_db().execute("SELECT matricula FROM estudantes LIMIT 1").fetchone()
+        if linha is not None:
+            requisicoes.append(("GET", f"/api/estudantes/{linha[0]}/dashboard", None))
+    except Exception as e:
+        print(f"⚠️ Aquecimento sem dashboard: {e}")
+
+    for metodo, rota, corpo in requisicoes:
+        try:
+            resposta = cliente.open(rota, method=metodo, json=corpo)
+        except Exception as e:
+            print(f"⚠️ Aquecimento: {metodo} {rota} falhou: {e}")
+            continue
+        if resposta.status_code >= 500:
+            print(f"⚠️ Aquecimento: {metodo} {rota} respondeu {resposta.status_code}")
+    # O worker ainda não atendeu ninguém: /metrics começa do zero.
+    registro.limpar()
+    return time.perf_counter() - inicio
+
+
+preaquecer()